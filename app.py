@@ -1,15 +1,28 @@
-import gradio as gr
 import os
-from apscheduler.schedulers.background import BackgroundScheduler
-from huggingface_hub import HfApi
+import threading
 from datetime import datetime, timedelta
 
-from src.assets.text_content import TITLE, INTRODUCTION_TEXT, CLEMSCORE_TEXT, MULTIMODAL_NAME, TEXT_NAME, HF_REPO
-from src.leaderboard_utils import query_search, get_github_data
-from src.plot_utils import split_models, plotly_plot, get_plot_df, update_open_models, update_closed_models
-from src.plot_utils import reset_show_all, reset_show_names, reset_show_legend, reset_mobile_view
-from src.version_utils import get_version_data
-from src.trend_utils import get_final_trend_plot
+# Fetch the leaderboards while gradio and the rest of the app are imported, get_snapshot waits for this build
+from src.snapshot_utils import get_snapshot, select_display_df, query_snapshot, get_staleness_message, TEXT_KEY, MULTIMODAL_KEY, VERSIONS_KEY
+threading.Thread(target=get_snapshot, name="snapshot-prefetch", daemon=True).start()
+
+import gradio as gr  # noqa: E402
+from apscheduler.schedulers.background import BackgroundScheduler  # noqa: E402
+
+from src.assets.text_content import TITLE, INTRODUCTION_TEXT, CLEMSCORE_TEXT, MULTIMODAL_NAME, TEXT_NAME, HF_REPO  # noqa: E402
+from src.plot_utils import split_leaderboard_models, plotly_snapshot_plot, update_open_models, update_closed_models  # noqa: E402
+from src.plot_utils import reset_show_all, reset_show_names, reset_show_legend, reset_mobile_view  # noqa: E402
+from src.plot_utils import reset_show_frontier, FRONTIER_OPTIONS  # noqa: E402
+from src.trend_utils import get_final_trend_plot, START_DATE, TREND_VERSIONS, OPEN_DIP, COMM_DIP  # noqa: E402
+from src.table_utils import get_table_page, previous_table_page, next_table_page, first_table_page, get_table_columns  # noqa: E402
+from src.table_utils import PAGE_SIZE, PAGE_SIZES, SORT_ORDERS  # noqa: E402
+from src.history_utils import get_history_index, get_history_plot, DEFAULT_METRIC  # noqa: E402
+from src.diff_utils import compare_versions  # noqa: E402
+from src.static_plot_utils import start_static_plots, plotly_view_plot, trend_view_plot, STATIC_PLOT_DIR  # noqa: E402
+from src.watch_utils import start_watcher  # noqa: E402
+from src.export_utils import get_export_path, EXPORT_DIR  # noqa: E402
+from src.game_utils import get_game_choices, get_game_table, select_game_version, GAME_METRICS, DEFAULT_GAME_METRIC  # noqa: E402
+from src.score_utils import get_weighted_table  # noqa: E402
 
 """ 
 CONSTANTS
@@ -21,47 +34,124 @@ TIME = 43200  # in seconds # Reload will not work locally - requires HFToken # T
 AUTO RESTART HF SPACE
 """
 HF_TOKEN = os.environ.get("H4_TOKEN", None)
-api = HfApi()
 
 
 def restart_space():
-    api.restart_space(repo_id=HF_REPO, token=HF_TOKEN)
+    # Only needed when the restart is due, keep huggingface_hub out of the startup of the app
+    from huggingface_hub import HfApi
+    HfApi().restart_space(repo_id=HF_REPO, token=HF_TOKEN)
 
 
 """
 GITHUB UTILS
 """
-github_data = get_github_data()
-text_leaderboard = github_data["text"]["dataframes"][0]  # Get the latest version of text-only leaderboard
-multimodal_leaderboard = github_data["multimodal"]["dataframes"][0]  # Get the latest version of multimodal leaderboard
+# Leaderboards are held server-side in a snapshot, the frontend only sends back references to them
+snapshot = get_snapshot()
+github_data = snapshot["github_data"]
+
+# Latest versions of the text-only and multimodal leaderboards
+# Show only First 4 columns for the leaderboards - Model Name, Clemscore, %Played, and Quality Score
+text_leaderboard = select_display_df(snapshot, TEXT_KEY)
+multimodal_leaderboard = select_display_df(snapshot, MULTIMODAL_KEY)
+
+# Publish a new snapshot when a local clembench-runs source changes (nothing is watched for HTTP sources)
+start_watcher()
+
+
+def get_snapshot_choices(current: dict) -> dict:
+    """
+    Version choices and last updated labels shown in the frontend for a snapshot.
+
+    Args:
+        current (dict): Snapshot, see get_snapshot.
+    Returns:
+        dict: Version names (all, text-only), and the "Last updated" labels of the text, multimodal and versions tabs.
+    """
+    def last_updated(version_data: list) -> str:
+        return f"Last updated - {version_data[0]['last_updated'][0]}" if version_data else ""
+
+    return {
+        'versions': [v['name'] for v in current['version_data']['versions']],
+        'text_versions': [v['name'] for v in current['github_data']['text']['version_data']],
+        'text_updated': last_updated(current['github_data']['text']['version_data']),
+        'multimodal_updated': last_updated(current['github_data']['multimodal']['version_data']),
+        'versions_updated': last_updated(current['version_data']['versions'])
+    }
+
+
+def load_leaderboards():
+    """
+    Show the latest leaderboards, version choices and last updated labels on page load, if the snapshot changed
+    since the app started. Choices that did not change are not sent again, so that their change events do not run.
+    """
+    current = get_snapshot()
+    if current['created'] == snapshot['created']:
+        return [gr.skip()] * 9
+
+    choices = get_snapshot_choices(current)
+    tables = [select_display_df(current, TEXT_KEY), select_display_df(current, MULTIMODAL_KEY)]
+    labels = [gr.skip() if choices[name] == initial_choices[name] else choices[name]
+              for name in ['text_updated', 'multimodal_updated', 'versions_updated']]
+    if choices['versions'] == initial_choices['versions'] and choices['text_versions'] == initial_choices['text_versions']:
+        return tables + labels + [gr.skip()] * 4
+
+    names, text_names = choices['versions'], choices['text_versions']
+    dropdowns = [
+        gr.Dropdown(choices=names, value=names[0]),  # Versions tab
+        gr.Dropdown(choices=names, value=text_names[min(1, len(text_names) - 1)]),  # Base version of the comparison
+        gr.Dropdown(choices=names, value=text_names[0]),  # Compared version
+        gr.Dropdown(choices=names, value=names[0])  # Games tab
+    ]
+    return tables + labels + dropdowns
+
+
+def export_link() -> str:
+    """
+    Link to the export of all versions of the current snapshot, see get_export_path.
+    """
+    path = get_export_path()
+    return f"[⬇️ Download all versions ({os.path.basename(path)})](gradio_api/file={path})"
 
-# Show only First 4 columns for the leaderboards
-# Should be Model Name, Clemscore, %Played, and Quality Score
-text_leaderboard = text_leaderboard.iloc[:, :4]
-multimodal_leaderboard = multimodal_leaderboard.iloc[:, :4]
 
 """
 VERSIONS UTILS
 """
-versions_data = get_version_data()
+versions_data = snapshot["version_data"]
 latest_version = versions_data['versions'][0]['name']
-last_updated_date = versions_data['versions'][0]['last_updated'][0]
 version_names = [v['name'] for v in versions_data['versions']]
+initial_choices = get_snapshot_choices(snapshot)
 
-global version_df
-version_df = versions_data['dataframes'][0]
+# Only the first page of the latest version is sent on load, further pages are fetched on demand
+version_df, _, version_page_info = get_table_page(VERSIONS_KEY, latest_version, sort_by="Clemscore")
+version_columns = list(version_df.columns)
 
+# Compare the latest text-only version with the one before it by default
+text_version_names = [v['name'] for v in github_data['text']['version_data']]
+diff_new_version = text_version_names[0]
+diff_old_version = text_version_names[min(1, len(text_version_names) - 1)]
 
-def select_version_df(name):
-    for i, v in enumerate(versions_data['versions']):
-        if v['name'] == name:
-            return versions_data['dataframes'][i]
+"""
+GAMES UTILS
+"""
+game_names = get_game_choices(latest_version)
+game_df = get_game_table(latest_version, game_names[0] if game_names else None)
+weighted_df = get_weighted_table(latest_version, {})
 
-models_list = text_leaderboard.iloc[:, 0].unique().tolist()
-open_models, commercial_models = split_models(models_list)
-initial_plot = plotly_plot(df=text_leaderboard, list_op=open_models, list_co=commercial_models,
-                         show_all=["Show All Models"], show_names=["Show Names"], show_legend=[],
-                           mobile_view=[], custom_width=1200)
+"""
+HISTORY UTILS
+"""
+history_index = get_history_index()
+history_models = [text_leaderboard.iloc[0, 0]]  # Start with the best model of the latest text leaderboard
+
+open_models, commercial_models = split_leaderboard_models(TEXT_KEY, snapshot)
+initial_plot = plotly_snapshot_plot(leaderboard=TEXT_KEY, list_op=open_models, list_co=commercial_models,
+                                    show_all=["Show All Models"], show_names=["Show Names"], show_legend=[],
+                                    mobile_view=[], custom_width=1200)
+
+# Pre-render the default mobile plots of the snapshot in the background, served from memory and from
+# STATIC_PLOT_DIR for embeds. Every refresh renders them again, requests are served the previous plots meanwhile.
+start_static_plots(snapshot)
+gr.set_static_paths(paths=[STATIC_PLOT_DIR, EXPORT_DIR])
 """
 MAIN APPLICATION
 """
@@ -69,6 +159,8 @@ hf_app = gr.Blocks()
 with hf_app:
     gr.HTML(TITLE)
     gr.Markdown(INTRODUCTION_TEXT, elem_classes="markdown-text")
+    # Shown on page load while the snapshot is stale and refreshed in the background
+    gr.Markdown(value=get_staleness_message, elem_classes="markdown-text")
 
     with gr.Tabs(elem_classes="tab-buttons") as tabs:
         """
@@ -91,23 +183,18 @@ with hf_app:
 
             # Show information about the clemscore and last updated date below the table
             gr.HTML(CLEMSCORE_TEXT)
-            gr.HTML(f"Last updated - {github_data['text']['version_data'][0]['last_updated'][0]}")
+            text_updated = gr.HTML(initial_choices['text_updated'])
 
-            # Add a dummy leaderboard to handle search queries in leaderboard_table
-            # This will show a temporary leaderboard based on the searched value
-            dummy_leaderboard_table = gr.Dataframe(
-                value=text_leaderboard,
-                elem_id="text-leaderboard-table-dummy",
-                interactive=False,
-                visible=False
-            )
+            # Reference to the server-side leaderboard, used to handle search queries in leaderboard_table
+            text_leaderboard_ref = gr.State(TEXT_KEY)
 
             # Action after submitting a query to the search bar
             search_bar.submit(
-                query_search,
-                [dummy_leaderboard_table, search_bar],
+                query_snapshot,
+                [text_leaderboard_ref, search_bar],
                 leaderboard_table,
-                queue=True
+                queue=True,
+                api_name="query_snapshot"
             )
 
         """
@@ -130,21 +217,15 @@ with hf_app:
 
             # Show information about the clemscore and last updated date below the table
             gr.HTML(CLEMSCORE_TEXT)
-            gr.HTML(f"Last updated - {github_data['multimodal']['version_data'][0]['last_updated'][0]}")
+            multimodal_updated = gr.HTML(initial_choices['multimodal_updated'])
 
-            # Add a dummy leaderboard to handle search queries in leaderboard_table
-            # This will show a temporary leaderboard based on the searched value
-            mm_dummy_leaderboard_table = gr.Dataframe(
-                value=multimodal_leaderboard,
-                elem_id="mm-leaderboard-table-dummy",
-                interactive=False,
-                visible=False
-            )
+            # Reference to the server-side leaderboard, used to handle search queries in mm_leaderboard_table
+            mm_leaderboard_ref = gr.State(MULTIMODAL_KEY)
 
             # Action after submitting a query to the search bar
             mm_search_bar.submit(
-                query_search,
-                [mm_dummy_leaderboard_table, mm_search_bar],
+                query_snapshot,
+                [mm_leaderboard_ref, mm_search_bar],
                 mm_leaderboard_table,
                 queue=True
             )
@@ -168,11 +249,21 @@ with hf_app:
             Accordion Groups to select individual models - Hidden by default
             """
             with gr.Accordion("Select Open-weight Models 🌐", open=False):
-                open_models_selection = update_open_models()
+                open_models_selection = gr.CheckboxGroup(
+                    open_models,
+                    value=[],
+                    elem_id="value-select-1",
+                    interactive=True,
+                )
                 clear_button_1 = gr.ClearButton(open_models_selection)
 
             with gr.Accordion("Select Commercial Models 💰", open=False):
-                closed_models_selection = update_closed_models()
+                closed_models_selection = gr.CheckboxGroup(
+                    commercial_models,
+                    value=[],
+                    elem_id="value-select-2",
+                    interactive=True,
+                )
                 clear_button_2 = gr.ClearButton(closed_models_selection)
 
             """
@@ -213,18 +304,20 @@ with hf_app:
                         elem_id="value-select-6",
                         interactive=True,
                     )
+                with gr.Column():
+                    show_frontier = gr.CheckboxGroup(
+                        FRONTIER_OPTIONS,
+                        label="Pareto frontier of % played and quality score 📐",
+                        value=[],
+                        elem_id="value-select-14",
+                        interactive=True,
+                    )
 
             """
             PLOT BLOCK
             """
-            # Create a dummy DataFrame as an input to the plotly_plot function.
-            # Uses this data to plot the %played v/s quality score
-            with gr.Row():
-                dummy_plot_df = gr.DataFrame(
-                    value=get_plot_df(),
-                    visible=False
-                )
-
+            # The selected leaderboard is used as a reference to the server-side DataFrame
+            # to plot the %played v/s quality score
             with gr.Row():
                 with gr.Column():
                     # Output block for the plot
@@ -234,76 +327,76 @@ with hf_app:
             PLOT CHANGE ACTIONS
             Toggle 'Select All Models' based on the values in Accordion checkbox groups
             """
+            plot_inputs = [leaderboard_selection, open_models_selection, closed_models_selection, show_all, show_names,
+                           show_legend, mobile_view, show_frontier]
+
             open_models_selection.change(
-                plotly_plot,
-                [dummy_plot_df, open_models_selection, closed_models_selection, show_all, show_names, show_legend,
-                 mobile_view],
+                plotly_view_plot,
+                plot_inputs,
                 [plot_output],
-                queue=True
+                queue=True,
+                api_name="plotly_view_plot"
             )
 
             closed_models_selection.change(
-                plotly_plot,
-                [dummy_plot_df, open_models_selection, closed_models_selection, show_all, show_names, show_legend,
-                 mobile_view],
+                plotly_view_plot,
+                plot_inputs,
                 [plot_output],
                 queue=True
             )
 
             show_all.change(
-                plotly_plot,
-                [dummy_plot_df, open_models_selection, closed_models_selection, show_all, show_names, show_legend,
-                 mobile_view],
+                plotly_view_plot,
+                plot_inputs,
                 [plot_output],
                 queue=True
             )
 
             show_names.change(
-                plotly_plot,
-                [dummy_plot_df, open_models_selection, closed_models_selection, show_all, show_names, show_legend,
-                 mobile_view],
+                plotly_view_plot,
+                plot_inputs,
                 [plot_output],
                 queue=True
             )
 
             show_legend.change(
-                plotly_plot,
-                [dummy_plot_df, open_models_selection, closed_models_selection, show_all, show_names, show_legend,
-                 mobile_view],
+                plotly_view_plot,
+                plot_inputs,
                 [plot_output],
                 queue=True
             )
 
             mobile_view.change(
-                plotly_plot,
-                [dummy_plot_df, open_models_selection, closed_models_selection, show_all, show_names, show_legend,
-                 mobile_view],
+                plotly_view_plot,
+                plot_inputs,
+                [plot_output],
+                queue=True
+            )
+
+            show_frontier.change(
+                plotly_view_plot,
+                plot_inputs,
                 [plot_output],
                 queue=True
             )
             """
             LEADERBOARD SELECT CHANGE ACTIONS
-            Update Checkbox Groups and Dummy DF based on the leaderboard selected
+            Update Checkbox Groups based on the leaderboard selected
             """
             leaderboard_selection.change(
                 update_open_models,
                 [leaderboard_selection],
                 [open_models_selection],
-                queue=True
+                queue=True,
+                api_name="update_open_models"
             )
 
             leaderboard_selection.change(
                 update_closed_models,
                 [leaderboard_selection],
                 [closed_models_selection],
-                queue=True
-            )
-
-            leaderboard_selection.change(
-                get_plot_df,
-                [leaderboard_selection],
-                [dummy_plot_df],
-                queue=True
+                queue=True,
+                api_name="update_closed_models"
             )
 
             ## Reset Plot when Leaderboard selection changes
@@ -343,6 +436,12 @@ with hf_app:
                 queue=True
             )
 
+            leaderboard_selection.change(
+                reset_show_frontier,
+                outputs=[show_frontier],
+                queue=True
+            )
+
         """
         #######################       FOURTH TAB - TRENDS     #######################
         """
@@ -369,26 +468,72 @@ with hf_app:
                         interactive=True,
                     )
 
+            """
+            Window and trend line thresholds - the plot is rebuilt from the trend data cached for the snapshot
+            """
+            with gr.Row():
+                with gr.Column():
+                    trend_start_date = gr.Textbox(
+                        value=START_DATE,
+                        label="Models released from (YYYY-MM-DD) 📅",
+                        elem_id="value-select-15",
+                        interactive=True,
+                    )
+                with gr.Column():
+                    trend_versions = gr.Slider(
+                        minimum=1,
+                        maximum=max(1, len(text_version_names)),
+                        step=1,
+                        value=min(TREND_VERSIONS, max(1, len(text_version_names))),
+                        label="Latest benchmark versions shown 🗂️",
+                        elem_id="value-select-16",
+                        interactive=True,
+                    )
+                with gr.Column():
+                    trend_open_dip = gr.Number(
+                        value=OPEN_DIP,
+                        minimum=0,
+                        label="Min. clemscore gain on the open-weight trend line 🔴",
+                        elem_id="value-select-17",
+                        interactive=True,
+                    )
+                with gr.Column():
+                    trend_comm_dip = gr.Number(
+                        value=COMM_DIP,
+                        minimum=0,
+                        label="Min. clemscore gain on the commercial trend line 🔵",
+                        elem_id="value-select-18",
+                        interactive=True,
+                    )
+
             with gr.Row():
                 trend_plot = gr.Plot(get_final_trend_plot(benchmark="Text",
                                                           mobile_view=False,
                                                           custom_width=1200),
                                      show_label=False)
 
+            trend_inputs = [trend_select, mobile_view, trend_start_date, trend_versions, trend_open_dip, trend_comm_dip]
+
             trend_select.change(
-                get_final_trend_plot,
-                [trend_select, mobile_view],
+                trend_view_plot,
+                trend_inputs,
                 [trend_plot],
-                queue=True
+                queue=True,
+                api_name="trend_view_plot"
             )
 
             mobile_view.change(
-                get_final_trend_plot,
-                [trend_select, mobile_view],
+                trend_view_plot,
+                trend_inputs,
                 [trend_plot],
                 queue=True
             )
 
+            trend_start_date.submit(trend_view_plot, trend_inputs, [trend_plot], queue=True)
+            trend_versions.release(trend_view_plot, trend_inputs, [trend_plot], queue=True)
+            trend_open_dip.submit(trend_view_plot, trend_inputs, [trend_plot], queue=True)
+            trend_comm_dip.submit(trend_view_plot, trend_inputs, [trend_plot], queue=True)
+
         """
         #######################       FIFTH TAB - VERSIONS AND DETAILS     #######################
         """
@@ -404,6 +549,24 @@ with hf_app:
                     elem_id="search-bar-3",
                 )
 
+            """
+            Controls for the paginated table - only the visible rows and columns are sent to the frontend
+            """
+            with gr.Row():
+                sort_by = gr.Dropdown(
+                    version_columns, label="Sort by ↕️", value="Clemscore", interactive=True
+                )
+                sort_order = gr.Radio(
+                    SORT_ORDERS, label="Order", value=SORT_ORDERS[0], interactive=True
+                )
+                page_size = gr.Dropdown(
+                    PAGE_SIZES, label="Models per page", value=PAGE_SIZE, interactive=True
+                )
+                visible_columns = gr.Dropdown(
+                    version_columns[1:], label="Show columns (all if empty)", value=[], multiselect=True,
+                    interactive=True
+                )
+
             prev_table = gr.Dataframe(
                 value=version_df,
                 elem_id="version-leaderboard-table",
@@ -411,39 +574,214 @@ with hf_app:
                 visible=True
             )
 
-            dummy_prev_table = gr.Dataframe(
-                value=version_df,
-                elem_id="version-dummy-leaderboard-table",
-                interactive=False,
-                visible=False
-            )
+            with gr.Row():
+                previous_page_button = gr.Button("◀ Previous")
+                page_number = gr.Number(value=1, precision=0, minimum=1, show_label=False, interactive=True)
+                next_page_button = gr.Button("Next ▶")
+            page_info = gr.Markdown(version_page_info)
+
+            # Reference to the server-side leaderboard, paginated in the version selected by version_select
+            versions_ref = gr.State(VERSIONS_KEY)
 
             gr.HTML(CLEMSCORE_TEXT)
-            gr.HTML(f"Last updated - {last_updated_date}")
+            versions_updated = gr.HTML(initial_choices['versions_updated'])
+
+            # Results of all versions and variants in one file, written once per snapshot and served from disk
+            gr.Markdown(value=export_link)
 
-            search_bar_prev.submit(
-                query_search,
-                [dummy_prev_table, search_bar_prev],
-                prev_table,
+            """
+            TABLE PAGE ACTIONS
+            Fetch a page of the selected version based on the query, page, sorting and columns
+            """
+            table_inputs = [versions_ref, version_select, search_bar_prev, page_number, page_size, sort_by, sort_order,
+                            visible_columns]
+            table_outputs = [prev_table, page_number, page_info]
+
+            search_bar_prev.submit(first_table_page, table_inputs, table_outputs, queue=True)
+            previous_page_button.click(previous_table_page, table_inputs, table_outputs, queue=True)
+            next_page_button.click(next_table_page, table_inputs, table_outputs, queue=True)
+            page_number.submit(get_table_page, table_inputs, table_outputs, queue=True)
+
+            for table_control in [page_size, sort_by, sort_order, visible_columns]:
+                table_control.change(first_table_page, table_inputs, table_outputs, queue=True)
+
+            # Update the column selection and show the first page, when changing versions
+            version_select.change(
+                get_table_columns,
+                [versions_ref, version_select],
+                [sort_by, visible_columns],
+                queue=True,
+                api_name="get_table_columns"
+            )
+
+            version_select.change(first_table_page, table_inputs, table_outputs, queue=True, api_name="select_version")
+
+            """
+            VERSION COMPARISON
+            Score deltas, rank changes, new entries and dropped models between two versions
+            """
+            with gr.Accordion("Compare Versions 🔀", open=False):
+                with gr.Row():
+                    diff_old_select = gr.Dropdown(
+                        version_names, label="Base Version", value=diff_old_version, interactive=True
+                    )
+                    diff_new_select = gr.Dropdown(
+                        version_names, label="Compared Version", value=diff_new_version, interactive=True
+                    )
+                diff_table_value, diff_summary_value = compare_versions(diff_old_version, diff_new_version)
+                diff_summary = gr.Markdown(diff_summary_value)
+                diff_table = gr.Dataframe(
+                    value=diff_table_value,
+                    elem_id="version-diff-table",
+                    interactive=False,
+                    visible=True
+                )
+
+            diff_old_select.change(
+                compare_versions,
+                [diff_old_select, diff_new_select],
+                [diff_table, diff_summary],
+                queue=True,
+                api_name="compare_versions"
+            )
+
+            diff_new_select.change(
+                compare_versions,
+                [diff_old_select, diff_new_select],
+                [diff_table, diff_summary],
                 queue=True
             )
 
-            version_select.change(
-                select_version_df,
-                [version_select],
-                prev_table,
+        """
+        #######################       SIXTH TAB - MODEL HISTORY     #######################
+        """
+        with gr.TabItem("📉 Model History", elem_id="model-history-tab", id=5):
+            with gr.Row():
+                gr.Markdown("### Scores of selected models across all benchmark versions and variants.")
+
+            with gr.Row():
+                with gr.Column(scale=3):
+                    history_model_select = gr.Dropdown(
+                        choices=history_index['models'],
+                        value=history_models,
+                        label="Select Models 🤖",
+                        multiselect=True,
+                        elem_id="value-select-9",
+                        interactive=True,
+                    )
+                with gr.Column(scale=1):
+                    history_metric_select = gr.Dropdown(
+                        choices=history_index['metrics'],
+                        value=DEFAULT_METRIC,
+                        label="Select Metric 📏",
+                        elem_id="value-select-10",
+                        interactive=True,
+                    )
+
+            with gr.Row():
+                history_plot = gr.Plot(get_history_plot(history_models, DEFAULT_METRIC), show_label=False)
+
+            history_model_select.change(
+                get_history_plot,
+                [history_model_select, history_metric_select],
+                [history_plot],
                 queue=True
             )
 
-            # Update Dummy Leaderboard, when changing versions
-            version_select.change(
-                select_version_df,
-                [version_select],
-                dummy_prev_table,
+            history_metric_select.change(
+                get_history_plot,
+                [history_model_select, history_metric_select],
+                [history_plot],
                 queue=True
             )
 
-    hf_app.load()
+        """
+        #######################       SEVENTH TAB - GAMES     #######################
+        """
+        with gr.TabItem("🎲 Games", elem_id="games-tab", id=6):
+            with gr.Row():
+                gr.Markdown("### Leaderboard of a single game, ranked by one of its metrics.")
+
+            with gr.Row():
+                with gr.Column(scale=1):
+                    game_version_select = gr.Dropdown(
+                        version_names,
+                        value=latest_version,
+                        label="Select Version 🕹️",
+                        elem_id="value-select-11",
+                        interactive=True,
+                    )
+                with gr.Column(scale=1):
+                    game_select = gr.Dropdown(
+                        game_names,
+                        value=game_names[0] if game_names else None,
+                        label="Select Game 🎲",
+                        elem_id="value-select-12",
+                        interactive=True,
+                    )
+                with gr.Column(scale=1):
+                    game_metric_select = gr.Radio(
+                        GAME_METRICS,
+                        value=DEFAULT_GAME_METRIC,
+                        label="Rank by 📏",
+                        elem_id="value-select-13",
+                        interactive=True,
+                    )
+
+            game_table = gr.Dataframe(
+                value=game_df,
+                elem_id="game-leaderboard-table",
+                interactive=False,
+                visible=True
+            )
+
+            game_inputs = [game_version_select, game_select, game_metric_select]
+
+            # Update the game selection and the table, when changing versions
+            game_version_select.change(
+                select_game_version,
+                game_inputs,
+                [game_select, game_table],
+                queue=True,
+                api_name="select_game_version"
+            )
+
+            game_select.change(get_game_table, game_inputs, [game_table], queue=True, api_name="get_game_table")
+            game_metric_select.change(get_game_table, game_inputs, [game_table], queue=True)
+
+            """
+            Clemscore with custom game weights - games without a weight count with 1
+            """
+            with gr.Row():
+                gr.Markdown("### Leaderboard with custom game weights.")
+            with gr.Row():
+                weights_bar = gr.Textbox(
+                    placeholder=" ⚖️ Game weights, e.g. `taboo=2, wordle=0` - other games count with 1. Press ENTER...",
+                    show_label=False,
+                    elem_id="weights-bar",
+                )
+
+            weighted_table = gr.Dataframe(
+                value=weighted_df,
+                elem_id="weighted-leaderboard-table",
+                interactive=False,
+                visible=True
+            )
+
+            weights_bar.submit(
+                get_weighted_table,
+                [game_version_select, weights_bar],
+                [weighted_table],
+                queue=True,
+                api_name="get_weighted_table"
+            )
+            game_version_select.change(get_weighted_table, [game_version_select, weights_bar], [weighted_table],
+                                       queue=True)
+
+    # Versions picked up after the app started (see start_watcher) are shown on the next page load
+    hf_app.load(load_leaderboards, outputs=[leaderboard_table, mm_leaderboard_table, text_updated, multimodal_updated,
+                                            versions_updated, version_select, diff_old_select, diff_new_select,
+                                            game_version_select])
 hf_app.queue()
 
 # Add scheduler to auto-restart the HF space at every TIME interval and update every component each time
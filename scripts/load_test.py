@@ -0,0 +1,210 @@
+## Load test of the leaderboard app against a local stand-in of its data sources
+"""
+Boot app.py against a local mock of clembench-runs and the model registry (see scripts/mock_upstream.py), replay
+user interactions through the Gradio client API at a given concurrency and report the latency percentiles and the
+number of upstream requests per interaction.
+
+Every interaction is first run on its own, so that the upstream requests can be attributed to it, then all
+interactions are replayed together in the proportions of --mix.
+
+Usage (from the root of the repository):
+    python scripts/load_test.py --users 16 --requests 100
+    python scripts/load_test.py --users 32 --mix search=5,leaderboard=2,trend=2,version=1 --latency 0.2
+"""
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+import threading
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from gradio_client import Client
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from mock_upstream import generate_data, start_server, upstream_env, get_counts  # noqa: E402
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+TEXT_NAME = "🥇 CLEM Leaderboard"
+MULTIMODAL_NAME = "🥇 Multimodal CLEM Leaderboard"
+VERSION_NAMES = ['v2.0', 'v2.0_quantized', 'v2.0_multimodal', 'v1.6', 'v1.6_backends', 'v1.6_quantized',
+                 'v1.6_multimodal', 'v1.5', 'v1.0', 'v0.9']
+DEFAULT_MIX = "search=4,leaderboard=2,trend=2,version=2"
+
+
+"""
+Interactions - the Gradio events the frontend triggers for one user action
+"""
+def search(client: Client, rng: random.Random):
+    query = rng.choice(["model-1", "chat", "instruct; base", "model-2, model-3", "base", "zzz"])
+    client.predict(query, api_name="/query_snapshot")
+
+
+def leaderboard(client: Client, rng: random.Random):
+    name = rng.choice([TEXT_NAME, MULTIMODAL_NAME])
+    client.predict(name, api_name="/update_open_models")
+    client.predict(name, api_name="/update_closed_models")
+    client.predict(name, [], [], ["Select All Models"], [], [], rng.choice([[], ["Mobile View"]]),
+                   rng.choice([[], ["Show Pareto Frontier"], ["Frontier Only"]]), api_name="/plotly_view_plot")
+
+
+def trend(client: Client, rng: random.Random):
+    client.predict(rng.choice(["Text", "Multimodal"]), rng.choice([[], ["Mobile View"]]),
+                   rng.choice(["2023-06-01", "2024-01-01"]), rng.choice([3, 5]), rng.choice([0, 2]), 0,
+                   api_name="/trend_view_plot")
+
+
+def version(client: Client, rng: random.Random):
+    name = rng.choice(VERSION_NAMES)
+    client.predict(name, api_name="/get_table_columns")
+    client.predict(name, "", 1, 25, "Clemscore", "Descending", [], api_name="/select_version")
+
+
+INTERACTIONS = {'search': search, 'leaderboard': leaderboard, 'trend': trend, 'version': version}
+
+
+def parse_mix(mix: str) -> dict:
+    """
+    Parse a mix such as 'search=4,trend=1' into a mapping from interaction to weight.
+    """
+    weights = {}
+    for item in mix.split(","):
+        name, _, weight = item.partition("=")
+        if name.strip() not in INTERACTIONS:
+            raise ValueError(f"Unknown interaction {name!r}, choose from {', '.join(INTERACTIONS)}")
+        weights[name.strip()] = float(weight or 1)
+    return weights
+
+
+def boot_app(env: dict, port: int, timeout: float = 300) -> subprocess.Popen:
+    """
+    Start app.py with the given environment and wait until it accepts Gradio clients.
+
+    Returns:
+        subprocess.Popen: The app process, its output is written to load_test_app.log in a temporary directory.
+    """
+    log_path = os.path.join(tempfile.gettempdir(), "load_test_app.log")
+    log = open(log_path, "w")
+    env = {**os.environ, **env, 'GRADIO_SERVER_PORT': str(port), 'GRADIO_ANALYTICS_ENABLED': "False"}
+    process = subprocess.Popen([sys.executable, "app.py"], cwd=ROOT, env=env, stdout=log, stderr=subprocess.STDOUT)
+
+    start = time.perf_counter()
+    while time.perf_counter() - start < timeout:
+        if process.poll() is not None:
+            raise RuntimeError(f"app.py exited with code {process.returncode}, see {log_path}")
+        try:
+            Client(f"http://127.0.0.1:{port}/", verbose=False)
+            print(f"App ready after {time.perf_counter() - start:.1f} s (log: {log_path})")
+            return process
+        except Exception:
+            time.sleep(0.5)
+
+    process.terminate()
+    raise TimeoutError(f"app.py did not start within {timeout} s, see {log_path}")
+
+
+def run_phase(url: str, names: list, users: int, seed: int = 0) -> list:
+    """
+    Replay interactions with a fixed number of concurrent users, one Gradio client per user.
+
+    Args:
+        url: URL of the app.
+        names: Interactions to replay, in order of submission.
+        users: Number of concurrent users.
+        seed: Seed of the random arguments of the interactions.
+    Returns:
+        list: (interaction, latency in seconds, error or None) of every replayed interaction.
+    """
+    local = threading.local()
+
+    def replay(item):
+        index, name = item
+        if not hasattr(local, "client"):
+            local.client = Client(url, verbose=False)
+        rng = random.Random(seed * 1_000_003 + index)
+        start = time.perf_counter()
+        try:
+            INTERACTIONS[name](local.client, rng)
+            error = None
+        except Exception as e:
+            error = repr(e)
+        return name, time.perf_counter() - start, error
+
+    with ThreadPoolExecutor(max_workers=users) as pool:
+        return list(pool.map(replay, enumerate(names)))
+
+
+def summarize(results: list, upstream: dict = None) -> list:
+    """
+    Latency percentiles and upstream requests per interaction.
+
+    Args:
+        results: Output of run_phase.
+        upstream: Mapping from interaction to the number of upstream requests it caused, if known.
+    Returns:
+        list: One row per interaction - name, count, errors, p50, p95, p99 (ms) and upstream requests.
+    """
+    rows = []
+    for name in sorted({result[0] for result in results}):
+        latencies = np.array([latency for n, latency, _ in results if n == name]) * 1000
+        errors = sum(1 for n, _, error in results if n == name and error)
+        p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+        rows.append((name, len(latencies), errors, p50, p95, p99, (upstream or {}).get(name, "-")))
+    return rows
+
+
+def print_rows(title: str, rows: list):
+    print(f"\n{title}")
+    print(f"  {'interaction':<12} {'count':>6} {'errors':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'upstream':>9}")
+    for name, count, errors, p50, p95, p99, upstream in rows:
+        print(f"  {name:<12} {count:>6} {errors:>6} {p50:>9.1f} {p95:>9.1f} {p99:>9.1f} {upstream:>9}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=8, help="Number of concurrent users")
+    parser.add_argument("--requests", type=int, default=50, help="Number of replays per interaction and phase")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"Weights of the interactions [Default - {DEFAULT_MIX}]")
+    parser.add_argument("--models", type=int, default=100, help="Number of models in the mock data")
+    parser.add_argument("--latency", type=float, default=0.0, help="Delay of the mock upstream, in seconds")
+    parser.add_argument("--port", type=int, default=7861, help="Port of the app")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    weights = parse_mix(args.mix)
+    server = start_server(generate_data(tempfile.mkdtemp(prefix="clem-upstream-"), args.models), latency=args.latency)
+    app = boot_app(upstream_env(server), args.port)
+    url = f"http://127.0.0.1:{args.port}/"
+
+    try:
+        print(f"Upstream requests during startup: {sum(get_counts(server).values())}")
+
+        # Each interaction alone, to attribute the upstream requests
+        isolated, upstream = [], {}
+        for name in weights:
+            before = sum(get_counts(server).values())
+            isolated += run_phase(url, [name] * args.requests, args.users, args.seed)
+            upstream[name] = sum(get_counts(server).values()) - before
+        print_rows(f"Isolated ({args.users} users, {args.requests} replays each)", summarize(isolated, upstream))
+
+        # All interactions together, in the proportions of the mix
+        rng = random.Random(args.seed)
+        names = rng.choices(list(weights), weights=list(weights.values()), k=args.requests * len(weights))
+        before = sum(get_counts(server).values())
+        start = time.perf_counter()
+        mixed = run_phase(url, names, args.users, args.seed + 1)
+        duration = time.perf_counter() - start
+        print_rows(f"Mixed ({args.users} users, {len(names)} replays, {len(names) / duration:.1f} interactions/s, "
+                   f"{sum(get_counts(server).values()) - before} upstream requests)", summarize(mixed))
+
+        errors = [error for _, _, error in isolated + mixed if error]
+        if errors:
+            print(f"\n{len(errors)} interactions failed, first error: {errors[0]}")
+    finally:
+        app.terminate()
+        app.wait()
+        server.shutdown()
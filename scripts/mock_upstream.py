@@ -0,0 +1,172 @@
+## Local stand-in for clembench-runs and the clemcore model registry
+"""
+Generate a synthetic clembench-runs tree and model registry, and serve them over HTTP while counting requests.
+
+Usage (from the root of the repository):
+    python scripts/mock_upstream.py --models 200 --port 8765
+
+Then start the app against it:
+    CLEM_REPO=http://127.0.0.1:8765/runs/ CLEM_REGISTRY_URL=http://127.0.0.1:8765/model_registry.json python app.py
+
+GET /__counts returns the number of requests per path as JSON, POST /__reset clears them.
+"""
+import os
+import csv
+import json
+import time
+import random
+import argparse
+import functools
+import tempfile
+import threading
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+
+GAMES = ['taboo', 'wordle', 'wordle_withclue', 'imagegame', 'referencegame', 'privateshared', 'codenames']
+VERSIONS = [('v0.9', '2023-06-07'), ('v1.0', '2023-10-23'), ('v1.5', '2024-02-15'), ('v1.6', '2024-06-10'),
+            ('v1.6_multimodal', '2024-06-10'), ('v2.0', '2024-11-01'), ('v2.0_multimodal', '2024-11-01')]
+# Variants of the versions above, only shown in the Versions tab
+VARIANTS = ['v1.6_quantized', 'v1.6_backends', 'v2.0_quantized']
+PARAMETERS = ['7B', '8B', '13B', '70B', '405B', '1.8T', '']
+
+
+def generate_data(root: str, n_models: int = 100, seed: int = 0) -> str:
+    """
+    Write a synthetic clembench-runs tree (benchmark_runs.json and results.csv per version) and a model registry.
+
+    Args:
+        root: Directory to write to.
+        n_models: Number of models in the registry, every version has results for a random subset of them.
+        seed: Seed of the random generator.
+    Returns:
+        str: root
+    """
+    rng = random.Random(seed)
+    runs = os.path.join(root, "runs")
+    os.makedirs(runs, exist_ok=True)
+
+    models = [f"model-{i}-{rng.choice(['instruct', 'chat', 'base'])}" for i in range(n_models)]
+    registry = [{
+        'model_name': model,
+        'open_weight': i % 2 == 0,
+        'parameters': rng.choice(PARAMETERS),
+        'release_date': f"{rng.choice([2023, 2024])}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"
+    } for i, model in enumerate(models)]
+    with open(os.path.join(root, "model_registry.json"), 'w') as f:
+        json.dump(registry, f)
+
+    versions = [{'version': version, 'release_date': date, 'last_updated': date} for version, date in VERSIONS]
+    with open(os.path.join(runs, "benchmark_runs.json"), 'w') as f:
+        json.dump({'versions': versions}, f)
+
+    header = ['', '-, clemscore', 'all, Average % Played', 'all, Average Quality Score',
+              'all, Average Quality Score (std)']
+    for game in GAMES:
+        header += [f'{game}, % Played', f'{game}, Quality Score', f'{game}, Quality Score (std)']
+
+    for version in [version for version, _ in VERSIONS] + VARIANTS:
+        os.makedirs(os.path.join(runs, version), exist_ok=True)
+        with open(os.path.join(runs, version, "results.csv"), 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(header)
+            for model in rng.sample(models, k=rng.randint(n_models // 2, n_models)):
+                played = [rng.uniform(0, 100) for _ in GAMES]
+                quality = [rng.uniform(0, 100) if p > 5 else None for p in played]
+                scored = [q for q in quality if q is not None]
+                avg_played = sum(played) / len(played)
+                avg_quality = sum(scored) / len(scored) if scored else 0
+                row = [f"{model}-t0.0--{model}-t0.0", f"{avg_played * avg_quality / 100:.2f}", f"{avg_played:.2f}",
+                       f"{avg_quality:.2f}", f"{rng.uniform(0, 30):.2f}"]
+                for p, q in zip(played, quality):
+                    row += [f"{p:.2f}", "" if q is None else f"{q:.2f}", f"{rng.uniform(0, 30):.2f}"]
+                writer.writerow(row)
+
+    return root
+
+
+class MockHandler(SimpleHTTPRequestHandler):
+    """
+    Serves the generated files and counts the requests per path in server.counts.
+    """
+    def do_GET(self):
+        server = self.server
+        if self.path == "/__counts":
+            with server.lock:
+                body = json.dumps(server.counts).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+
+        with server.lock:
+            server.counts[self.path] = server.counts.get(self.path, 0) + 1
+        if server.latency:
+            time.sleep(server.latency)
+        super().do_GET()
+
+    def do_POST(self):
+        if self.path == "/__reset":
+            with self.server.lock:
+                self.server.counts.clear()
+            self.send_response(204)
+            self.end_headers()
+            return
+        self.send_error(404)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_server(root: str, port: int = 0, latency: float = 0.0) -> ThreadingHTTPServer:
+    """
+    Serve root in a background thread.
+
+    Args:
+        root: Directory with the generated data, see generate_data.
+        port: Port to listen on, any free port if 0.
+        latency: Delay added to every file request, in seconds.
+    Returns:
+        ThreadingHTTPServer: The running server, see upstream_env for the URLs of the app.
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", port), functools.partial(MockHandler, directory=root))
+    server.counts = {}
+    server.lock = threading.Lock()
+    server.latency = latency
+    threading.Thread(target=server.serve_forever, name="mock-upstream", daemon=True).start()
+    return server
+
+
+def upstream_env(server: ThreadingHTTPServer) -> dict:
+    """
+    Environment variables pointing the app at a mock server, see src/assets/text_content.py
+    """
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    return {'CLEM_REPO': f"{base}/runs/", 'CLEM_REGISTRY_URL': f"{base}/model_registry.json"}
+
+
+def get_counts(server: ThreadingHTTPServer) -> dict:
+    """
+    Number of requests per path received by a mock server started in this process.
+    """
+    with server.lock:
+        return dict(server.counts)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--models", type=int, default=100, help="Number of models in the registry")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="Delay added to every request, in seconds")
+    parser.add_argument("--data-dir", help="Directory for the generated data [Default - temporary directory]")
+    args = parser.parse_args()
+
+    root = generate_data(args.data_dir or tempfile.mkdtemp(prefix="clem-upstream-"), args.models)
+    server = start_server(root, args.port, args.latency)
+    for name, value in upstream_env(server).items():
+        print(f"{name}={value}")
+    print(f"Serving {root}, press Ctrl+C to stop")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
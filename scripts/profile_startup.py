@@ -0,0 +1,136 @@
+## Startup profile of the leaderboard app - import and initialization time per module
+"""
+Report how long the startup of app.py spends importing each module and initializing its data.
+
+Usage (from the root of the repository):
+    python scripts/profile_startup.py            # imports and initialization
+    python scripts/profile_startup.py --no-init  # imports only, no requests to GitHub
+"""
+import os
+import ast
+import sys
+import time
+import argparse
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+def get_app_modules(path: str = os.path.join(ROOT, "app.py")) -> list:
+    """
+    Modules imported at the top level of app.py, in the order it imports them.
+
+    Args:
+        path: Path of the app.
+    Returns:
+        list: Names of the modules, standard library modules are skipped.
+    """
+    with open(path, encoding='utf-8') as f:
+        tree = ast.parse(f.read())
+
+    modules = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            names = [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.level == 0:
+            names = [node.module]
+        else:
+            continue
+        modules += [name for name in names
+                    if name.split(".")[0] not in sys.stdlib_module_names and name not in modules]
+    return modules
+
+
+# Modules in the order app.py imports them
+APP_MODULES = get_app_modules()
+# Heavy packages reported on their own, whichever module imports them first
+HEAVY_PACKAGES = ["pandas", "numpy", "plotly", "gradio", "huggingface_hub", "apscheduler", "httpx", "requests"]
+
+
+def profile_imports(modules: list = APP_MODULES) -> list:
+    """
+    Import the modules in a fresh interpreter with -X importtime.
+
+    Args:
+        modules: Modules to import, in order.
+    Returns:
+        list: (name, cumulative seconds) of every module imported at the top level and of the heavy packages.
+    """
+    code = "; ".join(f"import {module}" for module in modules)
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=ROOT,
+                            capture_output=True, text=True, check=True)
+
+    timings = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        module = name.strip()
+        top_level = not name[1:].startswith(" ")
+        if top_level or module in HEAVY_PACKAGES:
+            timings.append((module, int(cumulative) / 1e6))
+    return timings
+
+
+def profile_init() -> list:
+    """
+    Run the initialization steps of app.py and time each of them.
+
+    Returns:
+        list: (step, seconds) for every step.
+    """
+    steps = []
+
+    def timed(step: str, fn, *args, **kwargs):
+        start = time.perf_counter()
+        value = fn(*args, **kwargs)
+        steps.append((step, time.perf_counter() - start))
+        return value
+
+    from src.snapshot_utils import get_snapshot, get_display_df, TEXT_KEY
+    from src.plot_utils import split_models, plotly_snapshot_plot
+    from src.trend_utils import get_final_trend_plot
+    from src.history_utils import get_history_index
+    from src.static_plot_utils import build_static_plots
+
+    timed("get_snapshot", get_snapshot)
+    timed("get_history_index", get_history_index)
+    models = get_display_df(TEXT_KEY).iloc[:, 0].unique().tolist()
+    open_models, commercial_models = timed("split_models", split_models, models)
+    timed("plotly_snapshot_plot", plotly_snapshot_plot, TEXT_KEY, open_models, commercial_models,
+          ["Show All Models"], ["Show Names"], [], [], custom_width=1200)
+    timed("get_final_trend_plot", get_final_trend_plot, "Text", False, 1200)
+    timed("build_static_plots", build_static_plots, get_snapshot())
+    return steps
+
+
+def print_table(title: str, rows: list):
+    print(f"\n{title}")
+    width = max(len(name) for name, _ in rows)
+    for name, seconds in rows:
+        print(f"  {name:<{width}}  {seconds * 1000:9.1f} ms")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--no-init", action="store_true", help="Only profile the imports")
+    args = parser.parse_args()
+
+    imports = profile_imports()
+    app_imports = [row for row in imports if row[0] in APP_MODULES]
+    print_table("Imports (cumulative, first importer pays)", app_imports)
+    print_table("Heavy packages", sorted((row for row in imports if row[0] in HEAVY_PACKAGES),
+                                         key=lambda row: -row[1]))
+    print(f"\n  Total import time {sum(seconds for _, seconds in app_imports) * 1000:.1f} ms")
+
+    if not args.no_init:
+        steps = profile_init()
+        print_table("Initialization", steps)
+        print(f"\n  Total initialization time {sum(seconds for _, seconds in steps) * 1000:.1f} ms")
+
+        from src.snapshot_utils import get_snapshot
+        from src.retention_utils import memory_report, MEMORY_BUDGET_MB
+        report = memory_report(get_snapshot())
+        print(f"\nMemory of the versions (budget {MEMORY_BUDGET_MB} MB)")
+        print("  " + report.to_string(index=False).replace("\n", "\n  "))
@@ -1,7 +1,11 @@
+import os
+
 TITLE = """<h1 align="center" id="space-title"> 🏆 CLEM Leaderboard</h1>"""
 
-REPO = "https://raw.githubusercontent.com/clembench/clembench-runs/main/"
-REGISTRY_URL = "https://raw.githubusercontent.com/clp-research/clemcore/refs/heads/main/clemcore/backends/model_registry.json"
+# Can be overridden to serve the leaderboard from a mirror or a local stand-in, see scripts/mock_upstream.py
+REPO = os.environ.get("CLEM_REPO", "https://raw.githubusercontent.com/clembench/clembench-runs/main/")
+REGISTRY_URL = os.environ.get("CLEM_REGISTRY_URL",
+                              "https://raw.githubusercontent.com/clp-research/clemcore/refs/heads/main/clemcore/backends/model_registry.json")
 BENCHMARK_FILE = "benchmark_runs.json"
 
 HF_REPO = "colab-potsdam/clem-leaderboard"
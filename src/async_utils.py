@@ -0,0 +1,160 @@
+## Async loaders for the Gradio async handlers
+import json
+import asyncio
+import weakref
+
+import httpx
+
+from src.assets.text_content import REPO, BENCHMARK_FILE, REGISTRY_URL
+from src.leaderboard_utils import build_github_data, sort_version_names
+from src.version_utils import build_version_data, get_version_candidates
+from src.singleflight_utils import single_flight_async
+from src.source_utils import is_http, read_location, read_repo_file
+
+# Connection pool of the async HTTP client, shared by all sessions
+HTTP_MAX_CONNECTIONS = 20
+HTTP_MAX_KEEPALIVE = 10
+HTTP_TIMEOUT = 30  # in seconds
+
+# One client per event loop, as httpx clients cannot be shared between loops
+_clients = weakref.WeakKeyDictionary()
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """
+    Get the pooled async HTTP client of the running event loop, creating it on first use.
+
+    Returns:
+        httpx.AsyncClient: The client.
+    """
+    loop = asyncio.get_running_loop()
+    if loop not in _clients:
+        _clients[loop] = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=HTTP_MAX_CONNECTIONS, max_keepalive_connections=HTTP_MAX_KEEPALIVE),
+            timeout=HTTP_TIMEOUT
+        )
+    return _clients[loop]
+
+
+@single_flight_async
+async def fetch_text(url: str) -> str:
+    """
+    Fetch a text file.
+
+    Args:
+        url (str): URL of the file.
+    Returns:
+        str: Content of the file, None if the request was not successful.
+    """
+    response = await get_async_client().get(url)
+    if response.status_code != 200:
+        return None
+    return response.text
+
+
+async def fetch_location(location: str) -> str:
+    """
+    Async variant of read_location - URLs are fetched with the pooled client, local files are read in a thread.
+
+    Args:
+        location (str): HTTP(S) URL, file:// URL or local path.
+    Returns:
+        str: Content of the file, None if it could not be read.
+    """
+    if is_http(location):
+        return await fetch_text(location)
+    return await asyncio.to_thread(read_location, location)
+
+
+async def fetch_repo_file(relative_path: str) -> str:
+    """
+    Async variant of read_repo_file.
+
+    Args:
+        relative_path (str): Path of the file in clembench-runs, e.g. 'v1.6/results.csv'.
+    Returns:
+        str: Content of the file, None if it could not be read.
+    """
+    if is_http(REPO):
+        return await fetch_text(REPO + relative_path)
+    return await asyncio.to_thread(read_repo_file, relative_path)
+
+
+@single_flight_async
+async def get_benchmark_versions_async() -> list:
+    """
+    Async variant of get_benchmark_versions.
+
+    Returns:
+        list: Version entries with version, release_date and last_updated. Empty if the file could not be read.
+    """
+    json_text = await fetch_repo_file(BENCHMARK_FILE)
+
+    # Check if the JSON file could be read
+    if json_text is None:
+        print(f"Failed to read JSON file - {BENCHMARK_FILE} in repo {REPO}")
+        return []
+
+    return json.loads(json_text)['versions']
+
+
+@single_flight_async
+async def get_model_registry_async() -> list:
+    """
+    Async variant of get_model_registry.
+
+    Returns:
+        list: List of dictionaries containing model registry data. Empty if the registry could not be read.
+    """
+    json_text = await fetch_location(REGISTRY_URL)
+
+    if json_text is None:
+        print(f"Failed to read JSON file: {REGISTRY_URL}")
+        return []
+
+    return json.loads(json_text)
+
+
+async def fetch_results(version_names: list) -> dict:
+    """
+    Fetch the results.csv of several versions concurrently.
+
+    Args:
+        version_names (list): Names of the versions.
+    Returns:
+        dict: Mapping from version name to the text of its results.csv, for the versions that have one.
+    """
+    texts = await asyncio.gather(*[fetch_repo_file(f"{version}/results.csv") for version in version_names])
+    return {version: text for version, text in zip(version_names, texts) if text is not None}
+
+
+@single_flight_async
+async def get_github_data_async(versions: list = None) -> dict:
+    """
+    Async variant of get_github_data, fetching the results of all versions concurrently.
+
+    Args:
+        versions (list): Version entries of the benchmark JSON file, fetched if not set.
+    Returns:
+        github_data (dict): See get_github_data.
+    """
+    if versions is None:
+        versions = await get_benchmark_versions_async()
+    results = await fetch_results(sort_version_names(versions))
+    return await asyncio.to_thread(build_github_data, versions, results)
+
+
+@single_flight_async
+async def get_version_data_async(versions: list = None) -> dict:
+    """
+    Async variant of get_version_data, fetching the results of all versions and variants concurrently.
+
+    Args:
+        versions (list): Version entries of the benchmark JSON file, fetched if not set.
+    Returns:
+        version_data (dict): See build_version_data.
+    """
+    if versions is None:
+        versions = await get_benchmark_versions_async()
+    results = await fetch_results(get_version_candidates(versions))
+    return await asyncio.to_thread(build_version_data, versions, results)
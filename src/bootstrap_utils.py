@@ -0,0 +1,126 @@
+## Bootstrap confidence intervals for the clemscore rankings
+import numpy as np
+import pandas as pd
+
+from src.leaderboard_utils import get_game_columns
+
+# Number of bootstrap resamples of the games and confidence level of the intervals
+N_BOOTSTRAP = 1000
+CONFIDENCE = 0.95
+# Fixed seed so that the intervals do not change between restarts of the app
+SEED = 42
+
+CI_COLUMN = "Clemscore 95% CI"
+GROUP_COLUMN = "Rank Group"
+
+
+def bootstrap_clemscores(played: np.ndarray, quality: np.ndarray, n_bootstrap: int = N_BOOTSTRAP,
+                         seed: int = SEED) -> np.ndarray:
+    """
+    Resample the games of a leaderboard with replacement and recompute the clemscore of every model.
+
+    The clemscore is the average % played over games multiplied by the average quality score over games
+    (ignoring games without a quality score), divided by 100. A resample is represented by how often each game
+    was drawn, so every average over all resamples is a single matrix product.
+
+    Args:
+        played (np.ndarray): % Played of every model (rows) in every game (columns).
+        quality (np.ndarray): Quality Score of every model (rows) in every game (columns), NaN if not available.
+        n_bootstrap (int): Number of resamples.
+        seed (int): Seed of the random generator.
+    Returns:
+        np.ndarray: Clemscore of every model (rows) in every resample (columns).
+    """
+    n_games = played.shape[1]
+    rng = np.random.default_rng(seed)
+    draws = rng.integers(0, n_games, size=(n_bootstrap, n_games))
+    counts = np.zeros((n_bootstrap, n_games))
+    np.add.at(counts, (np.arange(n_bootstrap)[:, None], draws), 1)
+
+    has_quality = ~np.isnan(quality)
+    mean_played = np.nan_to_num(played) @ counts.T / n_games
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean_quality = np.where(has_quality, quality, 0) @ counts.T / (has_quality @ counts.T)
+
+    return mean_played * np.nan_to_num(mean_quality) / 100
+
+
+def rank_groups(scores: np.ndarray, bootstrap_scores: np.ndarray, confidence: float = CONFIDENCE) -> np.ndarray:
+    """
+    Group models that are statistically tied in the ranking.
+
+    Models are visited by descending clemscore. A model joins the group of the current group leader (the best
+    model of the group) unless the leader's clemscore is higher in enough resamples to be significant (paired
+    bootstrap test), in which case it becomes the leader of the next group.
+
+    Args:
+        scores (np.ndarray): Clemscore of every model.
+        bootstrap_scores (np.ndarray): Output of bootstrap_clemscores.
+        confidence (float): Confidence level of the test.
+    Returns:
+        np.ndarray: 1-indexed group of every model.
+    """
+    order = np.argsort(-np.nan_to_num(scores, nan=-np.inf), kind='stable')
+    ranked_scores = bootstrap_scores[order]
+
+    groups = np.zeros(len(order), dtype=int)
+    group = 0
+    lower = np.ones(len(order))  # Forces the best model to start the first group
+    for position in range(len(order)):
+        if lower[position] > 0:
+            # New leader - lower quantile of its difference to every model, computed once per group
+            group += 1
+            lower = np.quantile(ranked_scores[position] - ranked_scores, 1 - confidence, axis=1)
+        groups[order[position]] = group
+
+    return groups
+
+
+def get_confidence_intervals(df: pd.DataFrame, n_bootstrap: int = N_BOOTSTRAP,
+                             confidence: float = CONFIDENCE) -> pd.DataFrame:
+    """
+    Compute bootstrap confidence intervals of the clemscore and the rank groups for a processed leaderboard.
+
+    Args:
+        df (pd.DataFrame): Processed DataFrame, see process_df.
+        n_bootstrap (int): Number of resamples.
+        confidence (float): Confidence level of the intervals.
+    Returns:
+        pd.DataFrame: With the same index as df and the columns 'CI Low', 'CI High' and GROUP_COLUMN.
+                      All values are missing if df has no per-game columns.
+    """
+    intervals = pd.DataFrame(index=df.index, columns=['CI Low', 'CI High', GROUP_COLUMN])
+    games = get_game_columns(df)
+    if not games or df.empty:
+        return intervals
+
+    played = df[[cols[0] for cols in games.values()]].to_numpy(dtype=float)
+    quality = df[[cols[1] for cols in games.values()]].to_numpy(dtype=float)
+    bootstrap_scores = bootstrap_clemscores(played, quality, n_bootstrap)
+
+    alpha = (1 - confidence) / 2
+    intervals['CI Low'] = np.quantile(bootstrap_scores, alpha, axis=1).round(2)
+    intervals['CI High'] = np.quantile(bootstrap_scores, 1 - alpha, axis=1).round(2)
+    intervals[GROUP_COLUMN] = rank_groups(df['Clemscore'].to_numpy(dtype=float), bootstrap_scores, confidence)
+
+    return intervals
+
+
+def add_confidence_columns(df: pd.DataFrame, intervals: pd.DataFrame) -> pd.DataFrame:
+    """
+    Insert the confidence interval and the rank group after the first four columns of a leaderboard.
+
+    Args:
+        df (pd.DataFrame): Processed DataFrame, or its first columns.
+        intervals (pd.DataFrame): Output of get_confidence_intervals for the same DataFrame.
+    Returns:
+        pd.DataFrame: Copy of df with CI_COLUMN and GROUP_COLUMN, or df itself if no intervals are available.
+    """
+    if intervals[GROUP_COLUMN].isna().all():
+        return df
+
+    df = df.copy()
+    ci_text = intervals['CI Low'].map('{:.2f}'.format) + " - " + intervals['CI High'].map('{:.2f}'.format)
+    df.insert(min(4, len(df.columns)), CI_COLUMN, ci_text)
+    df.insert(min(5, len(df.columns)), GROUP_COLUMN, intervals[GROUP_COLUMN].astype(int))
+    return df
@@ -0,0 +1,109 @@
+## Version-to-version comparison of leaderboards
+import numpy as np
+import pandas as pd
+
+from src.leaderboard_utils import model_codes, canonical_codes, widen_frame
+from src.snapshot_utils import get_snapshot, select_snapshot_df, snapshot_cache, VERSIONS_KEY
+
+# Columns compared between two versions
+DIFF_METRICS = ['Clemscore', '% Played', 'Quality Score']
+
+STATUS_NEW = "New"
+STATUS_DROPPED = "Dropped"
+STATUS_KEPT = "Kept"
+
+
+def diff_leaderboards(old_df: pd.DataFrame, new_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Compare two processed leaderboards, aligning models by the code of their canonical ID, see canonical_codes.
+
+    Args:
+        old_df (pd.DataFrame): Processed DataFrame of the base version.
+        new_df (pd.DataFrame): Processed DataFrame of the version compared against the base version.
+    Returns:
+        pd.DataFrame: One row per model in either version, sorted by the new rank, with the columns
+            Model, Status (New, Dropped or Kept), the old and new rank, the rank change (positive if the model
+            moved up) and the old value, new value and delta for each of DIFF_METRICS.
+    """
+    aligned = []
+    for df in [old_df, new_df]:
+        df = widen_frame(df[['Model'] + DIFF_METRICS]).set_axis(canonical_codes(model_codes(df['Model'])))
+        df = df[~df.index.duplicated(keep='first')]
+        df['Rank'] = df['Clemscore'].rank(method='min', ascending=False)
+        aligned.append(df)
+    old_df, new_df = aligned
+
+    model_ids = new_df.index.union(old_df.index, sort=False)
+    old_df = old_df.reindex(model_ids)
+    new_df = new_df.reindex(model_ids)
+
+    in_old = old_df['Model'].notna().to_numpy()
+    in_new = new_df['Model'].notna().to_numpy()
+
+    diff_df = pd.DataFrame(index=model_ids)
+    diff_df['Model'] = new_df['Model'].fillna(old_df['Model'])
+    diff_df['Status'] = np.select([in_old & in_new, in_new], [STATUS_KEPT, STATUS_NEW], default=STATUS_DROPPED)
+    diff_df['Old Rank'] = old_df['Rank'].astype('Int64')
+    diff_df['New Rank'] = new_df['Rank'].astype('Int64')
+    diff_df['Rank Change'] = (old_df['Rank'] - new_df['Rank']).astype('Int64')
+    for metric in DIFF_METRICS:
+        diff_df[f'Old {metric}'] = old_df[metric]
+        diff_df[f'New {metric}'] = new_df[metric]
+        diff_df[f'Δ {metric}'] = (new_df[metric] - old_df[metric]).round(2)
+
+    diff_df = diff_df.sort_values(by=['New Rank', 'Old Rank'], na_position='last', kind='stable')
+    return diff_df.reset_index(drop=True)
+
+
+@snapshot_cache(maxsize=64)
+def _diff_versions(snapshot: dict, old_version: str, new_version: str) -> pd.DataFrame:
+    return diff_leaderboards(select_snapshot_df(snapshot, VERSIONS_KEY, old_version),
+                             select_snapshot_df(snapshot, VERSIONS_KEY, new_version))
+
+
+def diff_versions(old_version: str, new_version: str) -> pd.DataFrame:
+    """
+    Compare two versions of the leaderboard, cached per version pair and snapshot.
+
+    Args:
+        old_version: Name of the base version, e.g. 'v1.6'
+        new_version: Name of the version compared against the base version, e.g. 'v2.0'
+    Returns:
+        pd.DataFrame: See diff_leaderboards.
+    """
+    return _diff_versions(get_snapshot(), old_version, new_version)
+
+
+def diff_summary(diff_df: pd.DataFrame) -> str:
+    """
+    Summarize a comparison of two versions for the frontend.
+
+    Args:
+        diff_df (pd.DataFrame): Output of diff_leaderboards.
+    Returns:
+        str: Counts of new, dropped, improved and declined models.
+    """
+    kept = diff_df[diff_df['Status'] == STATUS_KEPT]
+    return (f"**{(diff_df['Status'] == STATUS_NEW).sum()}** new, "
+            f"**{(diff_df['Status'] == STATUS_DROPPED).sum()}** dropped, "
+            f"**{(kept['Rank Change'] > 0).sum()}** moved up and "
+            f"**{(kept['Rank Change'] < 0).sum()}** moved down in the ranking.")
+
+
+def compare_versions(old_version: str, new_version: str) -> tuple:
+    """
+    Compare two versions selected in the frontend.
+
+    Args:
+        old_version: Name of the base version
+        new_version: Name of the version compared against the base version
+    Returns:
+        tuple: Comparison DataFrame and its summary
+    """
+    diff_df = diff_versions(old_version, new_version)
+    return diff_df, diff_summary(diff_df)
+
+
+if __name__ == '__main__':
+    versions = [v['name'] for v in get_snapshot()['version_data']['versions']]
+    print(compare_versions(versions[1], versions[0]))
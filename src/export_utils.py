@@ -0,0 +1,142 @@
+## Bulk export of all versions of the leaderboard in one file
+import os
+import glob
+import threading
+
+import pandas as pd
+
+from src.leaderboard_utils import widen_frame
+from src.snapshot_utils import get_snapshot
+
+# Directory the exports are written to, served by the app
+EXPORT_DIR = "exports"
+EXPORT_NAME = "clembench_all_versions"
+
+# Metadata columns prepended to the results of every version
+METADATA_COLUMNS = ['Version', 'Benchmark', 'Variant', 'Open Weight', 'Parameters (B)', 'Model Release Date']
+
+_export = {'created': None, 'path': None}
+_export_lock = threading.Lock()
+
+
+def split_version_name(name: str) -> tuple:
+    """
+    Split a version name such as 'v1.6_multimodal' or 'v1.6_quantized' into its parts.
+
+    Args:
+        name: Version name.
+    Returns:
+        tuple: Base version (e.g. 'v1.6'), benchmark ('text' or 'multimodal') and variant ('' if none).
+    """
+    base, *suffixes = name.split('_')
+    benchmark = 'multimodal' if 'multimodal' in suffixes else 'text'
+    variant = '_'.join(suffix for suffix in suffixes if suffix != 'multimodal')
+    return base, benchmark, variant
+
+
+def export_frames(version_data: dict, registry: pd.DataFrame):
+    """
+    Yield the results of every version with the metadata columns, one version at a time.
+
+    Args:
+        version_data: Output of get_version_data.
+        registry: Output of build_registry_df.
+    Yields:
+        pd.DataFrame: Results of one version, with METADATA_COLUMNS after the Model column.
+    """
+    registry = registry.set_index('model_name')
+    for metadata, df in zip(version_data['versions'], version_data['dataframes']):
+        base, benchmark, variant = split_version_name(metadata['name'])
+        df = widen_frame(df)
+        models = df['Model']
+        export_df = pd.DataFrame({
+            'Model': models.to_numpy(),
+            'Version': base,
+            'Benchmark': benchmark,
+            'Variant': variant,
+            # Typed explicitly, so that every version has the same schema even if none of its models is registered
+            'Open Weight': models.map(registry['open_weight']).astype('boolean').to_numpy(),
+            'Parameters (B)': models.map(registry['parameters']).astype(float).to_numpy(),
+            'Model Release Date': pd.to_datetime(models.map(registry['release_date'])).to_numpy(),
+        })
+        yield pd.concat([export_df, df.iloc[:, 1:].reset_index(drop=True)], axis=1)
+
+
+def write_export(version_data: dict, registry: pd.DataFrame, path: str) -> str:
+    """
+    Write the results of all versions to one file, one version at a time.
+
+    Writes Parquet (one row group per version) if pyarrow is installed, gzipped CSV otherwise.
+
+    Args:
+        version_data: Output of get_version_data.
+        registry: Output of build_registry_df.
+        path: Path of the file without extension.
+    Returns:
+        str: Path of the written file.
+    """
+    # Union of the columns over all versions, games missing from a version are left empty
+    columns = ['Model'] + METADATA_COLUMNS
+    for df in version_data['dataframes']:
+        columns += [col for col in df.columns[1:] if col not in columns]
+
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        pa = None
+
+    path += ".csv.gz" if pa is None else ".parquet"
+    # Written under a temporary name and renamed once complete, so that a download never reads a partial file
+    part_path = path + ".part"
+    try:
+        if pa is None:
+            header = True
+            for df in export_frames(version_data, registry):
+                df.reindex(columns=columns).to_csv(part_path, mode='w' if header else 'a', header=header,
+                                                   index=False, compression={'method': 'gzip', 'mtime': 0})
+                header = False
+        else:
+            writer = None
+            for df in export_frames(version_data, registry):
+                df = df.reindex(columns=columns)
+                df[columns[len(METADATA_COLUMNS) + 1:]] = df[columns[len(METADATA_COLUMNS) + 1:]].astype(float)
+                table = pa.Table.from_pandas(df, preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(part_path, table.schema)
+                writer.write_table(table.cast(writer.schema))
+            if writer is not None:
+                writer.close()
+        os.replace(part_path, path)
+    except BaseException:
+        if os.path.exists(part_path):
+            os.remove(part_path)
+        raise
+    return path
+
+
+def get_export_path() -> str:
+    """
+    Get the export of the current snapshot, writing it again if the snapshot changed.
+    The file is served from disk, so it is sent to clients in chunks.
+
+    Returns:
+        str: Path of the export, see write_export.
+    """
+    snapshot = get_snapshot()
+    if _export['created'] != snapshot['created']:
+        with _export_lock:
+            if _export['created'] != snapshot['created']:
+                os.makedirs(EXPORT_DIR, exist_ok=True)
+                name = f"{EXPORT_NAME}_{snapshot['created']:%Y%m%d_%H%M%S}"
+                path = write_export(snapshot['version_data'], snapshot['registry'], os.path.join(EXPORT_DIR, name))
+
+                # Keep the export of the previous snapshot for one more snapshot, so that downloads of the
+                # previous link that are still running are not cut off
+                for old_path in glob.glob(os.path.join(EXPORT_DIR, f"{EXPORT_NAME}_*")):
+                    if old_path not in [path, _export['path']]:
+                        os.remove(old_path)
+                _export['path'] = path
+                _export['created'] = snapshot['created']
+
+    return _export['path']
@@ -0,0 +1,76 @@
+## Per-game views of the leaderboard, served from the rankings precomputed in the snapshot
+import gradio as gr
+import pandas as pd
+
+from src.leaderboard_utils import widen_frame
+from src.snapshot_utils import get_snapshot, select_latest_version, VERSIONS_KEY
+
+GAME_METRICS = ["Quality Score", "% Played"]
+DEFAULT_GAME_METRIC = GAME_METRICS[0]
+
+
+def get_game_choices(version: str = None, snapshot: dict = None) -> list:
+    """
+    Get the games of a version that can be ranked.
+
+    Args:
+        version: Name of the version, the latest version is used if not set
+        snapshot: Snapshot to read from [Default - the current snapshot]
+    Returns:
+        list: Names of the games, in column order.
+    """
+    snapshot = snapshot if snapshot is not None else get_snapshot()
+    if not version:
+        version = select_latest_version(snapshot, VERSIONS_KEY)
+    rankings = snapshot['rankings'][(VERSIONS_KEY, version)]
+    return list(dict.fromkeys(game for game, _ in rankings))
+
+
+def get_game_table(version: str, game: str, metric: str = DEFAULT_GAME_METRIC, snapshot: dict = None) -> pd.DataFrame:
+    """
+    Get the leaderboard of one game, sorted by one of its metrics.
+
+    The order and ranks are looked up in the snapshot (see build_game_rankings), no sorting is done per request.
+
+    Args:
+        version: Name of the version, the latest version is used if not set
+        game: Name of the game, the first game of the version is used if it has no such game
+        metric: '% Played' or 'Quality Score'
+        snapshot: Snapshot to read from [Default - the current snapshot]
+    Returns:
+        pd.DataFrame: Rank, Model, the two metrics of the game and the Clemscore of every model.
+    """
+    snapshot = snapshot if snapshot is not None else get_snapshot()
+    if not version:
+        version = select_latest_version(snapshot, VERSIONS_KEY)
+    rankings = snapshot['rankings'][(VERSIONS_KEY, version)]
+    if (game, metric) not in rankings:
+        games = get_game_choices(version, snapshot)
+        if not games:
+            return pd.DataFrame(columns=['Rank', 'Model', *GAME_METRICS, 'Clemscore'])
+        game = game if game in games else games[0]
+        metric = metric if metric in GAME_METRICS else DEFAULT_GAME_METRIC
+
+    order, ranks = rankings[(game, metric)]
+    df = snapshot['frames'][(VERSIONS_KEY, version)]
+    columns = ['Model', f"{game} {GAME_METRICS[0]}", f"{game} {GAME_METRICS[1]}", 'Clemscore']
+    table = widen_frame(df[columns].iloc[order]).reset_index(drop=True)
+    table.insert(0, 'Rank', pd.array(ranks[order], dtype='Int64'))
+    return table
+
+
+def select_game_version(version: str, game: str, metric: str = DEFAULT_GAME_METRIC):
+    """
+    Change the game selection based on the games of the selected version, keeping the game if the version has it.
+
+    Args:
+        version: Name of the version.
+        game: Name of the currently selected game.
+        metric: '% Played' or 'Quality Score'
+    Returns:
+        Updated game dropdown and the leaderboard of the selected game.
+    """
+    snapshot = get_snapshot()
+    games = get_game_choices(version, snapshot)
+    game = game if game in games else (games[0] if games else None)
+    return gr.Dropdown(choices=games, value=game), get_game_table(version, game, metric, snapshot)
@@ -0,0 +1,135 @@
+## Cross-version model history index
+import numpy as np
+import pandas as pd
+
+from src.leaderboard_utils import sort_version_names, widen_frame
+from src.snapshot_utils import get_snapshot, snapshot_cache
+
+DEFAULT_METRIC = "Clemscore"
+
+
+def build_history_index(version_data: dict) -> dict:
+    """
+    Build a long-format index of every metric of every model over all loaded versions and variants.
+
+    Args:
+        version_data (dict): Output of get_version_data.
+    Returns:
+        history (dict): Dictionary containing:
+            - "data": DataFrame with the columns model, metric, version (categoricals) and value (float32),
+                      sorted by model, metric and version (oldest first).
+            - "offsets": Dict mapping (model, metric) to the (start, stop) rows of its history in "data".
+            - "models": Sorted list of all models.
+            - "metrics": List of all metrics, in the column order of the processed DataFrames.
+            - "versions": List of all versions, oldest first.
+    """
+    long_dfs = []
+    metrics = []
+    for metadata, df in zip(version_data['versions'], version_data['dataframes']):
+        long_df = df.melt(id_vars='Model', var_name='metric', value_name='value')
+        long_df['version'] = metadata['name']
+        long_dfs.append(long_df)
+        metrics += [col for col in df.columns[1:] if col not in metrics]
+
+    data = pd.concat(long_dfs, ignore_index=True).dropna(subset=['value'])
+    data = data.rename(columns={'Model': 'model'})[['model', 'metric', 'version', 'value']]
+
+    # Same order as the Versions tab - variants follow their base version
+    versions = sort_version_names(data['version'].unique(), oldest_first=True)
+    models = sorted(data['model'].unique())
+    data['model'] = pd.Categorical(data['model'], categories=models)
+    data['metric'] = pd.Categorical(data['metric'], categories=metrics)
+    data['version'] = pd.Categorical(data['version'], categories=versions, ordered=True)
+    data['value'] = data['value'].astype(np.float32)
+
+    data = data.sort_values(['model', 'metric', 'version'], kind='stable').reset_index(drop=True)
+
+    # Rows of each (model, metric) pair are contiguous after sorting, store their boundaries
+    keys = data['model'].cat.codes.to_numpy(dtype=np.int64) * len(metrics) + data['metric'].cat.codes.to_numpy()
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+    stops = np.r_[starts[1:], len(keys)]
+    offsets = {
+        (models[key // len(metrics)], metrics[key % len(metrics)]): (start, stop)
+        for key, start, stop in zip(keys[starts].tolist(), starts.tolist(), stops.tolist())
+    }
+
+    history = {
+        'data': data,
+        'offsets': offsets,
+        'models': models,
+        'metrics': metrics,
+        'versions': versions
+    }
+
+    return history
+
+
+@snapshot_cache(maxsize=1)
+def _get_history_index(snapshot: dict) -> dict:
+    return build_history_index(snapshot['version_data'])
+
+
+def get_history_index() -> dict:
+    """
+    Get the history index of the current snapshot, built once per snapshot.
+
+    Returns:
+        history (dict): See build_history_index.
+    """
+    return _get_history_index(get_snapshot())
+
+
+def get_model_history(model: str, metric: str = DEFAULT_METRIC, history: dict = None) -> pd.DataFrame:
+    """
+    Look up the history of one metric of a model over all versions.
+
+    Args:
+        model: Name of the model as shown in the leaderboards.
+        metric: Column of the processed leaderboards, e.g. 'Clemscore' or 'Taboo % Played'
+        history: History index to look up in [Default - the history index of the current snapshot]
+    Returns:
+        DataFrame with the columns model, metric, version and value, oldest version first.
+        Empty if the model was never evaluated on the metric.
+    """
+    history = history if history is not None else get_history_index()
+    start, stop = history['offsets'].get((model, metric), (0, 0))
+    return history['data'].iloc[start:stop]
+
+
+def get_history_plot(models: list, metric: str = DEFAULT_METRIC):
+    """
+    Plot the history of one metric for the selected models over all versions.
+
+    Args:
+        models: List of model names, updated from frontend
+        metric: Metric to plot
+    Returns:
+        Fig: plotly figure of metric v/s version
+    """
+    import plotly.express as px
+
+    history = get_history_index()
+    if isinstance(models, str):
+        models = [models]
+    metric = metric or DEFAULT_METRIC
+
+    df = pd.concat([get_model_history(model, metric, history) for model in models or []] +
+                   [history['data'].iloc[0:0]])
+    df = widen_frame(df)
+
+    fig = px.line(df, x='version', y='value', color='model', markers=True, template="plotly_white",
+                  category_orders={'version': history['versions']})
+    fig.update_layout(
+        xaxis_title='Benchmark Version',
+        yaxis_title=metric,
+        title=f'{metric} across benchmark versions',
+        height=600
+    )
+
+    return fig
+
+
+if __name__ == '__main__':
+    history = get_history_index()
+    print(history['data'].memory_usage(deep=True).sum(), "bytes")
+    print(get_model_history(history['models'][0]))
@@ -1,16 +1,39 @@
 import os
+import numpy as np
 import pandas as pd
-import requests
 import json
+import hashlib
+import threading
 from io import StringIO
 from datetime import datetime
+from collections import OrderedDict
 
 from src.assets.text_content import REPO, BENCHMARK_FILE
+from src.singleflight_utils import single_flight
+from src.source_utils import read_repo_file
 
+# Attribute of the processed DataFrames holding the hash of their results.csv
+RESULTS_HASH = "results_hash"
+
+# Scores of the processed DataFrames are held in single precision, and rounded to SCORE_DECIMALS when shown
+SCORE_DTYPE = np.float32
+SCORE_DECIMALS = 2
+
+# Global dictionary of the model names, shared by all versions. The Model column of every processed DataFrame is a
+# categorical over it, and names are only ever appended, so a model has the same code in every version
+_models = {'names': [], 'ids': {}, 'canonical': [], 'canonical_ids': {}, 'dtype': pd.CategoricalDtype([])}
+_models_lock = threading.Lock()
+
+# Processed results by the hash of their results.csv, least recently read first, see read_results
+RESULTS_CACHE_SIZE = 64
+_results = OrderedDict()
+_results_lock = threading.Lock()
+
+@single_flight
 def get_github_data():
     """
     Read and process data from CSV files hosted on GitHub. - https://github.com/clembench/clembench-runs (REPO)
-    Set the path in src/assets/text_content/REPO
+    Set the path in src/assets/text_content/REPO - a URL, a local checkout or a tarball, see src/source_utils.py
 
     Returns:
         github_data (dict): Dictionary containing:
@@ -18,24 +41,71 @@ def get_github_data():
             - "multimodal": List of DataFrames for each version's multimodal leaderboard data.
             - "date": Formatted date of the latest version in "DD Month YYYY" format.
     """
-    json_url = REPO + BENCHMARK_FILE
-    response = requests.get(json_url)
+    json_text = read_repo_file(BENCHMARK_FILE)
 
-    # Check if the JSON file request was successful
-    if response.status_code != 200:
-        print(f"Failed to read JSON file - {BENCHMARK_FILE} in repo {REPO}: Status Code: {response.status_code}")
+    # Check if the JSON file could be read
+    if json_text is None:
+        print(f"Failed to read JSON file - {BENCHMARK_FILE} in repo {REPO}")
         return None, None, None, None
 
-    json_data = response.json()
+    json_data = json.loads(json_text)
     versions = json_data['versions']
 
-    # Sort the versions in benchmark by latest first
-    version_names = sorted(
-        [ver['version'] for ver in versions],
-        key=lambda v: list(map(int, v[1:].split('_')[0].split('.'))),  
-        reverse=True
-    )   
+    results = {}
+    for version in sort_version_names(versions):
+        csv_text = read_repo_file(f"{version}/results.csv")
+        if csv_text is not None:
+            results[version] = csv_text
+
+    return build_github_data(versions, results)
+
+
+@single_flight
+def get_benchmark_versions() -> list:
+    """
+    Read the version entries of the benchmark JSON file (BENCHMARK_FILE) hosted on GitHub.
+
+    Returns:
+        list: Version entries with version, release_date and last_updated. Empty if the file could not be read.
+    """
+    json_text = read_repo_file(BENCHMARK_FILE)
+
+    # Check if the JSON file could be read
+    if json_text is None:
+        print(f"Failed to read JSON file - {BENCHMARK_FILE} in repo {REPO}")
+        return []
+
+    return json.loads(json_text)['versions']
 
+
+def sort_version_names(versions: list, oldest_first: bool = False) -> list:
+    """
+    Sort the versions in benchmark by latest first.
+    Versions with the same number (v1.6, v1.6_multimodal, v1.6_quantized, ...) keep their order in versions.
+
+    Args:
+        versions (list): Version entries of the benchmark JSON file (BENCHMARK_FILE), or version names.
+        oldest_first (bool): Sort by oldest first instead.
+    Returns:
+        list: Names of the versions, latest first.
+    """
+    return sorted(
+        [ver['version'] if isinstance(ver, dict) else ver for ver in versions],
+        key=lambda v: list(map(int, v[1:].split('_')[0].split('.'))),
+        reverse=not oldest_first
+    )
+
+
+def build_github_data(versions: list, results: dict) -> dict:
+    """
+    Process the results of each version into the text and multimodal leaderboards.
+
+    Args:
+        versions (list): Version entries of the benchmark JSON file (BENCHMARK_FILE).
+        results (dict): Mapping from version name to the text of its results.csv, versions without results are skipped.
+    Returns:
+        github_data (dict): See get_github_data.
+    """
     # Collect Dataframes - Text and Multimodal Only - Ignoring _quantized, _backends, _ascii
     text_data = {
         'version_data': [],
@@ -46,13 +116,9 @@ def get_github_data():
         'dataframes': []
     }
 
-    for version in version_names:
-        results_url = f"{REPO}{version}/results.csv"
-        csv_response = requests.get(results_url)
-        if csv_response.status_code == 200:
-            df = pd.read_csv(StringIO(csv_response.text))
-            df = process_df(df)
-            df = df.sort_values(by=df.columns[1], ascending=False) # Sort by Clemscore
+    for version in sort_version_names(versions):
+        if version in results:
+            df = read_results(results[version])
 
             version_data = {
                 'name': version,
@@ -67,7 +133,6 @@ def get_github_data():
                 text_data['dataframes'].append(df)
                 text_data['version_data'].append(version_data)
 
-      
     github_data = {
         'text': text_data,
         'multimodal': multimodal_data
@@ -76,6 +141,49 @@ def get_github_data():
     return github_data
 
 
+def read_results(csv_text: str) -> pd.DataFrame:
+    """
+    Parse and process the results.csv of a version, sorted by Clemscore.
+    Results that did not change since the last load are not processed again, so the DataFrame is shared
+    between loads and must not be modified. The cache holds RESULTS_CACHE_SIZE results, see evict_results.
+
+    Args:
+        csv_text (str): Content of the results.csv file.
+    Returns:
+        pd.DataFrame: Processed DataFrame, see process_df.
+    """
+    digest = hashlib.sha1(csv_text.encode('utf-8')).hexdigest()
+    with _results_lock:
+        if digest in _results:
+            _results.move_to_end(digest)
+            return _results[digest]
+
+    df = process_df(pd.read_csv(StringIO(csv_text)))
+    df = df.sort_values(by=df.columns[1], ascending=False)  # Sort by Clemscore
+    # Identifies the results once the DataFrame is no longer cached, see src/retention_utils.py
+    df.attrs[RESULTS_HASH] = digest
+
+    with _results_lock:
+        df = _results.setdefault(digest, df)
+        _results.move_to_end(digest)
+        while len(_results) > RESULTS_CACHE_SIZE:
+            _results.popitem(last=False)
+    return df
+
+
+def evict_results(digests) -> int:
+    """
+    Drop processed results from the cache of read_results, so that the DataFrames can be freed.
+
+    Args:
+        digests: Hashes of the results.csv files, see RESULTS_HASH.
+    Returns:
+        int: Number of results dropped.
+    """
+    with _results_lock:
+        return sum(_results.pop(digest, None) is not None for digest in digests)
+
+
 def process_df(df: pd.DataFrame) -> pd.DataFrame:
     """
     Process dataframe:
@@ -120,10 +228,193 @@ def process_df(df: pd.DataFrame) -> pd.DataFrame:
 
     # Rename columns
     df.columns = custom_column_names
- 
+
+    # Compact dtypes - model names as codes of the global model dictionary, scores in single precision
+    df = df.astype({col: SCORE_DTYPE for col in df.columns[1:]})
+    df['Model'] = encode_models(df['Model'])
+
     return df
 
 
+def encode_models(names) -> pd.Categorical:
+    """
+    Encode model names as a categorical over the global model dictionary, adding the names not in it yet.
+
+    Args:
+        names: Model names.
+    Returns:
+        pd.Categorical: Categorical with the categories of the dictionary, see model_codes.
+    """
+    names = pd.Series(names, dtype=object)
+    with _models_lock:
+        new_names = [name for name in pd.unique(names) if name not in _models['ids']]
+        if new_names:
+            for name in new_names:
+                canonical = canonical_model_id(name)
+                _models['ids'][name] = len(_models['names'])
+                _models['names'].append(name)
+                _models['canonical'].append(_models['canonical_ids'].setdefault(canonical,
+                                                                                len(_models['canonical_ids'])))
+            _models['dtype'] = pd.CategoricalDtype(pd.Index(_models['names'], dtype=object))
+        ids, dtype = _models['ids'], _models['dtype']
+    return pd.Categorical.from_codes(names.map(ids).to_numpy(np.int32), dtype=dtype)
+
+
+def model_codes(models: pd.Series) -> np.ndarray:
+    """
+    Codes of models in the global model dictionary, for joins between versions on integers.
+
+    Args:
+        models: Model column of a processed DataFrame, or model names.
+    Returns:
+        np.ndarray: Code of every model, -1 for names that are not in the dictionary.
+    """
+    ids = _models['ids']
+    if isinstance(models.dtype, pd.CategoricalDtype):
+        # Only the categories are looked up - they are a prefix of the dictionary if encoded by encode_models
+        categories = np.fromiter((ids.get(name, -1) for name in models.cat.categories), dtype=np.int32,
+                                 count=len(models.cat.categories))
+        codes = models.cat.codes.to_numpy()
+        return np.where(codes >= 0, categories[codes] if len(categories) else -1, -1).astype(np.int32)
+    return np.fromiter((ids.get(name, -1) for name in models), dtype=np.int32, count=len(models))
+
+
+def canonical_codes(codes: np.ndarray) -> np.ndarray:
+    """
+    Map model codes (see model_codes) to codes of their canonical model ID (see canonical_model_id),
+    so that the same pair of players has the same code in every version. -1 stays -1.
+    """
+    canonical = np.asarray(_models['canonical'], dtype=np.int32)
+    return np.where(codes >= 0, canonical[np.maximum(codes, 0)] if len(canonical) else -1, -1)
+
+
+def widen_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Convert a processed DataFrame to the dtypes sent to the frontend - model names as strings and scores in
+    double precision, rounded to SCORE_DECIMALS (56.64 rather than 56.63999938964844).
+
+    Args:
+        df: Processed DataFrame, or a selection of its columns.
+    Returns:
+        pd.DataFrame: Copy of df.
+    """
+    columns = {}
+    for col in df.columns:
+        values = df[col]
+        if values.dtype == SCORE_DTYPE:
+            values = np.round(values.astype(np.float64), SCORE_DECIMALS)
+        elif isinstance(values.dtype, pd.CategoricalDtype):
+            values = values.astype(object)
+        columns[col] = values
+    return pd.DataFrame(columns, index=df.index, columns=df.columns)
+
+
+def get_game_columns(df: pd.DataFrame) -> dict:
+    """
+    Find the per-game columns of a processed DataFrame.
+
+    Args:
+        df (pd.DataFrame): Processed DataFrame, see process_df.
+    Returns:
+        dict: Mapping from game name (e.g. 'Taboo') to its '% Played' and 'Quality Score' columns.
+              Only games with both columns are included, in column order.
+    """
+    games = {}
+    for col in df.columns[4:]:
+        if col.endswith(' % Played') and not col.startswith('All '):
+            game = col[:-len(' % Played')]
+            if f"{game} Quality Score" in df.columns:
+                games[game] = (col, f"{game} Quality Score")
+    return games
+
+
+def build_game_rankings(df: pd.DataFrame) -> dict:
+    """
+    Rank the models of a processed DataFrame in every game, by % Played and by Quality Score.
+
+    Args:
+        df (pd.DataFrame): Processed DataFrame, see process_df.
+    Returns:
+        dict: Mapping from (game, metric) to a tuple of
+              - the row positions of df sorted by the metric (descending, missing values last) and
+              - the 1-indexed rank of every row (ties share the best rank, NaN if the value is missing).
+    """
+    rankings = {}
+    for game, game_cols in get_game_columns(df).items():
+        for col in game_cols:
+            values = df[col].reset_index(drop=True)
+            order = values.sort_values(ascending=False, na_position='last', kind='stable').index.to_numpy(np.int32)
+            ranks = values.rank(ascending=False, method='min').to_numpy(np.float32)
+            rankings[(game, col[len(game) + 1:])] = (order, ranks)
+    return rankings
+
+
+def build_game_matrix(dataframes: dict) -> dict:
+    """
+    Stack the per-game scores of several processed DataFrames into one model x game array,
+    so that scores with custom game weights are one matrix-vector product over all of them.
+
+    Args:
+        dataframes (dict): Mapping from version name to its processed DataFrame, see process_df.
+    Returns:
+        dict: Dictionary containing:
+            - "games": List of all games, in order of first appearance.
+            - "models": Array of the model names, one row per model and version.
+            - "played": float64 array (rows x games) of % Played, 0 if missing.
+            - "quality": float64 array (rows x games) of Quality Score, 0 if missing.
+            - "available": float64 array (rows x games), 1 if the version has the game.
+            - "scored": float64 array (rows x games), 1 if the model has a Quality Score in the game.
+            - "offsets": Dict mapping version name to the (start, stop) rows of its models, in DataFrame order.
+    """
+    game_columns = {version: get_game_columns(df) for version, df in dataframes.items()}
+    games = list(dict.fromkeys(game for columns in game_columns.values() for game in columns))
+    n_rows = sum(len(df) for df in dataframes.values())
+
+    played = np.zeros((n_rows, len(games)))
+    quality = np.zeros((n_rows, len(games)))
+    available = np.zeros((n_rows, len(games)))
+    scored = np.zeros((n_rows, len(games)))
+    models = np.empty(n_rows, dtype=object)
+    offsets = {}
+    start = 0
+    for version, df in dataframes.items():
+        df = widen_frame(df)
+        stop = start + len(df)
+        offsets[version] = (start, stop)
+        models[start:stop] = df['Model'].to_numpy()
+        for game, (played_col, quality_col) in game_columns[version].items():
+            j = games.index(game)
+            played[start:stop, j] = df[played_col].fillna(0).to_numpy()
+            quality_values = df[quality_col].to_numpy(dtype=float)
+            scored[start:stop, j] = ~np.isnan(quality_values)
+            quality[start:stop, j] = np.nan_to_num(quality_values)
+            available[start:stop, j] = 1
+        start = stop
+
+    return {
+        'games': games,
+        'models': models,
+        'played': played,
+        'quality': quality,
+        'available': available,
+        'scored': scored,
+        'offsets': offsets
+    }
+
+
+def canonical_model_id(model_name: str) -> str:
+    """
+    Get an ID for a model name that is stable across versions.
+    process_df joins the players of a model name in set order, so 'a--b' and 'b--a' can refer to the same pair.
+
+    Args:
+        model_name (str): Model name from the 'Model' column of a processed DataFrame.
+    Returns:
+        str: Model name with its players in sorted order.
+    """
+    return '--'.join(sorted(set(model_name.split('--'))))
+
+
 def query_search(df: pd.DataFrame, query: str) -> pd.DataFrame:
     """
     Filter the dataframe based on the search query.
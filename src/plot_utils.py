@@ -1,16 +1,38 @@
 import pandas as pd
-import plotly.express as px
-import requests
-import json
+import numpy as np
 import gradio as gr
+from typing import TYPE_CHECKING
 
-from src.assets.text_content import SHORT_NAMES, TEXT_NAME, MULTIMODAL_NAME, REGISTRY_URL
-from src.leaderboard_utils import get_github_data
+from src.assets.text_content import SHORT_NAMES, TEXT_NAME, MULTIMODAL_NAME
+from src.leaderboard_utils import widen_frame
+from src.snapshot_utils import get_snapshot, get_snapshot_async, select_snapshot_df, leaderboard_key
+from src.snapshot_utils import snapshot_cache
+from src.render_utils import render_figure
+from src.singleflight_utils import single_flight
+
+# Plotly is imported on first use to keep it out of the startup of the app
+if TYPE_CHECKING:
+    import plotly.graph_objects as go
+
+# Leaderboards with more models are plotted with one trace per model class instead of one trace per model
+COMPACT_PLOT_MODELS = 50
+
+# Colours and symbols assigned to models in order, same as plotly express with the plotly_white template
+MODEL_COLOURS = ['#636efa', '#EF553B', '#00cc96', '#ab63fa', '#FFA15A', '#19d3f3', '#FF6692', '#B6E880', '#FF97FF',
+                 '#FECB52']  # Colorway of plotly_white
+MODEL_SYMBOLS = ['circle', 'diamond', 'square', 'x', 'cross']
+# Colour map passed to plotly express - its entries take the first colours, so the models start after them
+MODEL_COLOUR_MAP = {"category1": "blue", "category2": "red"}
+
+# Options of the Pareto frontier checkbox group - overlay the frontier, plot only the models on it
+FRONTIER_OPTIONS = ["Show Pareto Frontier", "Frontier Only"]
 
 
 def plotly_plot(df: pd.DataFrame, list_op: list, list_co: list,
                 show_all: list, show_names: list, show_legend: list,
-                mobile_view: list, custom_width: int = None):
+                mobile_view: list, custom_width: int = None,
+                compact: bool = False, open_models: list = None,
+                show_frontier: list = None, frontier: list = None):
     """
     Takes in a list of models for a plotly plot
     Args:
@@ -21,9 +43,15 @@ def plotly_plot(df: pd.DataFrame, list_op: list, list_co: list,
         show_names: Either [] or ["Show Names"] - toggle view to show model names on plot 
         show_legend: Either [] or ["Show Legend"] - toggle view to show legend on plot
         mobile_view: Either [] or ["Mobile View"] - toggle view to for smaller screens
+        compact: Plot one trace per model class instead of one trace per model, see compact_scatter
+        open_models: List of open-weight models, used to split the models into classes in compact mode
+        show_frontier: Options of FRONTIER_OPTIONS - overlay the Pareto frontier, plot only the models on it
+        frontier: Models on the Pareto frontier of df, by ascending % Played, see get_frontier
     Returns:
         Fig: plotly figure of % played v/s quality score
     """
+    import plotly.express as px
+    import plotly.graph_objects as go
 
     LIST = list_op + list_co
     # Get list of all models and append short names column to df
@@ -35,19 +63,35 @@ def plotly_plot(df: pd.DataFrame, list_op: list, list_co: list,
 
     if show_all:
         LIST = ALL_LIST
+    show_frontier = show_frontier or []
+    if FRONTIER_OPTIONS[1] in show_frontier:
+        LIST = frontier
+    frontier_df = df.set_index(list_columns[0]).loc[frontier or []]
     # Filter dataframe based on the provided list of models
     df = df[df[list_columns[0]].isin(LIST)]
 
-    if show_names:
+    if compact:
+        fig = compact_scatter(df, list_columns, show_names, open_models)
+    elif show_names:
         fig = px.scatter(df, x=list_columns[2], y=list_columns[3], color=list_columns[0], symbol=list_columns[0],
-                         color_discrete_map={"category1": "blue", "category2": "red"},
+                         color_discrete_map=MODEL_COLOUR_MAP,
                          hover_name=list_columns[0], template="plotly_white", text="Short")
         fig.update_traces(textposition='top center')
     else:
         fig = px.scatter(df, x=list_columns[2], y=list_columns[3], color=list_columns[0], symbol=list_columns[0],
-                         color_discrete_map={"category1": "blue", "category2": "red"},
+                         color_discrete_map=MODEL_COLOUR_MAP,
                          hover_name=list_columns[0], template="plotly_white")
 
+    if FRONTIER_OPTIONS[0] in show_frontier:
+        fig.add_trace(go.Scatter(
+            x=frontier_df[list_columns[2]].to_numpy(),
+            y=frontier_df[list_columns[3]].to_numpy(),
+            mode='lines',
+            line=dict(color='grey', dash='dash', width=1),
+            hoverinfo='skip',
+            name='Pareto frontier'
+        ))
+
     if not show_legend:
         fig.update_layout(showlegend=False)
 
@@ -87,6 +131,168 @@ def plotly_plot(df: pd.DataFrame, list_op: list, list_co: list,
     return fig
 
 
+def compact_scatter(df: pd.DataFrame, list_columns: list, show_names: list, open_models: list = None) -> "go.Figure":
+    """
+    Scatter plot of % played v/s quality score with one trace per model class (open-weight, commercial).
+    Colours and symbols are assigned per model as plotly express does, and held as per-point arrays.
+    The model names for the hover are packed into customdata.
+    Args:
+        df: Filtered dataframe with a "Short" column, see plotly_plot
+        list_columns: Columns of the leaderboard - Model, Clemscore, % Played, Quality Score
+        show_names: Either [] or ["Show Names"] - toggle view to show model names on plot
+        open_models: List of open-weight models, all models are plotted in one trace if not set
+    Returns:
+        Fig: plotly figure of % played v/s quality score
+    """
+    import plotly.graph_objects as go
+
+    models = df[list_columns[0]].to_numpy()
+    codes = pd.factorize(models)[0]
+    colours = np.array(MODEL_COLOURS)[(codes + len(MODEL_COLOUR_MAP)) % len(MODEL_COLOURS)]
+    symbols = np.array(MODEL_SYMBOLS)[codes % len(MODEL_SYMBOLS)]
+
+    if open_models is None:
+        model_classes = np.full(len(models), "Models")
+    else:
+        model_classes = np.where(np.isin(models, open_models), "Open-weight Models", "Commercial Models")
+
+    fig = go.Figure()
+    for model_class in pd.unique(model_classes):
+        mask = model_classes == model_class
+        fig.add_trace(go.Scatter(
+            x=df[list_columns[2]].to_numpy()[mask],
+            y=df[list_columns[3]].to_numpy()[mask],
+            mode='markers+text' if show_names else 'markers',
+            text=df["Short"].to_numpy()[mask] if show_names else None,
+            textposition='top center',
+            marker=dict(color=colours[mask], symbol=symbols[mask]),
+            customdata=models[mask],
+            hovertemplate=f'<b>%{{customdata}}</b><br><br>{list_columns[2]}=%{{x}}<br>'
+                          f'{list_columns[3]}=%{{y}}<extra></extra>',
+            name=model_class
+        ))
+
+    fig.update_layout(template="plotly_white")
+    return fig
+
+
+def pareto_frontier(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """
+    Find the points that no other point beats in both x and y, by sorting and one sweep - O(n log n).
+
+    Args:
+        x: Values to maximize, e.g. % Played
+        y: Values to maximize, e.g. Quality Score
+    Returns:
+        np.ndarray: Positions of the Pareto-optimal points, by ascending x. Points with a missing value are skipped,
+                    of identical points only the first is kept.
+    """
+    valid = np.flatnonzero(~(np.isnan(x) | np.isnan(y)))
+    order = valid[np.lexsort((-y[valid], -x[valid]))]  # Descending x, then descending y
+    # Going down in x, a point is on the frontier if it beats the best y of all points with a higher x
+    best = np.maximum.accumulate(y[order])
+    on_frontier = np.r_[True, y[order][1:] > best[:-1]]
+    return order[on_frontier][::-1]
+
+
+@snapshot_cache(maxsize=4)
+def _get_frontier(snapshot: dict, leaderboard: str) -> list:
+    df = select_snapshot_df(snapshot, leaderboard)
+    frontier = pareto_frontier(df.iloc[:, 2].to_numpy(dtype=float), df.iloc[:, 3].to_numpy(dtype=float))
+    return df.iloc[frontier, 0].tolist()
+
+
+def get_frontier(leaderboard: str = TEXT_NAME, snapshot: dict = None) -> list:
+    """
+    Get the models on the Pareto frontier of % played and quality score of a leaderboard, once per snapshot.
+    Args:
+        leaderboard: Leaderboard key or display name [Default - Text Leaderboard]
+        snapshot: Snapshot to read from [Default - the current snapshot]
+    Returns:
+        List of models on the frontier, by ascending % played
+    """
+    return _get_frontier(snapshot if snapshot is not None else get_snapshot(), leaderboard_key(leaderboard))
+
+
+@snapshot_cache(maxsize=4)
+def _split_leaderboard_models(snapshot: dict, leaderboard: str) -> tuple:
+    models = select_snapshot_df(snapshot, leaderboard).iloc[:, 0].unique().tolist()
+    return split_models(models, snapshot['registry'])
+
+
+def split_leaderboard_models(leaderboard: str = TEXT_NAME, snapshot: dict = None) -> tuple:
+    """
+    Split the models of a leaderboard into open source and commercial, once per snapshot.
+    Args:
+        leaderboard: Leaderboard key or display name [Default - Text Leaderboard]
+        snapshot: Snapshot to read from [Default - the current snapshot]
+    Returns:
+        Lists of open-weight and commercial models, see split_models. Shared between all requests.
+    """
+    return _split_leaderboard_models(snapshot if snapshot is not None else get_snapshot(), leaderboard_key(leaderboard))
+
+
+def get_open_models(leaderboard: str = TEXT_NAME, snapshot: dict = None) -> list:
+    """
+    Get the open-weight models of a leaderboard, split once per snapshot.
+    Args:
+        leaderboard: Leaderboard key or display name [Default - Text Leaderboard]
+        snapshot: Snapshot to read from [Default - the current snapshot]
+    Returns:
+        List of open-weight models
+    """
+    return split_leaderboard_models(leaderboard, snapshot)[0]
+
+
+@single_flight
+def plotly_snapshot_plot(leaderboard: str, list_op: list, list_co: list,
+                         show_all: list, show_names: list, show_legend: list,
+                         mobile_view: list, custom_width: int = None, show_frontier: list = None):
+    """
+    Plot % played v/s quality score for a leaderboard held in the server-side snapshot.
+    Only the leaderboard reference and the selections are sent from the frontend.
+    Plots with more than COMPACT_PLOT_MODELS models are plotted in compact mode.
+    Args:
+        leaderboard: Selected leaderboard from the frontend
+        Other args: See plotly_plot
+    Returns:
+        Fig: plotly figure of % played v/s quality score, see render_figure
+    """
+    return select_snapshot_plot(get_snapshot(), leaderboard, list_op, list_co, show_all, show_names, show_legend,
+                                mobile_view, custom_width, show_frontier)
+
+
+def select_snapshot_plot(snapshot: dict, leaderboard: str, list_op: list, list_co: list,
+                         show_all: list, show_names: list, show_legend: list,
+                         mobile_view: list, custom_width: int = None, show_frontier: list = None):
+    """
+    Plot % played v/s quality score for a leaderboard of a given snapshot, see plotly_snapshot_plot.
+    The leaderboard, its frontier and its open-weight models are all read from that snapshot.
+    """
+    df = widen_frame(select_snapshot_df(snapshot, leaderboard).iloc[:, :4])
+    columns = {col: df[col].to_numpy() for col in df.columns}  # Model, Clemscore, % Played, Quality Score
+    frontier = get_frontier(leaderboard, snapshot) if show_frontier else None
+    n_models = len(frontier) if show_frontier and FRONTIER_OPTIONS[1] in show_frontier else len(df)
+    compact = n_models > COMPACT_PLOT_MODELS
+    return render_figure(plotly_plot_from_arrays, columns, list_op, list_co, show_all, show_names, show_legend,
+                         mobile_view, custom_width, compact=compact,
+                         open_models=get_open_models(leaderboard, snapshot) if compact else None,
+                         show_frontier=show_frontier, frontier=frontier)
+
+
+def plotly_plot_from_arrays(columns: dict, *args, **kwargs):
+    """
+    Build plotly_plot from a dict of column arrays instead of a DataFrame.
+    Used as a compact job for the render pool, see src/render_utils.py
+    Args:
+        columns: Mapping from column name to its values, in the column order of the leaderboard
+        Other args: See plotly_plot
+    Returns:
+        Fig: plotly figure of % played v/s quality score
+    """
+    return plotly_plot(pd.DataFrame(columns), *args, **kwargs)
+
+
 def shorten_model_name(full_name):
     # Split the name into parts
     parts = full_name.split('-')
@@ -128,35 +334,18 @@ def label_map(model_list: list) -> dict:
     return short_names
 
 
-def split_models(model_list: list):
+def split_models(model_list: list, registry: pd.DataFrame = None):
     """
     Split the models into open source and commercial
+    Args:
+        model_list: A list of model names
+        registry: Output of build_registry_df [Default - the registry of the current snapshot]
     """
-    open_models = []
-    commercial_models = []
-    
-    # Load model registry data from main repo
-    response = requests.get(REGISTRY_URL)
-
-    if response.status_code == 200:
-        json_data = json.loads(response.text)
-
-        for model_name in model_list:
-            for entry in json_data:
-                if entry["model_name"] == model_name:
-                    open_model = entry["open_weight"]
-                    
-                    if open_model:
-                        open_models.append(model_name)
-                    else:
-                        commercial_models.append(model_name)
-                    break
+    registry = registry if registry is not None else get_snapshot()['registry']
 
-    else:
-        print(f"Failed to read JSON file: {REGISTRY_URL} Status Code : {response.status_code}")
-
-    open_models.sort(key=lambda o: o.upper())
-    commercial_models.sort(key=lambda c: c.upper())
+    open_weight = pd.Series(model_list, dtype=object).map(registry.set_index('model_name')['open_weight'])
+    open_models = sorted(pd.Series(model_list)[open_weight == True], key=lambda o: o.upper())
+    commercial_models = sorted(pd.Series(model_list)[open_weight == False], key=lambda c: c.upper())
 
     # Add missing model from the model_registry
     if "dolphin-2.5-mixtral-8x7b" in model_list:
@@ -167,7 +356,7 @@ def split_models(model_list: list):
 """
 Update Functions, for when the leaderboard selection changes
 """
-def update_open_models(leaderboard: str = TEXT_NAME):
+async def update_open_models(leaderboard: str = TEXT_NAME):
     """
     Change the checkbox group of Open Models based on the leaderboard selected
 
@@ -176,10 +365,7 @@ def update_open_models(leaderboard: str = TEXT_NAME):
     Return:
         Updated checkbox group for Open Models, based on the leaderboard selected
     """
-    github_data = get_github_data()
-    leaderboard_data = github_data["text" if leaderboard == TEXT_NAME else "multimodal"]['dataframes'][0]
-    models = leaderboard_data.iloc[:, 0].unique().tolist()
-    open_models, commercial_models = split_models(models)
+    open_models, commercial_models = split_leaderboard_models(leaderboard, await get_snapshot_async())
     return gr.CheckboxGroup(
         open_models,
         value=[],
@@ -187,7 +373,7 @@ def update_open_models(leaderboard: str = TEXT_NAME):
         interactive=True,
     )
 
-def update_closed_models(leaderboard: str = TEXT_NAME):
+async def update_closed_models(leaderboard: str = TEXT_NAME):
     """
     Change the checkbox group of Closed Models based on the leaderboard selected
 
@@ -196,10 +382,7 @@ def update_closed_models(leaderboard: str = TEXT_NAME):
     Return:
         Updated checkbox group for Closed Models, based on the leaderboard selected
     """
-    github_data = get_github_data()
-    leaderboard_data = github_data["text" if leaderboard == TEXT_NAME else "multimodal"]['dataframes'][0]
-    models = leaderboard_data.iloc[:, 0].unique().tolist()
-    open_models, commercial_models = split_models(models)
+    open_models, commercial_models = split_leaderboard_models(leaderboard, await get_snapshot_async())
     return gr.CheckboxGroup(
         commercial_models,
         value=[],
@@ -207,18 +390,6 @@ def update_closed_models(leaderboard: str = TEXT_NAME):
         interactive=True,
     )
 
-def get_plot_df(leaderboard: str = TEXT_NAME) -> pd.DataFrame:
-    """
-    Get the DataFrame for plotting based on the selected leaderboard.
-    Args:
-        leaderboard: Selected leaderboard.
-    Returns:
-        DataFrame with model data.
-    """
-    github_data = get_github_data()
-    return github_data["text" if leaderboard == TEXT_NAME else "multimodal"]['dataframes'][0]
-
-
 """
 Reset Functions for when the Leaderboard selection changes
 """
@@ -251,6 +422,16 @@ def reset_show_legend():
     )
 
 
+def reset_show_frontier():
+    return gr.CheckboxGroup(
+        FRONTIER_OPTIONS,
+        label="Pareto frontier of % played and quality score 📐",
+        value=[],
+        elem_id="value-select-14",
+        interactive=True,
+    )
+
+
 def reset_mobile_view():
     return gr.CheckboxGroup(
         ["Mobile View"],
@@ -0,0 +1,84 @@
+## Model registry of clemcore
+import json
+import numpy as np
+import pandas as pd
+
+from src.assets.text_content import REGISTRY_URL
+from src.singleflight_utils import single_flight
+from src.source_utils import read_location
+
+# Units of the parameter sizes in the registry, in billions
+PARAMETER_UNITS = {'B': 1, 'T': 1000}
+# Parameter size assumed for models without one in the registry, in billions
+ESTIMATED_PARAMETERS = 1000.0
+
+REGISTRY_COLUMNS = ['model_name', 'open_weight', 'release_date', 'parameters', 'est_flag']
+
+
+@single_flight
+def get_model_registry() -> list:
+    """
+    Read the model registry from the main repo (REGISTRY_URL), or from a local file if REGISTRY_URL is a path.
+
+    Returns:
+        list: List of dictionaries containing model registry data. Empty if the registry could not be read.
+    """
+    json_text = read_location(REGISTRY_URL)
+
+    if json_text is None:
+        print(f"Failed to read JSON file: {REGISTRY_URL}")
+        return []
+
+    return json.loads(json_text)
+
+
+def parse_parameters(params: pd.Series) -> pd.Series:
+    """
+    Convert parameter sizes such as '70B' or '1.8T' to billions of parameters.
+
+    Args:
+        params (pd.Series): Parameter sizes as strings.
+    Returns:
+        pd.Series: Parameter sizes in billions, NaN for missing and invalid sizes.
+    """
+    parts = params.astype("string").str.strip().str.upper().str.extract(r'^(\d+(?:\.\d+)?)\s*([BT])$')
+    return pd.to_numeric(parts[0]) * parts[1].map(PARAMETER_UNITS).astype(float)
+
+
+def build_registry_df(model_registry_data: list) -> pd.DataFrame:
+    """
+    Parse the model registry into typed columns in one pass.
+
+    Models without parameter size get ESTIMATED_PARAMETERS and est_flag set. Invalid parameter sizes and release
+    dates are reported and become NaN and NaT, so that these models are not plotted in the trend graph
+    and get the default marker size.
+
+    Args:
+        model_registry_data (list): List of dictionaries containing model registry data.
+    Returns:
+        pd.DataFrame: One row per model (first registry entry wins) with the columns
+                      model_name (str), open_weight (bool), release_date (datetime64), parameters (float, billions)
+                      and est_flag (bool).
+    """
+    registry = pd.DataFrame(model_registry_data, columns=['model_name', 'open_weight', 'parameters', 'release_date'])
+    registry = registry.dropna(subset=['model_name']).drop_duplicates('model_name').reset_index(drop=True)
+
+    params = registry['parameters'].fillna("").astype(str).str.strip()
+    est_flag = (params == "").to_numpy()
+    parameters = parse_parameters(params)
+    invalid = ~est_flag & parameters.isna().to_numpy()
+    if invalid.any():
+        print(f"Not a valid parameter size for {', '.join(registry['model_name'][invalid])}")
+
+    release_date = pd.to_datetime(registry['release_date'], format='ISO8601', errors='coerce')
+    invalid_date = (release_date.isna() & registry['release_date'].notna()).to_numpy()
+    if invalid_date.any():
+        print(f"Not a valid release date for {', '.join(registry['model_name'][invalid_date])}")
+
+    return pd.DataFrame({
+        'model_name': registry['model_name'].astype(str),
+        'open_weight': registry['open_weight'].where(registry['open_weight'].notna(), False).astype(bool),
+        'release_date': release_date,
+        'parameters': np.where(est_flag, ESTIMATED_PARAMETERS, parameters),
+        'est_flag': est_flag
+    }, columns=REGISTRY_COLUMNS)
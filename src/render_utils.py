@@ -0,0 +1,83 @@
+## Optional process pool for building plotly figures
+import os
+import atexit
+import asyncio
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from gradio.components.plot import PlotData
+
+# Number of worker processes used to build figures - 0 builds them in the Gradio worker thread (default)
+RENDER_WORKERS = int(os.environ.get("RENDER_WORKERS", 0))
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_render_pool(workers: int = None) -> ProcessPoolExecutor:
+    """
+    Get the process pool used to build figures, starting it on first use.
+
+    Args:
+        workers: Number of worker processes [Default - RENDER_WORKERS]
+    Returns:
+        The process pool, or None if figures are built in the calling thread.
+    """
+    global _pool
+    workers = RENDER_WORKERS if workers is None else workers
+    if workers <= 0:
+        return None
+
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                # Spawn fresh interpreters instead of forking the threads of the running app
+                _pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+                atexit.register(_pool.shutdown, wait=False, cancel_futures=True)
+    return _pool
+
+
+def _render_json(build_fn, args: tuple, kwargs: dict) -> str:
+    """
+    Build a figure in a worker process and return it as plotly JSON.
+    """
+    return build_fn(*args, **kwargs).to_json()
+
+
+def render_figure(build_fn, *args, **kwargs):
+    """
+    Build a plotly figure, in the render pool if it is enabled.
+
+    Args:
+        build_fn: Module-level function returning a plotly figure. Its arguments are sent to the worker process,
+                  so pass compact inputs (dicts of arrays, lists, strings), not DataFrames.
+        *args, **kwargs: Arguments of build_fn
+    Returns:
+        The plotly figure if the pool is disabled, otherwise the figure JSON wrapped for gr.Plot
+        so that it is not parsed again in the app process.
+    """
+    pool = get_render_pool()
+    if pool is None:
+        return build_fn(*args, **kwargs)
+
+    figure_json = pool.submit(_render_json, build_fn, args, kwargs).result()
+    return PlotData(type="plotly", plot=figure_json)
+
+
+async def render_figure_async(build_fn, *args, **kwargs):
+    """
+    Async variant of render_figure, building the figure without blocking the event loop.
+
+    Args:
+        build_fn: Module-level function returning a plotly figure, see render_figure
+        *args, **kwargs: Arguments of build_fn
+    Returns:
+        The plotly figure, or the figure JSON wrapped for gr.Plot if the pool is enabled.
+    """
+    pool = get_render_pool()
+    if pool is None:
+        return await asyncio.to_thread(build_fn, *args, **kwargs)
+
+    figure_json = await asyncio.wrap_future(pool.submit(_render_json, build_fn, args, kwargs))
+    return PlotData(type="plotly", plot=figure_json)
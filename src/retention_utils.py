@@ -0,0 +1,447 @@
+## Memory budget of the snapshot - older versions are held on disk and read again on demand
+import os
+import atexit
+import glob
+import shutil
+import tempfile
+import threading
+from collections import OrderedDict
+from collections.abc import MutableMapping, Sequence
+
+import numpy as np
+import pandas as pd
+
+from src.leaderboard_utils import evict_results, encode_models, RESULTS_HASH
+
+# Memory the processed versions of a snapshot may take, in MB - older versions are moved to disk beyond it.
+# Counts the frames, display frames, confidence intervals, game rankings, game matrix rows and history index rows
+# of every version, and SPILL_CACHE_MB for the versions read back from disk
+MEMORY_BUDGET_MB = float(os.environ.get("MEMORY_BUDGET_MB", 256))
+# Number of latest versions and variants that are always kept in memory, besides the latest text and multimodal versions
+HOT_VERSIONS = int(os.environ.get("HOT_VERSIONS", 3))
+# Directory the versions moved out of memory are written to - each process writes to a new directory in it,
+# with one subdirectory per snapshot, see get_spill_dir
+SPILL_DIR = os.environ.get("SPILL_DIR", tempfile.gettempdir())
+# Number of snapshots whose files are kept, requests may still read from the snapshot being replaced
+SPILL_SNAPSHOTS = 2
+# Memory of the DataFrames read back from disk that are kept for further requests, in MB, see load_frame
+SPILL_CACHE_MB = float(os.environ.get("SPILL_CACHE_MB", 16))
+# Bytes per row of the history index - the value (float32) and the model, metric and version codes
+HISTORY_ROW_BYTES = 4 + 3 * 2
+
+# DataFrames read back from disk and their size in bytes by path, least recently read first, see load_frame
+_loaded = OrderedDict()
+_loaded_size = {'nbytes': 0}
+_loaded_lock = threading.Lock()
+
+# Directory of this process in SPILL_DIR, see get_spill_dir
+_spill_dirs = {}
+_spill_lock = threading.Lock()
+
+
+def get_spill_dir() -> str:
+    """
+    Get the directory of this process in SPILL_DIR, created on first use and removed on exit.
+    The directory is only accessible by the user running the app, as the frames in it are read with pickle.
+    """
+    with _spill_lock:
+        if SPILL_DIR not in _spill_dirs:
+            os.makedirs(SPILL_DIR, exist_ok=True)
+            directory = tempfile.mkdtemp(prefix="clembench-spill-", dir=SPILL_DIR)
+            atexit.register(shutil.rmtree, directory, ignore_errors=True)
+            _spill_dirs[SPILL_DIR] = directory
+        return _spill_dirs[SPILL_DIR]
+
+
+def frame_nbytes(df: pd.DataFrame) -> int:
+    """
+    Memory used by a DataFrame in bytes, including the Python strings of object columns.
+    """
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+
+def object_nbytes(value) -> int:
+    """
+    Memory used by the DataFrames and arrays of a nested structure of dicts, lists and tuples, in bytes.
+    """
+    if isinstance(value, pd.DataFrame):
+        return frame_nbytes(value)
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    if isinstance(value, dict):
+        return sum(object_nbytes(item) for item in value.values())
+    if isinstance(value, (list, tuple)):
+        return sum(object_nbytes(item) for item in value)
+    return 0
+
+
+def spill_frame(df: pd.DataFrame, path: str) -> str:
+    """
+    Write a DataFrame to disk in columnar form - Parquet if pyarrow is installed, one array per column otherwise.
+
+    Args:
+        df: DataFrame to write.
+        path: Path of the file without extension.
+    Returns:
+        str: Path of the written file.
+    """
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        pyarrow = None
+
+    if pyarrow is not None:
+        df.to_parquet(path + ".parquet")
+        return path + ".parquet"
+
+    arrays = {f"column_{i}": df.iloc[:, i].to_numpy() for i in range(df.shape[1])}
+    models = [col == 'Model' and isinstance(df[col].dtype, pd.CategoricalDtype) for col in df.columns]
+    np.savez(path + ".npz", columns=np.array(df.columns, dtype=object), index=df.index.to_numpy(),
+             models=np.array(models), **arrays)
+    return path + ".npz"
+
+
+def load_frame(path: str) -> pd.DataFrame:
+    """
+    Read a DataFrame written by spill_frame, keeping the latest ones read within SPILL_CACHE_MB.
+    The DataFrame is shared between requests and must not be modified.
+    """
+    with _loaded_lock:
+        if path in _loaded:
+            _loaded.move_to_end(path)
+            return _loaded[path][0]
+
+    df = read_frame(path)
+    nbytes = frame_nbytes(df)
+    with _loaded_lock:
+        if path in _loaded:  # Read by another request meanwhile
+            _loaded.move_to_end(path)
+            return _loaded[path][0]
+        if nbytes <= SPILL_CACHE_MB * 1024 ** 2:
+            _loaded[path] = (df, nbytes)
+            _loaded_size['nbytes'] += nbytes
+        while _loaded_size['nbytes'] > SPILL_CACHE_MB * 1024 ** 2:
+            _loaded_size['nbytes'] -= _loaded.popitem(last=False)[1][1]
+    return df
+
+
+def evict_frames(directory: str):
+    """
+    Drop the DataFrames read from a spill directory from the cache of load_frame.
+    """
+    with _loaded_lock:
+        for path in [path for path in _loaded if path.startswith(directory + os.sep)]:
+            _loaded_size['nbytes'] -= _loaded.pop(path)[1]
+
+
+def read_frame(path: str) -> pd.DataFrame:
+    """
+    Read a DataFrame written by spill_frame from disk. Model columns are encoded over the global model dictionary again.
+    """
+    if path.endswith(".parquet"):
+        df = pd.read_parquet(path)
+        if 'Model' in df.columns and isinstance(df['Model'].dtype, pd.CategoricalDtype):
+            df['Model'] = encode_models(df['Model'].astype(object))
+        return df
+
+    with np.load(path, allow_pickle=True) as data:  # Written by spill_frame, object columns are pickled
+        columns = data['columns'].tolist()
+        df = pd.DataFrame({col: data[f"column_{i}"] for i, col in enumerate(columns)}, index=data['index'],
+                          columns=columns)
+        for col, is_model in zip(columns, data['models'].tolist()):
+            if is_model:
+                df[col] = encode_models(df[col])
+        return df
+
+
+class FrameStore(MutableMapping):
+    """
+    Mapping from snapshot key to DataFrame, where some of the DataFrames are held on disk.
+    DataFrames on disk are read again on access, the latest ones read are kept within SPILL_CACHE_MB (see load_frame).
+    """
+
+    def __init__(self, frames: dict = None):
+        self._resident = dict(frames or {})
+        self._spilled = {}  # key -> (path, bytes in memory, results hash, number of scores)
+
+    def __getitem__(self, key):
+        if key in self._resident:
+            return self._resident[key]
+        return load_frame(self._spilled[key][0])
+
+    def __setitem__(self, key, df):
+        self._spilled.pop(key, None)
+        self._resident[key] = df
+
+    def __delitem__(self, key):
+        if key in self._resident:
+            del self._resident[key]
+        else:
+            del self._spilled[key]
+
+    def __iter__(self):
+        yield from self._resident
+        yield from self._spilled
+
+    def __len__(self):
+        return len(self._resident) + len(self._spilled)
+
+    def is_resident(self, key) -> bool:
+        return key in self._resident
+
+    def nbytes(self, key) -> int:
+        """
+        Memory used by the DataFrame of a key, or that it used before it was moved to disk.
+        """
+        if key in self._resident:
+            return frame_nbytes(self._resident[key])
+        return self._spilled[key][1]
+
+    def values_count(self, key) -> int:
+        """
+        Number of scores of the DataFrame of a key, see count_values, without reading it from disk.
+        """
+        if key in self._resident:
+            return count_values(self._resident[key])
+        return self._spilled[key][3]
+
+    def spilled_path(self, key) -> str:
+        return self._spilled[key][0] if key in self._spilled else None
+
+    def fingerprint(self, key) -> str:
+        """
+        Hash of the results.csv of the DataFrame of a key, without reading it from disk. None if not known.
+        """
+        if key in self._resident:
+            return self._resident[key].attrs.get(RESULTS_HASH)
+        return self._spilled[key][2]
+
+    def spill(self, key, path: str, written: dict = None):
+        """
+        Move the DataFrame of a key to disk.
+
+        Args:
+            key: Key of the DataFrame.
+            path: Path of the file without extension, see spill_frame.
+            written: Mapping from id of a DataFrame to the file it was written to, DataFrames shared between
+                     keys are written once.
+        """
+        df = self._resident.pop(key)
+        written = {} if written is None else written
+        if id(df) not in written:
+            written[id(df)] = spill_frame(df, path)
+        self._spilled[key] = (written[id(df)], frame_nbytes(df), df.attrs.get(RESULTS_HASH), count_values(df))
+
+
+class FrameList(Sequence):
+    """
+    List of the DataFrames of a FrameStore for a list of keys, read on access.
+    Used in place of the "dataframes" lists of get_github_data and get_version_data.
+    """
+
+    def __init__(self, store: FrameStore, keys: list):
+        self._store = store
+        self._keys = list(keys)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._store[key] for key in self._keys[index]]
+        return self._store[self._keys[index]]
+
+    def __len__(self):
+        return len(self._keys)
+
+
+def same_results(frames, key, df: pd.DataFrame) -> bool:
+    """
+    Check if a DataFrame of a previous snapshot was processed from the same results as df,
+    without reading it from disk if it was moved there.
+
+    Args:
+        frames: Frames of the previous snapshot, a dict or a FrameStore.
+        key: Snapshot key of the DataFrame.
+        df: Processed DataFrame of the new snapshot.
+    """
+    if key not in frames:
+        return False
+    if isinstance(frames, FrameStore):
+        fingerprint = frames.fingerprint(key)
+        if fingerprint is not None or not frames.is_resident(key):
+            return fingerprint is not None and fingerprint == df.attrs.get(RESULTS_HASH)
+    return frames[key] is df
+
+
+def version_usage(snapshot: dict) -> dict:
+    """
+    Memory used by the frames and display frames of every version of a snapshot,
+    DataFrames shared between leaderboards are counted once. These are moved to disk by apply_retention.
+
+    Returns:
+        dict: Mapping from version name to bytes in memory (or before being moved to disk).
+    """
+    usage = {}
+    counted = set()
+    for store_name in ['frames', 'display']:
+        store = snapshot[store_name]
+        for key in store:
+            version = key[1]
+            if isinstance(store, FrameStore):
+                path = store.spilled_path(key)
+                identity = path if path else id(store[key])
+                nbytes = store.nbytes(key)
+            else:
+                identity = id(store[key])
+                nbytes = frame_nbytes(store[key])
+            if identity not in counted:
+                counted.add(identity)
+                usage[version] = usage.get(version, 0) + nbytes
+    return usage
+
+
+def index_usage(snapshot: dict) -> dict:
+    """
+    Memory used by the structures of every version of a snapshot that stay in memory - the confidence intervals,
+    the game rankings, the rows of the game matrix and (estimated) the rows of the history index.
+
+    Returns:
+        dict: Mapping from version name to bytes in memory.
+    """
+    usage = {version: object_nbytes(intervals) for version, intervals in snapshot['intervals'].items()}
+    for (key, version), rankings in snapshot['rankings'].items():
+        usage[version] = usage.get(version, 0) + object_nbytes(rankings)
+
+    matrix = snapshot['game_matrix']
+    n_rows = sum(stop - start for start, stop in matrix['offsets'].values())
+    row_bytes = object_nbytes([matrix[name] for name in ['played', 'quality', 'available', 'scored', 'models']])
+    row_bytes = row_bytes / n_rows if n_rows else 0
+    for version, (start, stop) in matrix['offsets'].items():
+        usage[version] = usage.get(version, 0) + int((stop - start) * row_bytes)
+
+    frames = snapshot['frames']
+    for key in frames:
+        if key[0] == 'versions':
+            # The history index holds one row per score of every version, see build_history_index
+            n_values = frames.values_count(key) if isinstance(frames, FrameStore) else count_values(frames[key])
+            usage[key[1]] = usage.get(key[1], 0) + n_values * HISTORY_ROW_BYTES
+    return usage
+
+
+def count_values(df: pd.DataFrame) -> int:
+    """
+    Number of scores of a processed DataFrame, missing scores are not counted.
+    """
+    return int(df.iloc[:, 1:].count().sum())
+
+
+def hot_versions(snapshot: dict, n_hot: int = HOT_VERSIONS) -> set:
+    """
+    Versions that are always kept in memory - the latest text and multimodal versions and the n_hot latest
+    versions and variants.
+    """
+    names = [metadata['name'] for metadata in snapshot['version_data']['versions']]
+    hot = set(names[:n_hot])
+    for data in snapshot['github_data'].values():
+        if data['version_data']:
+            hot.add(data['version_data'][0]['name'])
+    return hot
+
+
+def apply_retention(snapshot: dict, budget_mb: float = MEMORY_BUDGET_MB, n_hot: int = HOT_VERSIONS,
+                    directory: str = None) -> dict:
+    """
+    Keep the processed versions of a snapshot within a memory budget.
+    The oldest versions that are not hot (see hot_versions) are moved to disk until the budget is met.
+    Only the frames and display frames are moved, the structures counted by index_usage stay in memory.
+
+    Args:
+        snapshot (dict): See index_snapshot, with FrameStores as "frames" and "display". The "dataframes" lists
+                         of its github_data and version_data must read from them, see FrameList.
+        budget_mb: Memory budget in MB, SPILL_CACHE_MB of it is kept for the versions read back from disk.
+        n_hot: Number of latest versions that are always kept in memory.
+        directory: Directory the versions are written to [Default - the directory of this process, see get_spill_dir]
+    Returns:
+        snapshot (dict): The same snapshot.
+    """
+    directory = directory or get_spill_dir()
+    frames = snapshot['frames']
+    display = snapshot['display']
+    usage = version_usage(snapshot)
+    total = sum(usage.values()) + sum(index_usage(snapshot).values())
+    budget = max(budget_mb - SPILL_CACHE_MB, 0) * 1024 ** 2
+    hot = hot_versions(snapshot, n_hot)
+    names = [metadata['name'] for metadata in snapshot['version_data']['versions']]
+
+    snapshot_dir = os.path.join(directory, f"{snapshot['created']:%Y%m%d_%H%M%S_%f}")
+    written = {}
+    for version in reversed(names):  # Oldest first
+        if total <= budget:
+            break
+        if version in hot:
+            continue
+        os.makedirs(snapshot_dir, exist_ok=True)
+        for store_name, store in [('frames', frames), ('display', display)]:
+            for key in [key for key in store if key[1] == version and store.is_resident(key)]:
+                store.spill(key, os.path.join(snapshot_dir, f"{store_name}_{key[0]}_{version}"), written)
+        total -= usage[version]
+
+    if total > budget:
+        print(f"Leaderboard snapshot takes {total / 1024 ** 2:.1f} MB with all older versions on disk, "
+              f"memory budget is {budget_mb} MB")
+
+    # The parsed results of the versions on disk are cached by their hash, drop them so that they are freed.
+    # The results of the other versions stay cached and are not processed again on the next refresh
+    evict_results({store.fingerprint(key) for store in [frames, display] for key in store
+                   if not store.is_resident(key)} - {None})
+
+    # Files of older snapshots are no longer read
+    for old_dir in sorted(glob.glob(os.path.join(directory, "*")))[:-SPILL_SNAPSHOTS]:
+        evict_frames(old_dir)
+        shutil.rmtree(old_dir, ignore_errors=True)
+
+    return snapshot
+
+
+def memory_report(snapshot: dict) -> pd.DataFrame:
+    """
+    Memory use of every version of a snapshot.
+
+    Args:
+        snapshot (dict): See index_snapshot.
+    Returns:
+        pd.DataFrame: One row per version, latest first - Version, Hot, In Memory, Memory (MB), Index (MB) and
+                      On Disk (MB). Memory (MB) is the frames and display frames, of the versions on disk what they
+                      take when read again. Index (MB) is what stays in memory in any case, see index_usage.
+    """
+    usage = version_usage(snapshot)
+    indexes = index_usage(snapshot)
+    hot = hot_versions(snapshot)
+    frames = snapshot['frames']
+    rows = []
+    for metadata in snapshot['version_data']['versions']:
+        version = metadata['name']
+        keys = [key for key in frames if key[1] == version]
+        paths = set()
+        if isinstance(frames, FrameStore):
+            paths = {frames.spilled_path(key) for key in keys} | {snapshot['display'].spilled_path(key)
+                                                                  for key in keys if key in snapshot['display']}
+            paths.discard(None)
+        resident = not isinstance(frames, FrameStore) or all(frames.is_resident(key) for key in keys)
+        rows.append({
+            'Version': version,
+            'Hot': version in hot,
+            'In Memory': resident,
+            'Memory (MB)': round(usage.get(version, 0) / 1024 ** 2, 3),
+            'Index (MB)': round(indexes.get(version, 0) / 1024 ** 2, 3),
+            'On Disk (MB)': round(sum(os.path.getsize(path) for path in paths if os.path.exists(path)) / 1024 ** 2, 3)
+        })
+    return pd.DataFrame(rows)
+
+
+if __name__ == '__main__':
+    from src.snapshot_utils import get_snapshot
+
+    report = memory_report(get_snapshot())
+    print(report.to_string(index=False))
+    in_memory = report.loc[report['In Memory'], 'Memory (MB)'].sum() + report['Index (MB)'].sum()
+    print(f"\nIn memory: {in_memory:.3f} MB "
+          f"(budget {MEMORY_BUDGET_MB} MB), on disk: {report['On Disk (MB)'].sum():.3f} MB")
@@ -0,0 +1,139 @@
+## Clemscores and rankings with custom game weights, computed from the game matrix of the snapshot
+import gradio as gr
+import numpy as np
+import pandas as pd
+
+from src.leaderboard_utils import widen_frame
+from src.snapshot_utils import get_snapshot, select_latest_version, VERSIONS_KEY
+
+WEIGHTED_COLUMNS = ['Rank', 'Model', 'Weighted Clemscore', 'Weighted % Played', 'Weighted Quality Score', 'Clemscore']
+
+
+def parse_weights(weights) -> dict:
+    """
+    Parse game weights given as a mapping or as text such as 'taboo=2, wordle=0.5; imagegame=0'.
+
+    Args:
+        weights: Dict mapping game name to weight, or text with one game=weight pair per item.
+    Returns:
+        dict: Mapping from lowercase game name to weight.
+    Raises:
+        ValueError: If a weight is not a non-negative number.
+    """
+    if isinstance(weights, str):
+        items = [item.partition("=") for item in weights.replace(";", ",").split(",") if item.strip()]
+        weights = {game: weight for game, _, weight in items}
+
+    parsed = {}
+    for game, weight in (weights or {}).items():
+        try:
+            weight = float(weight)
+        except (TypeError, ValueError):
+            raise ValueError(f"Invalid weight for {str(game).strip()!r}: {weight!r}")
+        if not weight >= 0:
+            raise ValueError(f"Weights must be non-negative, got {weight} for {str(game).strip()!r}")
+        parsed[str(game).strip().lower()] = weight
+    return parsed
+
+
+def get_weight_vector(weights, games: list) -> np.ndarray:
+    """
+    Weight of every game of the game matrix, games without a weight count with 1 (the regular clemscore).
+
+    Args:
+        weights: Game weights, see parse_weights.
+        games: Games of the game matrix, see build_game_matrix.
+    Returns:
+        np.ndarray: One weight per game.
+    Raises:
+        ValueError: If a weight is invalid or given for a game that is not in the game matrix.
+    """
+    weights = parse_weights(weights)
+    unknown = sorted(set(weights) - {game.lower() for game in games})
+    if unknown:
+        raise ValueError(f"Unknown games: {', '.join(unknown)}. Available games: {', '.join(games)}")
+    return np.array([weights.get(game.lower(), 1.0) for game in games])
+
+
+def weighted_scores(weights, matrix: dict = None) -> dict:
+    """
+    Compute the clemscore of every model of every version with custom game weights.
+
+    Like the clemscore, the weighted score is the weighted average % Played over the games of the version
+    times the weighted average Quality Score over the games the model has a quality score in, divided by 100.
+
+    Args:
+        weights: Game weights, see parse_weights.
+        matrix: Game matrix, see build_game_matrix [Default - the game matrix of the current snapshot]
+    Returns:
+        dict: Arrays over the rows of the game matrix - "played", "quality" and "clemscore".
+    """
+    matrix = matrix if matrix is not None else get_snapshot()['game_matrix']
+    w = get_weight_vector(weights, matrix['games'])
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        played = (matrix['played'] @ w) / (matrix['available'] @ w)
+        quality = (matrix['quality'] @ w) / (matrix['scored'] @ w)
+    played = np.nan_to_num(played)
+    quality = np.nan_to_num(quality)
+
+    return {'played': played, 'quality': quality, 'clemscore': played * quality / 100}
+
+
+def weighted_rankings(weights, matrix: dict = None, scores: dict = None) -> dict:
+    """
+    Rank the models of every version by their clemscore with custom game weights.
+
+    Args:
+        weights: Game weights, see parse_weights.
+        matrix: Game matrix, see build_game_matrix [Default - the game matrix of the current snapshot]
+        scores: Output of weighted_scores for the weights and matrix, computed if not given.
+    Returns:
+        dict: Mapping from version name to the rows of the game matrix, best model first.
+    """
+    matrix = matrix if matrix is not None else get_snapshot()['game_matrix']
+    scores = (scores if scores is not None else weighted_scores(weights, matrix))['clemscore']
+
+    # One sort over all versions - rows are grouped by version first, then sorted by descending score
+    block = np.empty(len(scores), dtype=np.int32)
+    for i, (start, stop) in enumerate(matrix['offsets'].values()):
+        block[start:stop] = i
+    order = np.lexsort((-scores, block))
+    return {version: order[start:stop] for version, (start, stop) in matrix['offsets'].items()}
+
+
+def get_weighted_table(version: str, weights) -> pd.DataFrame:
+    """
+    Get the leaderboard of a version ranked by the clemscore with custom game weights.
+
+    Args:
+        version: Name of the version, the latest version is used if not set
+        weights: Game weights, see parse_weights. Invalid weights and unknown games are shown as an error
+                 in the frontend.
+    Returns:
+        pd.DataFrame: WEIGHTED_COLUMNS, best model first.
+    """
+    snapshot = get_snapshot()
+    if not version:
+        version = select_latest_version(snapshot, VERSIONS_KEY)
+
+    matrix = snapshot['game_matrix']
+    try:
+        scores = weighted_scores(weights, matrix)
+    except ValueError as e:
+        raise gr.Error(str(e))
+
+    start, stop = matrix['offsets'][version]
+    order = weighted_rankings(weights, matrix, scores)[version] - start
+    scores = {name: values[start:stop] for name, values in scores.items()}
+
+    df = snapshot['frames'][(VERSIONS_KEY, version)]
+    table = pd.DataFrame({
+        'Rank': np.arange(1, len(order) + 1),
+        'Model': matrix['models'][start:stop][order],
+        'Weighted Clemscore': scores['clemscore'][order].round(2),
+        'Weighted % Played': scores['played'][order].round(2),
+        'Weighted Quality Score': scores['quality'][order].round(2),
+        'Clemscore': widen_frame(df[['Clemscore']])['Clemscore'].to_numpy()[order],
+    })
+    return table[WEIGHTED_COLUMNS]
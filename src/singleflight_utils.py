@@ -0,0 +1,101 @@
+## Request coalescing (single-flight) for concurrent identical loads
+import asyncio
+import functools
+import threading
+
+
+def make_key(args: tuple, kwargs: dict) -> tuple:
+    """
+    Build a hashable key from the arguments of a call. Lists and dicts from the frontend are converted to tuples.
+
+    Args:
+        args (tuple): Positional arguments of the call.
+        kwargs (dict): Keyword arguments of the call.
+    Returns:
+        tuple: The key of the call.
+    """
+    def freeze(value):
+        if isinstance(value, (list, tuple)):
+            return tuple(freeze(v) for v in value)
+        if isinstance(value, dict):
+            return tuple(sorted((k, freeze(v)) for k, v in value.items()))
+        return value
+
+    return freeze(args), freeze(kwargs)
+
+
+class _Call:
+    """
+    An in-flight call of a single-flight function, shared by every caller with the same key.
+    """
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+def single_flight(fn):
+    """
+    Decorator - concurrent calls of fn with the same arguments wait for one in-flight call and share its result.
+    Calls made after the in-flight call finished run fn again, results are not cached.
+
+    Args:
+        fn: Function with hashable arguments (lists and dicts are converted, see make_key).
+    Returns:
+        The wrapped function.
+    """
+    calls = {}
+    lock = threading.Lock()
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        key = make_key(args, kwargs)
+        with lock:
+            call = calls.get(key)
+            leader = call is None
+            if leader:
+                call = calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn(*args, **kwargs)
+        except Exception as error:
+            call.error = error
+            raise
+        finally:
+            with lock:
+                del calls[key]
+            call.done.set()
+        return call.result
+
+    return wrapper
+
+
+def single_flight_async(fn):
+    """
+    Decorator - async variant of single_flight for coroutine functions.
+    Concurrent callers on the same event loop await one task. Cancelling a caller does not cancel the shared task.
+
+    Args:
+        fn: Coroutine function with hashable arguments (lists and dicts are converted, see make_key).
+    Returns:
+        The wrapped coroutine function.
+    """
+    tasks = {}
+
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        key = (id(asyncio.get_running_loop()), make_key(args, kwargs))
+        task = tasks.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn(*args, **kwargs))
+            tasks[key] = task
+            task.add_done_callback(lambda _: tasks.pop(key, None))
+        return await asyncio.shield(task)
+
+    return wrapper
@@ -0,0 +1,505 @@
+## Server-side snapshots of the processed leaderboards
+import os
+import asyncio
+import functools
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from src.assets.text_content import TEXT_NAME, MULTIMODAL_NAME
+from src.leaderboard_utils import get_github_data, query_search, build_game_rankings, build_game_matrix, widen_frame
+from src.version_utils import get_version_data
+from src.bootstrap_utils import get_confidence_intervals, add_confidence_columns
+from src.registry_utils import get_model_registry, build_registry_df
+from src.async_utils import get_benchmark_versions_async, get_github_data_async, get_version_data_async
+from src.async_utils import get_model_registry_async
+from src.singleflight_utils import single_flight, single_flight_async
+from src.retention_utils import FrameStore, FrameList, same_results, apply_retention
+
+# Snapshot references - the only values the frontend needs to send back to the server
+TEXT_KEY = "text"
+MULTIMODAL_KEY = "multimodal"
+VERSIONS_KEY = "versions"
+
+# Number of leading columns shown per leaderboard (Model, Clemscore, % Played, Quality Score)
+# Leaderboards not listed here are shown with all columns
+DISPLAY_COLUMNS = {TEXT_KEY: 4, MULTIMODAL_KEY: 4}
+
+# Stale-while-revalidate - after SNAPSHOT_SOFT_TTL the snapshot is still served while a new one is built in the
+# background. Requests never wait for a refresh - a snapshot older than SNAPSHOT_HARD_TTL, or served after
+# SNAPSHOT_ERROR_BUDGET refreshes in a row failed, is shown with a staleness banner, see get_staleness_message.
+SNAPSHOT_SOFT_TTL = int(os.environ.get("SNAPSHOT_SOFT_TTL", 3600))  # in seconds
+SNAPSHOT_HARD_TTL = int(os.environ.get("SNAPSHOT_HARD_TTL", 86400))  # in seconds
+SNAPSHOT_ERROR_BUDGET = int(os.environ.get("SNAPSHOT_ERROR_BUDGET", 3))
+# Failed refreshes are retried after SNAPSHOT_RETRY_DELAY seconds, doubled after every failure up to SNAPSHOT_RETRY_MAX
+SNAPSHOT_RETRY_DELAY = int(os.environ.get("SNAPSHOT_RETRY_DELAY", 60))  # in seconds
+SNAPSHOT_RETRY_MAX = int(os.environ.get("SNAPSHOT_RETRY_MAX", 3600))  # in seconds
+
+_snapshot = None
+_snapshot_lock = threading.Lock()
+# State of the background refresh
+_refresh = {'running': False, 'errors': 0, 'last_error': None, 'retry_at': None}
+_refresh_lock = threading.Lock()
+# Guards the per-snapshot caches, see snapshot_cache
+_cache_lock = threading.Lock()
+# Functions called with every published snapshot, see add_snapshot_listener
+_listeners = []
+
+
+@single_flight
+def build_snapshot() -> dict:
+    """
+    Load the leaderboards from GitHub and index every processed DataFrame by (leaderboard, version).
+
+    Returns:
+        snapshot (dict): Dictionary containing:
+            - "github_data": Output of get_github_data (latest first, text and multimodal).
+            - "version_data": Output of get_version_data (all versions and variants).
+            - "frames": Mapping from (leaderboard key, version name) to the processed DataFrame, see FrameStore.
+                        Older versions are held on disk beyond the memory budget, see apply_retention.
+            - "intervals": Dict mapping version name to the clemscore confidence intervals and rank groups.
+            - "display": Mapping from (leaderboard key, version name) to the DataFrame shown in the frontend.
+            - "rankings": Dict mapping (leaderboard key, version name) to the per-game rankings, see build_game_rankings.
+            - "game_matrix": Per-game scores of all versions in one array, see build_game_matrix.
+            - "registry": The model registry, parsed once per snapshot, see build_registry_df.
+            - "created": Time at which the snapshot was built.
+            - "cache": Results of the functions cached per snapshot, see snapshot_cache.
+    """
+    return index_snapshot(get_github_data(), get_version_data(), _snapshot, build_registry_df(get_model_registry()))
+
+
+@single_flight_async
+async def build_snapshot_async() -> dict:
+    """
+    Async variant of build_snapshot, fetching all versions concurrently.
+
+    Returns:
+        snapshot (dict): See build_snapshot.
+    """
+    versions = await get_benchmark_versions_async()
+    github_data, version_data, registry_data = await asyncio.gather(
+        get_github_data_async(versions), get_version_data_async(versions), get_model_registry_async())
+    return await asyncio.to_thread(index_snapshot, github_data, version_data, _snapshot,
+                                   build_registry_df(registry_data))
+
+
+def index_snapshot(github_data: dict, version_data: dict, previous: dict = None,
+                   registry: pd.DataFrame = None) -> dict:
+    """
+    Index every processed DataFrame by (leaderboard, version) and precompute the display frames.
+
+    Args:
+        github_data (dict): Output of get_github_data.
+        version_data (dict): Output of get_version_data.
+        previous (dict): Snapshot being replaced. The intervals and display frames of the versions whose
+                         results did not change are reused, see same_results.
+        registry (pd.DataFrame): Output of build_registry_df. If it is empty (the registry could not be read),
+                                 the registry of the previous snapshot is kept.
+    Returns:
+        snapshot (dict): See build_snapshot.
+    """
+    if registry is None or registry.empty:
+        registry = previous['registry'] if previous is not None else build_registry_df([])
+
+    frames = {}
+    for key in [TEXT_KEY, MULTIMODAL_KEY]:
+        for metadata, df in zip(github_data[key]['version_data'], github_data[key]['dataframes']):
+            frames[(key, metadata['name'])] = df
+
+    for metadata, df in zip(version_data['versions'], version_data['dataframes']):
+        frames[(VERSIONS_KEY, metadata['name'])] = df
+
+    # Confidence intervals are computed in batch once per snapshot, the same version is shared between leaderboards
+    intervals = {}
+    display = {}
+    rankings = {}
+    for (key, version), df in frames.items():
+        if previous is not None and same_results(previous['frames'], (key, version), df):
+            intervals.setdefault(version, previous['intervals'][version])
+            display[(key, version)] = previous['display'][(key, version)]
+            rankings[(key, version)] = previous['rankings'][(key, version)]
+            continue
+        if version not in intervals:
+            intervals[version] = get_confidence_intervals(df)
+        rankings[(key, version)] = build_game_rankings(df)
+        n_columns = DISPLAY_COLUMNS.get(key)
+        display_df = widen_frame(df.iloc[:, :n_columns] if n_columns else df)
+        display[(key, version)] = add_confidence_columns(display_df, intervals[version])
+
+    game_matrix = build_game_matrix({version: df for (key, version), df in frames.items() if key == VERSIONS_KEY})
+
+    # The lists of DataFrames read from the snapshot frames, so that versions moved to disk are not held by them
+    frames = FrameStore(frames)
+    github_data = {
+        key: {**github_data[key],
+              'dataframes': FrameList(frames, [(key, metadata['name']) for metadata in github_data[key]['version_data']])}
+        for key in [TEXT_KEY, MULTIMODAL_KEY]
+    }
+    version_data = {
+        **version_data,
+        'dataframes': FrameList(frames, [(VERSIONS_KEY, metadata['name']) for metadata in version_data['versions']])
+    }
+
+    snapshot = {
+        'github_data': github_data,
+        'version_data': version_data,
+        'frames': frames,
+        'intervals': intervals,
+        'display': FrameStore(display),
+        'rankings': rankings,
+        'game_matrix': game_matrix,
+        'registry': registry,
+        'created': datetime.now(),
+        'cache': {}
+    }
+
+    return apply_retention(snapshot)
+
+
+def snapshot_cache(maxsize: int = 128):
+    """
+    Decorator - cache a function of a snapshot per snapshot, keeping the maxsize latest results like lru_cache.
+
+    The decorated function takes the snapshot as first argument, the other arguments must be hashable.
+    The results are held by the snapshot itself, so a result is always computed from the snapshot it is
+    looked up in, and it is dropped with that snapshot.
+
+    Args:
+        maxsize: Number of results kept per snapshot.
+    Returns:
+        The decorator.
+    """
+    def decorator(fn):
+        name = f"{fn.__module__}.{fn.__qualname__}"
+
+        @functools.wraps(fn)
+        def wrapper(snapshot: dict, *args):
+            with _cache_lock:
+                cache = snapshot['cache'].setdefault(name, OrderedDict())
+                if args in cache:
+                    cache.move_to_end(args)
+                    return cache[args]
+
+            result = fn(snapshot, *args)
+            with _cache_lock:
+                cache[args] = result
+                while len(cache) > maxsize:
+                    cache.popitem(last=False)
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+def check_snapshot(snapshot: dict) -> dict:
+    """
+    Check that a newly built snapshot can replace the one being served.
+
+    Args:
+        snapshot (dict): See build_snapshot.
+    Returns:
+        snapshot (dict): The same snapshot.
+    Raises:
+        ValueError: If the text leaderboard could not be loaded.
+    """
+    if not snapshot['github_data'][TEXT_KEY]['dataframes']:
+        raise ValueError("No leaderboard could be loaded")
+    return snapshot
+
+
+def add_snapshot_listener(listener):
+    """
+    Call a function with every snapshot that is published - the first one and every refresh.
+    It is called in the thread that publishes the snapshot, so it should only start its work, e.g. in a thread.
+
+    Args:
+        listener: Function taking the snapshot, see build_snapshot.
+    """
+    _listeners.append(listener)
+
+
+def notify_listeners(snapshot: dict):
+    """
+    Call the functions registered with add_snapshot_listener with a published snapshot.
+    A failing listener is reported and does not fail the refresh.
+    """
+    for listener in _listeners:
+        try:
+            listener(snapshot)
+        except Exception as error:
+            print(f"Snapshot listener {listener.__name__} failed: {error!r}")
+
+
+def set_snapshot(snapshot: dict):
+    """
+    Switch to a new, fully processed snapshot and reset the error count of the refresh.
+    """
+    global _snapshot
+    with _snapshot_lock:
+        published = _snapshot is None or snapshot['created'] > _snapshot['created']
+        if published:
+            _snapshot = snapshot
+    with _refresh_lock:
+        _refresh['errors'] = 0
+        _refresh['last_error'] = None
+        _refresh['retry_at'] = None
+    if published:
+        notify_listeners(snapshot)
+
+
+def record_refresh_error(error: Exception):
+    """
+    Count a failed refresh and schedule the next attempt with exponential backoff, the snapshot being served is kept.
+    """
+    with _refresh_lock:
+        _refresh['errors'] += 1
+        _refresh['last_error'] = error
+        delay = min(SNAPSHOT_RETRY_DELAY * 2 ** (_refresh['errors'] - 1), SNAPSHOT_RETRY_MAX)
+        _refresh['retry_at'] = datetime.now() + timedelta(seconds=delay)
+    print(f"Failed to refresh the leaderboard snapshot ({_refresh['errors']} in a row, retrying in {delay} s): "
+          f"{error!r}")
+
+
+def refresh_backoff() -> float:
+    """
+    Seconds to wait before the next refresh after failed refreshes, see record_refresh_error. 0 if the last one succeeded.
+    """
+    retry_at = _refresh['retry_at']
+    return max((retry_at - datetime.now()).total_seconds(), 0.0) if retry_at is not None else 0.0
+
+
+def refresh_snapshot() -> dict:
+    """
+    Build a new snapshot and switch to it. If the build fails, the snapshot being served is kept.
+
+    Returns:
+        snapshot (dict): The new snapshot, None if the refresh failed.
+    """
+    try:
+        snapshot = check_snapshot(build_snapshot())
+    except Exception as error:
+        record_refresh_error(error)
+        return None
+    set_snapshot(snapshot)
+    return snapshot
+
+
+def _background_refresh():
+    try:
+        refresh_snapshot()
+    finally:
+        with _refresh_lock:
+            _refresh['running'] = False
+
+
+def start_background_refresh() -> bool:
+    """
+    Start refreshing the snapshot in a background thread, unless a refresh is already running
+    or the backoff after a failed refresh has not passed yet.
+
+    Returns:
+        bool: True if a refresh was started.
+    """
+    with _refresh_lock:
+        if _refresh['running'] or (_refresh['retry_at'] is not None and datetime.now() < _refresh['retry_at']):
+            return False
+        _refresh['running'] = True
+    threading.Thread(target=_background_refresh, name="snapshot-refresh", daemon=True).start()
+    return True
+
+
+def snapshot_age(snapshot: dict) -> timedelta:
+    """
+    Age of a snapshot.
+    """
+    return datetime.now() - snapshot['created']
+
+
+def is_stale(snapshot: dict) -> bool:
+    """
+    Check if a snapshot is older than the hard TTL, or SNAPSHOT_ERROR_BUDGET refreshes in a row failed.
+    """
+    return snapshot_age(snapshot) > timedelta(seconds=SNAPSHOT_HARD_TTL) or _refresh['errors'] >= SNAPSHOT_ERROR_BUDGET
+
+
+def get_staleness_message() -> str:
+    """
+    Banner shown in the frontend while a stale snapshot is served, see is_stale.
+
+    Returns:
+        str: Markdown text of the banner, empty if the snapshot is up to date or not built yet.
+    """
+    snapshot = _snapshot
+    if snapshot is None or not is_stale(snapshot):
+        return ""
+    message = f"⚠️ Showing leaderboard data from {snapshot['created']:%d %b %Y %H:%M}"
+    if _refresh['errors']:
+        message += f", updating failed ({_refresh['errors']} attempts). Retrying in the background."
+    else:
+        message += ", an update is running in the background."
+    return message
+
+
+def get_snapshot() -> dict:
+    """
+    Get the snapshot held by the server, building it on first use.
+
+    A snapshot older than SNAPSHOT_SOFT_TTL is served as is while a new one is built in the background,
+    requests never wait for a refresh or fail because of one once a snapshot was built.
+
+    Returns:
+        snapshot (dict): See build_snapshot.
+    """
+    global _snapshot
+    if _snapshot is None:
+        built = None
+        with _snapshot_lock:
+            if _snapshot is None:
+                _snapshot = built = build_snapshot()
+        if built is not None:
+            notify_listeners(built)
+        return _snapshot
+
+    snapshot = _snapshot
+    if snapshot_age(snapshot) > timedelta(seconds=SNAPSHOT_SOFT_TTL):
+        start_background_refresh()
+    return snapshot
+
+
+async def get_snapshot_async() -> dict:
+    """
+    Async variant of get_snapshot, building the first snapshot without blocking the event loop.
+
+    Returns:
+        snapshot (dict): See build_snapshot.
+    """
+    global _snapshot
+    if _snapshot is None:
+        snapshot = await build_snapshot_async()
+        with _snapshot_lock:
+            published = _snapshot is None
+            if published:
+                _snapshot = snapshot
+        if published:
+            notify_listeners(snapshot)
+        return _snapshot
+
+    snapshot = _snapshot
+    if snapshot_age(snapshot) > timedelta(seconds=SNAPSHOT_SOFT_TTL):
+        start_background_refresh()
+    return snapshot
+
+
+def leaderboard_key(leaderboard: str) -> str:
+    """
+    Map a leaderboard reference from the frontend to a snapshot key.
+
+    Args:
+        leaderboard: Either a snapshot key (text, multimodal, versions) or a leaderboard display name.
+    Returns:
+        The snapshot key for the leaderboard.
+    """
+    if leaderboard == TEXT_NAME:
+        return TEXT_KEY
+    if leaderboard == MULTIMODAL_NAME:
+        return MULTIMODAL_KEY
+    if leaderboard in [TEXT_KEY, MULTIMODAL_KEY, VERSIONS_KEY]:
+        return leaderboard
+    raise KeyError(f"Unknown leaderboard: {leaderboard}")
+
+
+def get_latest_version(leaderboard: str = TEXT_KEY) -> str:
+    """
+    Get the name of the latest version of a leaderboard in the snapshot.
+
+    Args:
+        leaderboard: Leaderboard key or display name [Default - Text Leaderboard]
+    Returns:
+        Name of the latest version.
+    """
+    return select_latest_version(get_snapshot(), leaderboard)
+
+
+def select_latest_version(snapshot: dict, leaderboard: str = TEXT_KEY) -> str:
+    """
+    Get the name of the latest version of a leaderboard in a given snapshot, see get_latest_version.
+    """
+    key = leaderboard_key(leaderboard)
+    if key == VERSIONS_KEY:
+        return snapshot['version_data']['versions'][0]['name']
+    return snapshot['github_data'][key]['version_data'][0]['name']
+
+
+def get_snapshot_df(leaderboard: str = TEXT_KEY, version: str = None) -> pd.DataFrame:
+    """
+    Get a processed DataFrame from the server-side snapshot.
+
+    Args:
+        leaderboard: Leaderboard key or display name [Default - Text Leaderboard]
+        version: Name of the version, the latest version of the leaderboard is used if not set
+    Returns:
+        The processed DataFrame. Treat it as read-only, it is shared between all sessions.
+    """
+    return select_snapshot_df(get_snapshot(), leaderboard, version)
+
+
+def select_snapshot_df(snapshot: dict, leaderboard: str = TEXT_KEY, version: str = None) -> pd.DataFrame:
+    """
+    Get a processed DataFrame from a given snapshot, e.g. the one returned by get_snapshot_async.
+    See get_snapshot_df for the arguments.
+    """
+    key = leaderboard_key(leaderboard)
+    if not version:
+        version = select_latest_version(snapshot, key)
+
+    return snapshot['frames'][(key, version)]
+
+
+def get_display_df(leaderboard: str = TEXT_KEY, version: str = None) -> pd.DataFrame:
+    """
+    Get the DataFrame shown in the frontend table for a leaderboard.
+
+    Args:
+        leaderboard: Leaderboard key or display name [Default - Text Leaderboard]
+        version: Name of the version, the latest version of the leaderboard is used if not set
+    Returns:
+        The processed DataFrame, restricted to the display columns of the leaderboard and with the
+        clemscore confidence intervals. Treat it as read-only, it is shared between all sessions.
+    """
+    return select_display_df(get_snapshot(), leaderboard, version)
+
+
+def select_display_df(snapshot: dict, leaderboard: str = TEXT_KEY, version: str = None) -> pd.DataFrame:
+    """
+    Get the DataFrame shown in the frontend table from a given snapshot, the version is resolved in the same
+    snapshot. See get_display_df for the arguments.
+    """
+    key = leaderboard_key(leaderboard)
+    if not version:
+        version = select_latest_version(snapshot, key)
+
+    return snapshot['display'][(key, version)]
+
+
+def query_snapshot(leaderboard: str, query: str, version: str = None) -> pd.DataFrame:
+    """
+    Filter a leaderboard held in the snapshot based on the search query.
+    Only the reference and the query are sent by the frontend, not the table itself.
+
+    Args:
+        leaderboard: Leaderboard key or display name.
+        query: A string of queries separated by ";".
+        version: Name of the version, the latest version of the leaderboard is used if not set
+    Returns:
+        Filtered DataFrame containing searched queries in the 'Model' column.
+    """
+    return query_search(get_display_df(leaderboard, version), query)
+
+
+if __name__ == '__main__':
+    snapshot = get_snapshot()
+    for key in snapshot['frames']:
+        print(key, snapshot['frames'][key].shape)
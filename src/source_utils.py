@@ -0,0 +1,160 @@
+## Data sources of the leaderboard - clembench-runs over HTTP, from a local checkout or from a tarball
+import os
+import mmap
+import posixpath
+import tarfile
+import threading
+from functools import lru_cache
+from urllib.parse import urlparse, unquote
+
+import requests
+
+from src.assets.text_content import REPO, BENCHMARK_FILE
+
+SOURCE_HTTP = "http"
+SOURCE_DIRECTORY = "directory"
+SOURCE_TARBALL = "tarball"
+
+TARBALL_SUFFIXES = (".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tar.xz")
+# Only these files are kept when reading a tarball, the transcripts of the runs are skipped
+RESULTS_FILE = "results.csv"
+
+_tarball_lock = threading.Lock()
+
+
+def local_path(location: str) -> str:
+    """
+    Local path of a location given as a path or a file:// URL.
+    """
+    if location.startswith("file://"):
+        return unquote(urlparse(location).path)
+    return os.path.expanduser(location)
+
+
+def is_http(location: str) -> bool:
+    """
+    Check if a location is an HTTP(S) URL.
+    """
+    return location.startswith(("http://", "https://"))
+
+
+def source_kind(repo: str = REPO) -> str:
+    """
+    Kind of data source of a clembench-runs location.
+
+    Args:
+        repo: URL of the raw files, path of a local checkout, or path of a tarball of the repository.
+    Returns:
+        str: SOURCE_HTTP, SOURCE_DIRECTORY or SOURCE_TARBALL
+    """
+    if is_http(repo):
+        return SOURCE_HTTP
+    if local_path(repo).endswith(TARBALL_SUFFIXES):
+        return SOURCE_TARBALL
+    return SOURCE_DIRECTORY
+
+
+def member_path(name: str) -> str:
+    """
+    Path of a tarball member relative to the root of the archive.
+
+    Args:
+        name: Name of the member, e.g. './v1.6/results.csv'
+    Returns:
+        str: Normalized path, e.g. 'v1.6/results.csv'. None if it is absolute or leaves the root of the archive.
+    """
+    path = posixpath.normpath(name)
+    if posixpath.isabs(path) or path == ".." or path.startswith("../"):
+        return None
+    return path
+
+
+def read_file(path: str) -> str:
+    """
+    Read a local text file through a memory map, decoded without copying the file into a bytes object first.
+
+    Args:
+        path: Path of the file.
+    Returns:
+        str: Content of the file, None if it does not exist.
+    """
+    try:
+        with open(path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return ""
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                return str(data, 'utf-8')
+    except (FileNotFoundError, IsADirectoryError, NotADirectoryError):
+        return None
+
+
+@lru_cache(maxsize=1)
+def _read_tarball(path: str, modified: float) -> dict:
+    """
+    Read the benchmark JSON file and the results files of a tarball in one pass.
+    The tarball is read again when it is modified.
+
+    Args:
+        path: Path of the tarball.
+        modified: Modification time of the tarball, part of the cache key.
+    Returns:
+        dict: Mapping from path relative to the root of the repository to the content of the file.
+    """
+    files = {}
+    with tarfile.open(path, 'r:*') as tar:
+        for member in tar:
+            if not member.isfile() or posixpath.basename(member.name) not in (BENCHMARK_FILE, RESULTS_FILE):
+                continue
+            name = member_path(member.name)
+            if name is None:
+                print(f"Skipping {member.name} in {path}, it is outside of the archive root")
+                continue
+            files[name] = tar.extractfile(member).read().decode('utf-8')
+
+    # Archives of a repository usually have a top-level directory (e.g. clembench-runs-main/), strip it
+    roots = {name.split("/")[0] for name in files}
+    if BENCHMARK_FILE not in files and len(roots) == 1:
+        root = roots.pop() + "/"
+        files = {name[len(root):]: content for name, content in files.items()}
+    return files
+
+
+def read_location(location: str) -> str:
+    """
+    Read a text file from a URL or a local path.
+
+    Args:
+        location: HTTP(S) URL, file:// URL or local path.
+    Returns:
+        str: Content of the file, None if it could not be read.
+    """
+    if is_http(location):
+        response = requests.get(location)
+        return response.text if response.status_code == 200 else None
+    return read_file(local_path(location))
+
+
+def read_repo_file(relative_path: str, repo: str = REPO) -> str:
+    """
+    Read a file of clembench-runs from the configured data source.
+
+    Args:
+        relative_path: Path of the file in the repository, e.g. 'v1.6/results.csv'.
+        repo: Location of the repository, see source_kind.
+    Returns:
+        str: Content of the file, None if it could not be read.
+    """
+    kind = source_kind(repo)
+    if kind == SOURCE_HTTP:
+        return read_location(repo + relative_path)
+    if kind == SOURCE_DIRECTORY:
+        return read_file(os.path.join(local_path(repo), relative_path))
+
+    path = local_path(repo)
+    try:
+        modified = os.stat(path).st_mtime
+    except FileNotFoundError:
+        return None
+    with _tarball_lock:
+        files = _read_tarball(path, modified)
+    return files.get(relative_path)
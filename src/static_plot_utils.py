@@ -0,0 +1,291 @@
+## Pre-rendered default plots for mobile and embed clients
+import os
+import gzip
+import json
+import threading
+
+import gradio as gr
+from gradio.components.plot import PlotData
+
+from src.assets.text_content import TEXT_NAME, MULTIMODAL_NAME
+from src.snapshot_utils import get_snapshot, get_snapshot_async, add_snapshot_listener
+from src.plot_utils import plotly_snapshot_plot, select_snapshot_plot
+from src.trend_utils import select_trend_plot, get_final_trend_plot_async
+from src.trend_utils import START_DATE, TREND_VERSIONS, OPEN_DIP, COMM_DIP
+
+# Directory the static plots are written to, served by the app for embed clients
+STATIC_PLOT_DIR = "static_plots"
+# Decimals kept for the coordinates of the reduced figures
+PLOT_DECIMALS = 2
+
+# Layout of the plotly_white template that the reduced figures keep, the rest of the template is dropped
+REDUCED_LAYOUT = {
+    'plot_bgcolor': 'white',
+    'paper_bgcolor': 'white',
+    'xaxis': {'gridcolor': '#EBF0F8', 'zerolinecolor': '#EBF0F8'},
+    'yaxis': {'gridcolor': '#EBF0F8', 'zerolinecolor': '#EBF0F8'},
+}
+
+# Per-point marker properties of merged traces, see merge_traces
+POINT_MARKER_KEYS = ['color', 'symbol', 'size']
+
+# Plots of the latest snapshot rendered so far, and the snapshot being rendered in the background
+_static_plots = {'created': None, 'plots': {}, 'building': None}
+_static_plots_lock = threading.Lock()
+
+
+def plotly_plot_name(leaderboard: str, show_names: bool) -> str:
+    """
+    Name of the pre-rendered mobile plot of % played v/s quality score for all models of a leaderboard.
+    """
+    return f"plot_{'multimodal' if leaderboard == MULTIMODAL_NAME else 'text'}_mobile{'_names' if show_names else ''}"
+
+
+def trend_plot_name(benchmark: str) -> str:
+    """
+    Name of the pre-rendered mobile trend plot of a benchmark (Text or Multimodal).
+    """
+    return f"trend_{benchmark.lower()}_mobile"
+
+
+def merge_traces(traces: list) -> list:
+    """
+    Merge the marker traces that differ only in their points, names and marker colour, symbol and size into one
+    trace each, with the colours, symbols, sizes and labels held per point. The figure looks the same without
+    its legend, e.g. one trace for all models of the % played v/s quality score plot instead of one per model.
+
+    Args:
+        traces: Traces of a plotly JSON structure.
+    Returns:
+        list: The merged traces, in the order of the first trace of each group. Other traces are kept as they are.
+    """
+    groups = {}
+    for trace in traces:
+        mergeable = trace.get('type', 'scatter') == 'scatter' and trace.get('mode') in ['markers', 'markers+text']
+        if not mergeable or not isinstance(trace.get('x'), list):
+            groups[id(trace)] = [trace]
+            continue
+        marker = {k: v for k, v in trace.get('marker', {}).items() if k not in POINT_MARKER_KEYS}
+        rest = {k: v for k, v in trace.items() if k not in ['x', 'y', 'text', 'name', 'showlegend', 'marker']}
+        groups.setdefault(json.dumps([marker, rest], sort_keys=True), []).append(trace)
+
+    def per_point(trace, value):
+        return list(value) if isinstance(value, list) else [value] * len(trace['x'])
+
+    merged = []
+    for group in groups.values():
+        if len(group) == 1:
+            merged.append(group[0])
+            continue
+
+        trace = {k: v for k, v in group[0].items() if k not in ['name', 'showlegend']}
+        trace['showlegend'] = False
+        trace['x'] = [x for t in group for x in t['x']]
+        trace['y'] = [y for t in group for y in t['y']]
+        if any('text' in t for t in group):
+            trace['text'] = [text for t in group for text in per_point(t, t.get('text', ""))]
+        marker = dict(group[0].get('marker', {}))
+        for key in POINT_MARKER_KEYS:
+            if any(key in t.get('marker', {}) for t in group):
+                marker[key] = [v for t in group for v in per_point(t, t.get('marker', {}).get(key))]
+        trace['marker'] = marker
+        merged.append(trace)
+
+    return merged
+
+
+def reduce_figure(fig) -> dict:
+    """
+    Reduce a plotly figure for mobile and embed clients.
+    Drops the hover data and the plotly_white template, rounds the coordinates and, if the legend is hidden,
+    merges the marker traces into as few traces as possible (see merge_traces).
+
+    Args:
+        fig: Plotly figure
+    Returns:
+        dict: Reduced plotly JSON structure of the figure
+    """
+    fig_dict = json.loads(fig.to_json())
+
+    for trace in fig_dict['data']:
+        for key in ['customdata', 'hovertemplate', 'hovertext', 'legendgroup']:
+            trace.pop(key, None)
+        trace['hoverinfo'] = 'skip'
+        for axis in ['x', 'y']:
+            if isinstance(trace.get(axis), list):
+                trace[axis] = [round(v, PLOT_DECIMALS) if isinstance(v, float) else v for v in trace[axis]]
+
+    layout = fig_dict['layout']
+    if layout.get('showlegend') is False:
+        fig_dict['data'] = merge_traces(fig_dict['data'])
+    layout.pop('template', None)
+    for key, value in REDUCED_LAYOUT.items():
+        if isinstance(value, dict):
+            layout[key] = {**value, **layout.get(key, {})}
+        else:
+            layout.setdefault(key, value)
+
+    return fig_dict
+
+
+def build_static_plots(snapshot: dict, output_dir: str = None) -> dict:
+    """
+    Render the default mobile plots of a snapshot.
+
+    Every plot is kept in memory as reduced plotly JSON. If output_dir is set, each plot is also written
+    as gzipped JSON and as SVG and PNG images for embed clients, see write_images.
+
+    Args:
+        snapshot: Snapshot to plot, see build_snapshot
+        output_dir: Directory to write the static plots to, nothing is written if not set
+    Returns:
+        dict: Mapping from plot name to its reduced plotly JSON string
+    """
+    figures = {}
+    for leaderboard in [TEXT_NAME, MULTIMODAL_NAME]:
+        for show_names in [True, False]:
+            figures[plotly_plot_name(leaderboard, show_names)] = select_snapshot_plot(
+                snapshot, leaderboard, [], [], ["Select All Models"], ["Show Names"] if show_names else [], [],
+                ["Mobile View"])
+
+    for benchmark in ["Text", "Multimodal"]:
+        figures[trend_plot_name(benchmark)] = select_trend_plot(snapshot, benchmark, mobile_view=True)
+
+    import plotly.io as pio
+
+    plots = {}
+    for name, fig in figures.items():
+        if isinstance(fig, PlotData):  # Built in the render pool, see src/render_utils.py
+            fig = pio.from_json(fig.plot)
+        plots[name] = json.dumps(reduce_figure(fig), separators=(',', ':'))
+
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+            with gzip.open(os.path.join(output_dir, f"{name}.json.gz"), 'wt', encoding='utf-8') as f:
+                f.write(plots[name])
+            write_images(fig, os.path.join(output_dir, name))
+
+    return plots
+
+
+def write_images(fig, path: str):
+    """
+    Write a figure as SVG and PNG with kaleido (see requirements.txt). Skipped in environments without it.
+
+    Args:
+        fig: Plotly figure
+        path: Path of the images without extension
+    """
+    try:
+        import kaleido  # noqa: F401 - Used by plotly for static image export
+    except ImportError:
+        print(f"kaleido is not installed, skipping static images for {path}")
+        return
+
+    fig.write_image(f"{path}.svg")
+    fig.write_image(f"{path}.png", scale=2)
+
+
+def _render_static_plots(snapshot: dict):
+    try:
+        plots = build_static_plots(snapshot, STATIC_PLOT_DIR)
+    except Exception as error:
+        print(f"Failed to render the static plots of the snapshot of {snapshot['created']}: {error!r}")
+        plots = None
+    with _static_plots_lock:
+        if plots is not None and (_static_plots['created'] is None or snapshot['created'] > _static_plots['created']):
+            _static_plots['plots'] = plots
+            _static_plots['created'] = snapshot['created']
+        if _static_plots['building'] == snapshot['created']:
+            _static_plots['building'] = None
+
+
+def start_static_plots(snapshot: dict) -> bool:
+    """
+    Start rendering the static plots of a snapshot in a background thread, unless they are rendered or being
+    rendered already. Called with every published snapshot, see add_snapshot_listener.
+
+    Args:
+        snapshot: Snapshot to plot, see build_snapshot
+    Returns:
+        bool: True if the rendering was started
+    """
+    with _static_plots_lock:
+        if snapshot['created'] in [_static_plots['created'], _static_plots['building']]:
+            return False
+        _static_plots['building'] = snapshot['created']
+    threading.Thread(target=_render_static_plots, args=(snapshot,), name="static-plots", daemon=True).start()
+    return True
+
+
+add_snapshot_listener(start_static_plots)
+
+
+def get_static_plots(snapshot: dict = None) -> dict:
+    """
+    Get the latest pre-rendered plots without waiting for a render.
+    The plots of the previous snapshot are served until the plots of the current one are rendered.
+
+    Args:
+        snapshot: Current snapshot, rendered in the background if its plots are missing [Default - get_snapshot]
+    Returns:
+        dict: Mapping from plot name to its reduced plotly JSON string, see build_static_plots.
+              Empty until the plots of the first snapshot are rendered.
+    """
+    start_static_plots(snapshot if snapshot is not None else get_snapshot())
+    return _static_plots['plots']
+
+
+def get_static_plot(name: str, snapshot: dict = None) -> PlotData:
+    """
+    Get a pre-rendered plot, see get_static_plots.
+
+    Args:
+        name: Name of the plot, see plotly_plot_name and trend_plot_name
+        snapshot: Current snapshot [Default - get_snapshot]
+    Returns:
+        PlotData: Reduced plotly JSON, ready to be sent by gr.Plot. None if no plot was rendered yet.
+    """
+    plot = get_static_plots(snapshot).get(name)
+    return PlotData(type="plotly", plot=plot) if plot is not None else None
+
+
+def plotly_view_plot(leaderboard: str, list_op: list, list_co: list, show_all: list, show_names: list,
+                     show_legend: list, mobile_view: list, show_frontier: list = None):
+    """
+    Plot % played v/s quality score, served from the pre-rendered plots for the default mobile views.
+    Args: See plotly_snapshot_plot
+    Returns:
+        Fig: plotly figure or pre-rendered plot of % played v/s quality score
+    """
+    if mobile_view and show_all and not show_legend and not show_frontier:
+        plot = get_static_plot(plotly_plot_name(leaderboard, bool(show_names)))
+        if plot is not None:
+            return plot
+    return plotly_snapshot_plot(leaderboard, list_op, list_co, show_all, show_names, show_legend, mobile_view,
+                                show_frontier=show_frontier)
+
+
+async def trend_view_plot(benchmark: str = "Text", mobile_view: bool = False, start_date: str = START_DATE,
+                          n_versions: int = TREND_VERSIONS, open_dip: float = OPEN_DIP, comm_dip: float = COMM_DIP):
+    """
+    Plot the trend graph, served from the pre-rendered plots in mobile view with the default window and thresholds.
+    Args: See get_final_trend_plot
+    Returns:
+        Fig: plotly figure or pre-rendered trend plot
+    """
+    if mobile_view and (start_date, n_versions, open_dip, comm_dip) == (START_DATE, TREND_VERSIONS, OPEN_DIP, COMM_DIP):
+        plot = get_static_plot(trend_plot_name(benchmark), await get_snapshot_async())
+        if plot is not None:
+            return plot
+    try:
+        return await get_final_trend_plot_async(benchmark, mobile_view, None, start_date, n_versions, open_dip,
+                                                comm_dip)
+    except ValueError as e:
+        raise gr.Error(str(e))
+
+
+if __name__ == '__main__':
+    plots = build_static_plots(get_snapshot(), STATIC_PLOT_DIR)
+    for name, plot in plots.items():
+        print(name, len(plot), "bytes")
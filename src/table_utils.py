@@ -0,0 +1,118 @@
+## Paginated delivery of the leaderboard tables
+import numpy as np
+import gradio as gr
+
+from src.leaderboard_utils import query_search
+from src.snapshot_utils import get_snapshot, get_display_df, select_display_df, select_latest_version, leaderboard_key
+from src.snapshot_utils import snapshot_cache
+
+# Default number of rows sent to the frontend per page
+PAGE_SIZE = 25
+PAGE_SIZES = [10, 25, 50, 100]
+
+SORT_ORDERS = ["Descending", "Ascending"]
+
+
+@snapshot_cache(maxsize=256)
+def _sort_order(snapshot: dict, leaderboard: str, version: str, sort_by: str, ascending: bool) -> np.ndarray:
+    """
+    Compute the row positions of a snapshot DataFrame sorted by a column, cached per snapshot.
+
+    Args:
+        snapshot: Snapshot holding the DataFrame.
+        leaderboard: Leaderboard key.
+        version: Name of the version.
+        sort_by: Column to sort by, rows keep the order of the processed DataFrame if not set.
+        ascending: Sort in ascending order.
+    Returns:
+        Array of row positions in sorted order, missing values are placed last.
+    """
+    df = select_display_df(snapshot, leaderboard, version)
+    if not sort_by or sort_by not in df.columns:
+        return np.arange(len(df))
+
+    values = df[sort_by].reset_index(drop=True)
+    return values.sort_values(ascending=ascending, na_position='last', kind='stable').index.to_numpy()
+
+
+def get_table_page(leaderboard: str, version: str = None, query: str = "", page: int = 1,
+                   page_size: int = PAGE_SIZE, sort_by: str = None, sort_order: str = "Descending",
+                   columns: list = None) -> tuple:
+    """
+    Get a single page of a leaderboard held in the server-side snapshot.
+    Only the rows of the page and the selected columns are sent to the frontend.
+
+    Args:
+        leaderboard: Leaderboard key or display name.
+        version: Name of the version, the latest version of the leaderboard is used if not set
+        query: A string of search queries separated by ";", see query_search
+        page: 1-indexed page number, clipped to the available pages
+        page_size: Number of rows per page
+        sort_by: Column to sort by, the processed order (by Clemscore) is kept if not set
+        sort_order: Either "Descending" or "Ascending"
+        columns: Columns to show, the 'Model' column is always included. All columns are shown if not set
+    Returns:
+        tuple: DataFrame of the page, the (clipped) page number and a short page description
+    """
+    snapshot = get_snapshot()
+    key = leaderboard_key(leaderboard)
+    version = version or select_latest_version(snapshot, key)
+    df = select_display_df(snapshot, key, version)
+
+    order = _sort_order(snapshot, key, version, sort_by, sort_order == "Ascending")
+
+    if query and query.strip():
+        matches = df.index.isin(query_search(df, query).index)
+        order = order[matches[order]]
+
+    page_size = int(page_size) if page_size else PAGE_SIZE
+    n_rows = len(order)
+    n_pages = max(1, -(-n_rows // page_size))
+    page = min(max(1, int(page) if page else 1), n_pages)
+
+    if columns:
+        columns = ['Model'] + [col for col in df.columns if col in columns and col != 'Model']
+    else:
+        columns = list(df.columns)
+
+    positions = order[(page - 1) * page_size: page * page_size]
+    page_df = df.iloc[positions][columns]
+
+    page_info = f"Page {page} of {n_pages} ({n_rows} models)"
+    return page_df, page, page_info
+
+
+def previous_table_page(leaderboard: str, version: str, query: str, page: int, *args) -> tuple:
+    """
+    Get the page before the current one, see get_table_page for the arguments.
+    """
+    return get_table_page(leaderboard, version, query, (page or 1) - 1, *args)
+
+
+def next_table_page(leaderboard: str, version: str, query: str, page: int, *args) -> tuple:
+    """
+    Get the page after the current one, see get_table_page for the arguments.
+    """
+    return get_table_page(leaderboard, version, query, (page or 1) + 1, *args)
+
+
+def first_table_page(leaderboard: str, version: str, query: str, page: int, *args) -> tuple:
+    """
+    Get the first page, used when the version, query, sorting or columns change.
+    """
+    return get_table_page(leaderboard, version, query, 1, *args)
+
+
+def get_table_columns(leaderboard: str, version: str = None):
+    """
+    Change the column selection based on the columns available in the selected version.
+
+    Args:
+        leaderboard: Leaderboard key or display name.
+        version: Name of the version.
+    Returns:
+        Updated dropdowns for the sort column and the visible columns.
+    """
+    columns = list(get_display_df(leaderboard, version).columns)
+    return (gr.Dropdown(choices=columns, value=columns[1]),
+            gr.Dropdown(choices=columns[1:], value=[]))
@@ -1,22 +1,45 @@
 ## Fetch Model Registry and clemscores
-import requests
+import asyncio
 import pandas as pd
 from datetime import datetime
-import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
+from typing import TYPE_CHECKING
 import numpy as np
 
-from src.assets.text_content import REGISTRY_URL, REPO, BENCHMARK_FILE
-from src.leaderboard_utils import get_github_data
+from src.leaderboard_utils import get_benchmark_versions, model_codes, widen_frame
+from src.registry_utils import parse_parameters
+from src.snapshot_utils import get_snapshot, get_snapshot_async, snapshot_cache
+from src.render_utils import render_figure, render_figure_async
+from src.singleflight_utils import single_flight, single_flight_async
+
+# Plotly is imported on first use to keep it out of the startup of the app
+if TYPE_CHECKING:
+    import plotly.graph_objects as go
 
 # Cut-off date from where to start the trendgraph
 START_DATE = '2023-06-01'
+# Number of latest benchmark versions shown in the trendgraph
+TREND_VERSIONS = 3
+# Max dip in clemscore allowed for a model to be considered in the trend line, per model type
+OPEN_DIP = 0
+COMM_DIP = 0
+
+# Months between two date ticks of the x axis, and months around a benchmark version without date ticks in mobile view
+TICK_MONTHS = 2
+MOBILE_TICK_GAP_MONTHS = 1
+# Months of date ticks generated ahead of the snapshot, so that the end date (today) stays within the tick set
+TICK_MONTHS_AHEAD = 12
 
 # Graph colours
 COLOUR_OPEN = 'red'
 COLOUR_COMM = 'blue'
 
+# Level of detail - at most LOD_POINTS_PER_100PX points per 100 pixels of plot width are plotted.
+# Models that are not on a trend line are thinned to one point per cell of the plot (per model type and version),
+# starting with cells of LOD_CELL_PX x LOD_CELL_PX pixels and growing them until the budget is met
+LOD_POINTS_PER_100PX = 25
+LOD_CELL_PX = 12
+LOD_DEFAULT_WIDTH = 1200
+
 
 def get_param_size(params: str) -> float:
     """Convert parameter size from string to float.
@@ -25,72 +48,43 @@ def get_param_size(params: str) -> float:
         params (str): The parameter size as a string (e.g., '1000B', '1T').
 
     Returns:
-        float: The size of parameters in float.
+        float: The size of parameters in billions, 0 if not set and NaN if not a valid parameter size.
     """
     if not params:
-        param_size = 0
-    else:
-        if params[-1] == "B":
-            param_size = params[:-1]
-            param_size = float(param_size)
-        elif params[-1] == "T":
-            param_size = params[:-1]
-            param_size = float(param_size)
-            param_size *= 1000
-        else:
-            print("Not a valid parameter size")
-
-    return param_size
-
-
-def date_difference(date_str1: str, date_str2: str) -> int:
-    """Calculate the difference in days between two dates.
-
-    Args:
-        date_str1 (str): The first date as a string in 'YYYY-MM-DD' format.
-        date_str2 (str): The second date as a string in 'YYYY-MM-DD' format.
-
-    Returns:
-        int: The difference in days between the two dates.
-    """
-    date_format = "%Y-%m-%d"
-    date1 = datetime.strptime(date_str1, date_format)
-    date2 = datetime.strptime(date_str2, date_format)
-    return (date1 - date2).days
+        return 0
+    return float(parse_parameters(pd.Series([params]))[0])
 
 
 def populate_list(df: pd.DataFrame, abs_diff: float) -> list:
     """Create a list of models based on clemscore differences.
 
     Args:
-        df (pd.DataFrame): DataFrame containing model data.
+        df (pd.DataFrame): DataFrame containing model data, sorted by release date.
         abs_diff (float): The absolute difference threshold for clemscore.
 
     Returns:
         list: A list of model names that meet the criteria.
     """
-    l = [df.iloc[0]['model']]
-    prev_clemscore = df.iloc[0]['clemscore']
-    prev_date = df.iloc[0]['release_date']
-
-    for i in range(1, len(df)):
-        curr_clemscore = df.iloc[i]['clemscore']
-        curr_date = df.iloc[i]['release_date']
-        date_diff = date_difference(curr_date, prev_date)
-
-        if curr_clemscore - prev_clemscore >= abs_diff:
-            if date_diff == 0:
-                l[-1] = df.iloc[i]['model']
-            else:
-                l.append(df.iloc[i]['model'])
+    if df.empty:
+        return []
+
+    models = df['model'].to_numpy()
+    clemscores = df['clemscore'].to_numpy(dtype=float)
+    release_dates = df['release_date'].to_numpy()
 
-            prev_clemscore = curr_clemscore
-            prev_date = curr_date
+    l = [models[0]]
+    prev_clemscore = clemscores[0]
+    prev_date = release_dates[0]
+
+    for i in range(1, len(models)):
+        if clemscores[i] - prev_clemscore >= abs_diff:
+            if release_dates[i] == prev_date:
+                l[-1] = models[i]
+            else:
+                l.append(models[i])
 
-    # # Add the last model if the difference between the last and previous date is greater than 15 days
-    # last_date = df.iloc[-1]['release_date']
-    # if date_difference(last_date, prev_date) > 15:
-    #     l.append(df.iloc[-1]['model'])
+            prev_clemscore = clemscores[i]
+            prev_date = release_dates[i]
 
     return l
 
@@ -134,51 +128,170 @@ def interpolate_color(rank_val, start_color):
     return f"hsv({hue},{saturation},{value})"
 
 
-def get_trend_data(text_data: dict, model_registry_data: list) -> pd.DataFrame:
+def get_trend_data(text_data: dict, registry: pd.DataFrame) -> pd.DataFrame:
     """Process text data frames to extract model information.
 
+    Every model is taken from the first (latest) version it appears in, and joined with its registry entry
+    on the codes of the global model dictionary, see model_codes. Models that are not in the registry are skipped.
+
     Args:
         text_data (dict): Dict containing DataFrames and version deatils.
-        model_registry_data (list): List of dictionaries containing model registry data.
+        registry (pd.DataFrame): Model registry, see build_registry_df.
+
+    Returns:
+        pd.DataFrame: DataFrame containing processed model data, with release_date as datetime64
+                      and parameters in billions, see build_registry_df.
+    """
+    columns = ['model', 'clemscore', 'open_weight', 'release_date', 'parameters', 'est_flag', 'version']
+    scores = [pd.DataFrame({'model_id': model_codes(df['Model']), 'model': df['Model'].to_numpy(),
+                            'clemscore': widen_frame(df[['Clemscore']])['Clemscore'].to_numpy(),
+                            'version': metadata['name']})
+              for df, metadata in zip(text_data['dataframes'], text_data['version_data'])]
+    if not scores:
+        return pd.DataFrame(columns=columns)
+
+    scores = pd.concat(scores, ignore_index=True).drop_duplicates('model_id')
+    registry = registry.assign(model_id=model_codes(registry['model_name'])).drop(columns='model_name')
+    result_df = scores.merge(registry[registry['model_id'] >= 0], on='model_id', how='inner')
+
+    return result_df[columns]
+
+
+def get_point_budget(width: int = None) -> int:
+    """Maximum number of points plotted in the trend plot for a plot width.
+
+    Args:
+        width (int, optional): Width of the plot in pixels. Defaults to LOD_DEFAULT_WIDTH if not set.
+
+    Returns:
+        int: The number of points.
+    """
+    return (width or LOD_DEFAULT_WIDTH) * LOD_POINTS_PER_100PX // 100
+
+
+def thin_trend_points(df: pd.DataFrame, keep_models: list, width: int = None, height: int = 1000) -> pd.DataFrame:
+    """Thin the points of the trend plot to the point budget of the plot width.
+
+    Points of keep_models (the models on the trend lines) are always kept. The other points are binned into
+    square cells of the plot, separately per model type and benchmark version, and only the model with the
+    highest clemscore is kept per cell. Its name notes how many models it stands for. Cells start at
+    LOD_CELL_PX pixels and grow until the points fit into the budget, see get_point_budget.
+
+    Args:
+        df (pd.DataFrame): DataFrame containing model data, with the release date column of get_plot.
+        keep_models (list): Models that are never thinned.
+        width (int, optional): Width of the plot in pixels. Defaults to LOD_DEFAULT_WIDTH if not set.
+        height (int, optional): Height of the plot in pixels. Defaults to 1000.
+
+    Returns:
+        pd.DataFrame: DataFrame with at most one point per cell, plus the points of keep_models.
+    """
+    width = width or LOD_DEFAULT_WIDTH
+    keep = df['model'].isin(keep_models).to_numpy()
+    budget = max(get_point_budget(width) - keep.sum(), 1)
+
+    # Relative position of the points in the plot, sorted by clemscore so that the best model of a cell comes first
+    dates = df['Release Date (Model and & Benchmark Version)'].astype('int64').to_numpy()
+    scores = df['clemscore'].to_numpy(dtype=float)
+    points = pd.DataFrame({
+        'x': (dates - dates.min()) / max(dates.max() - dates.min(), 1),
+        'y': np.nan_to_num(scores) / max(np.nanmax(scores), 1),
+        'open_weight': df['open_weight'].to_numpy(),
+        'version': df['version'].to_numpy(),
+        'clemscore': scores
+    }, index=df.index)[~keep].sort_values('clemscore', ascending=False)
+
+    cell_px = LOD_CELL_PX
+    cell_keys = ['x_cell', 'y_cell', 'open_weight', 'version']
+    while True:
+        points['x_cell'] = np.round(points['x'] * max(1, width // cell_px)).astype(int)
+        points['y_cell'] = np.round(points['y'] * max(1, height // cell_px)).astype(int)
+        first_in_cell = ~points.duplicated(cell_keys)
+        if first_in_cell.sum() <= budget or cell_px >= max(width, height):
+            break
+        cell_px *= 1.5
+
+    n_points = points.groupby(cell_keys)['clemscore'].transform('size')
+    representatives = points[first_in_cell].index
+
+    df = df.loc[keep | df.index.isin(representatives)].copy()
+    n_points = n_points.reindex(df.index).fillna(1).astype(int)
+    df.loc[n_points > 1, 'model'] = df['model'] + " (+" + (n_points - 1).astype(str) + " more)"
+    return df
+
+
+def build_trend_ticks(benchmark_ticks: dict, first_date, last_date) -> dict:
+    """Generate the tick sets of the x axis for every window between two dates.
+
+    Month-start date ticks are generated and labelled once. Date ticks on a benchmark version are left out on
+    desktop, and date ticks within MOBILE_TICK_GAP_MONTHS of a benchmark version in mobile view. A mobile tick is
+    matched to the benchmark intervals with a binary search over their sorted start dates.
+
+    Args:
+        benchmark_ticks (dict): Mapping from the release date of each benchmark version to its name.
+        first_date: First date a window can start at.
+        last_date: Last date a window can end at.
 
     Returns:
-        pd.DataFrame: DataFrame containing processed model data.
+        dict: Dictionary containing:
+            - "dates": Month starts from first_date to last_date (DatetimeIndex).
+            - "desktop_text", "mobile_text": Labels of the month starts.
+            - "desktop_skip", "mobile_skip": Boolean arrays, True for month starts left out.
+            - "benchmark_dates": Release dates of the benchmark versions, in the order of benchmark_ticks.
+            - "benchmark_desktop_text", "benchmark_mobile_text": Labels of the benchmark versions.
     """
-    visited = set()  # Track models that have been processed
-    result_df = pd.DataFrame(
-        columns=['model', 'clemscore', 'open_weight', 'release_date', 'parameters', 'est_flag', 'version'])
-
-    text_dfs = text_data['dataframes']
-    for i in range(len(text_dfs)):
-        df = text_dfs[i]
-        version = text_data['version_data'][i]['name']
-        for i in range(len(df)):
-            model_name = df['Model'].iloc[i]
-            if model_name not in visited:
-                visited.add(model_name)
-                for dict_obj in model_registry_data:
-                    if dict_obj["model_name"] == model_name:
-                        if dict_obj["parameters"] == "":
-                            params = "1000B"
-                            est_flag = True
-                        else:
-                            params = dict_obj['parameters']
-                            est_flag = False
-
-                        param_size = get_param_size(params)
-
-                        new_data = {'model': model_name, 'clemscore': df['Clemscore'].iloc[i],
-                                    'open_weight': dict_obj['open_weight'],
-                                    'release_date': dict_obj['release_date'], 'parameters': param_size,
-                                    'est_flag': est_flag, 'version': version}
-                        result_df.loc[len(result_df)] = new_data
-                        break
-
-    return result_df  # Return the compiled DataFrame
+    dates = pd.date_range(start=pd.Timestamp(first_date).to_period('M').to_timestamp(), end=last_date, freq='MS')
+    benchmark_dates = pd.DatetimeIndex(list(benchmark_ticks.keys()))
+    names = list(benchmark_ticks.values())
+
+    # Intervals of equal length, so that the sorted start dates also sort their end dates
+    gap = pd.DateOffset(months=MOBILE_TICK_GAP_MONTHS)
+    interval_start = np.sort((benchmark_dates - gap).to_numpy())
+    interval_end = np.sort((benchmark_dates + gap).to_numpy())
+    last_interval = np.searchsorted(interval_start, dates.to_numpy(), side='right') - 1
+    in_interval = (last_interval >= 0) & (dates.to_numpy() <= interval_end[np.maximum(last_interval, 0)]) \
+        if len(benchmark_dates) else np.zeros(len(dates), dtype=bool)
+
+    return {
+        'dates': dates,
+        'desktop_text': dates.strftime('%b %Y').to_numpy(),
+        'mobile_text': dates.strftime('%b<br>%y').to_numpy(),
+        'desktop_skip': dates.isin(benchmark_dates),
+        'mobile_skip': in_interval,
+        'benchmark_dates': list(benchmark_dates),
+        'benchmark_desktop_text': [f"<br><span style='font-size:12px;'><b>{name}</b></span>" for name in names],
+        'benchmark_mobile_text': [f"<br><br><b>{name}</b>" for name in names]
+    }
+
+
+def select_trend_ticks(ticks: dict, start_date, end_date, mobile_view: bool = False) -> tuple:
+    """Select the ticks of the x axis for a window from a tick set, see build_trend_ticks.
+
+    Date ticks are every TICK_MONTHS months from the first month start on or after start_date.
+
+    Args:
+        ticks (dict): Tick set covering the window, see build_trend_ticks.
+        start_date: Start of the window.
+        end_date: End of the window.
+        mobile_view (bool, optional): Select the ticks of the mobile view. Defaults to False.
+
+    Returns:
+        tuple: Tick values and tick labels, date ticks first and then the benchmark versions.
+    """
+    dates = ticks['dates'].to_numpy()
+    first = np.searchsorted(dates, pd.Timestamp(start_date).to_datetime64().astype(dates.dtype), side='left')
+    last = np.searchsorted(dates, pd.Timestamp(end_date).to_datetime64().astype(dates.dtype), side='right')
+    positions = np.arange(first, last, TICK_MONTHS)
+    view = 'mobile' if mobile_view else 'desktop'
+    positions = positions[~ticks['desktop_skip'][positions] & ~ticks[f'{view}_skip'][positions]]
+
+    tickvals = list(ticks['dates'][positions]) + ticks['benchmark_dates']
+    ticktext = list(ticks[f'{view}_text'][positions]) + ticks[f'benchmark_{view}_text']
+    return tickvals, ticktext
 
 
 def get_plot(df: pd.DataFrame, start_date: str = '2023-06-01', end_date: str = '2024-12-30',
-             benchmark_ticks: dict = {}, benchmark_update={}, **plot_kwargs) -> go.Figure:
+             benchmark_ticks: dict = {}, benchmark_update={}, ticks: dict = None, **plot_kwargs) -> "go.Figure":
     """Generate a scatter plot for the given DataFrame.
 
     Args:
@@ -187,27 +300,33 @@ def get_plot(df: pd.DataFrame, start_date: str = '2023-06-01', end_date: str = '
         end_date (str, optional): End date for filtering. Defaults to '2024-12-30'.
         benchmark_ticks (dict, optional): Custom benchmark ticks for the version dates. Defaults to {}.
         benchmark_update (dict, optional): Custom benchmark metadata containing last_updated date for the versions. Defaults to {}.
+        ticks (dict, optional): Tick set covering start_date to end_date, see build_trend_ticks.
+                                Generated from benchmark_ticks if not set.
 
     Keyword Args:
         open_dip (float, optional): Threshold for open models' clemscore differences. Max dip in clemscore allowed to be considered in trend.
         comm_dip (float, optional): Threshold for commercial models' clemscore differences. Max dip in clemscore allowed to be considered in trend.
+        n_versions (int, optional): Number of latest benchmark versions to show. Defaults to TREND_VERSIONS.
         height (int, optional): Height of the plot in pixels. Adjusted for mobile or desktop views.
         mobile_view (bool, optional): Flag to indicate if the plot should be optimized for mobile display. Defaults to False.
 
     Returns:
         go.Figure: The generated plot.
     """
+    import plotly.express as px
+    import plotly.graph_objects as go
 
     open_dip = plot_kwargs['open_dip']
     comm_dip = plot_kwargs['comm_dip']
     height = plot_kwargs['height']
     width = plot_kwargs['width']
+    n_versions = plot_kwargs.get('n_versions', TREND_VERSIONS)
 
     mobile_view = True if plot_kwargs['mobile_view'] else False
 
     max_clemscore = df['clemscore'].max()
-    # Convert 'release_date' to datetime
-    df['Release Date (Model and & Benchmark Version)'] = pd.to_datetime(df['release_date'], format='ISO8601')
+    # Release dates are parsed once with the registry, see build_registry_df
+    df['Release Date (Model and & Benchmark Version)'] = df['release_date']
 
     # Filter out data before April 2023/START_DATE
     df = df[df['Release Date (Model and & Benchmark Version)'] >= pd.to_datetime(start_date)]
@@ -228,9 +347,13 @@ def get_plot(df: pd.DataFrame, start_date: str = '2023-06-01', end_date: str = '
         reverse=True
     )
 
-    version_names = version_names[:3]  # Select 3 latest benchmark versions
+    version_names = version_names[:n_versions]  # Select the latest benchmark versions
     df = df[df['version'].isin(tuple(version_names))]
 
+    # Bound the number of plotted points, the models on the trend lines are always kept
+    if len(df) > get_point_budget(width):
+        df = thin_trend_points(df, models_to_display, width, height)
+
     rank = 2
     max_rank = len(version_names)
     rank_value = {version_names[0]: 1}
@@ -239,29 +362,20 @@ def get_plot(df: pd.DataFrame, start_date: str = '2023-06-01', end_date: str = '
             rank_value[ver] = 1 - (rank - 1 - (max_rank / 15)) / (max_rank - 1)
             rank += 1
 
-    df['color_value'] = df.apply(
-        lambda row: rank_value[row['version']],
-        axis=1
-    )
+    df['color_value'] = df['version'].map(rank_value)
 
     # Add an identifier column to each DataFrame
-    df['Model Type & Benchmark Version'] = df.apply(
-        lambda row: f"Open-Weight {row['version']}" if row['open_weight'] else f"Commercial {row['version']}",
-        axis=1
-    )
+    df['Model Type & Benchmark Version'] = np.where(df['open_weight'].astype(bool), "Open-Weight ", "Commercial ")
+    df['Model Type & Benchmark Version'] += df['version']
 
     color_map = {}
-    for i in range(len(df)):
-        if df.iloc[i]['Model Type & Benchmark Version'] not in color_map:
-            if df.iloc[i]['open_weight']:
-                color_map[df.iloc[i]['Model Type & Benchmark Version']] = interpolate_color(df.iloc[i]['color_value'],
-                                                                                            COLOUR_OPEN)
-            else:
-                color_map[df.iloc[i]['Model Type & Benchmark Version']] = interpolate_color(df.iloc[i]['color_value'],
-                                                                                            COLOUR_COMM)
+    color_groups = df.drop_duplicates('Model Type & Benchmark Version')
+    for group, open_weight, color_value in zip(color_groups['Model Type & Benchmark Version'],
+                                               color_groups['open_weight'], color_groups['color_value']):
+        color_map[group] = interpolate_color(color_value, COLOUR_OPEN if open_weight else COLOUR_COMM)
 
-    marker_size = df['parameters'].apply(lambda x: np.sqrt(x) if x > 0 else np.sqrt(400)).astype(
-        float)  # Arbitrary sqrt value to scale marker size based on parameter size
+    # Arbitrary sqrt value to scale marker size based on parameter size, also for unknown sizes (NaN)
+    marker_size = np.sqrt(df['parameters'].astype(float).where(df['parameters'] > 0, 400))
 
     # Create the scatter plot
     fig = px.scatter(df,
@@ -292,51 +406,17 @@ def get_plot(df: pd.DataFrame, start_date: str = '2023-06-01', end_date: str = '
     df_open = df[df['model'].isin(open_model_list)].sort_values(by='Release Date (Model and & Benchmark Version)')
     df_commercial = df[df['model'].isin(comm_model_list)].sort_values(by='Release Date (Model and & Benchmark Version)')
 
-    ## Custom tics for x axis
-    # Define the start and end dates
-    start_date = pd.to_datetime(start_date)
-    end_date = pd.to_datetime(end_date)
-    # Generate ticks every two months
-    date_range = pd.date_range(start=start_date, end=end_date, freq='2MS')  # '2MS' stands for 2 Months Start frequency
-    # Create labels for these ticks
-    custom_ticks = {date: date.strftime('%b %Y') for date in date_range}
-
-    ## Benchmark Version ticks
-    benchmark_tickvals = list(pd.to_datetime(list(benchmark_ticks.keys())))
-    custom_ticks = {k: v for k, v in custom_ticks.items() if k not in benchmark_tickvals}
-    custom_tickvals = list(custom_ticks.keys())
+    ## Custom ticks for x axis - dates every TICK_MONTHS months and the benchmark versions
+    if ticks is None:
+        ticks = build_trend_ticks(benchmark_ticks, start_date, end_date)
+    tickvals, ticktext = select_trend_ticks(ticks, start_date, end_date, mobile_view)
+    fig.update_xaxes(tickvals=tickvals, ticktext=ticktext, tickangle=0, tickfont=dict(size=10))
 
     if mobile_view:
-        # Remove custom_tickvals within -1 month to +1 month of benchmark_tickvals for better visibility
-        one_month = pd.DateOffset(months=1)
-        filtered_custom_tickvals = [
-            date for date in custom_tickvals
-            if not any((benchmark_date - one_month <= date <= benchmark_date + one_month) for benchmark_date in
-                       benchmark_tickvals)
-        ]
-
-        benchmark_tick_texts = []
-        for i in range(len(benchmark_tickvals)):
-            benchmark_tick_texts.append(f"<br><br><b>{benchmark_ticks[benchmark_tickvals[i]]}</b>")
-        fig.update_xaxes(
-            tickvals=filtered_custom_tickvals + benchmark_tickvals,  # Use filtered_custom_tickvals
-            ticktext=[f"{date.strftime('%b')}<br>{date.strftime('%y')}" for date in filtered_custom_tickvals] +
-                     benchmark_tick_texts,  # Use the new benchmark tick texts
-            tickangle=0,
-            tickfont=dict(size=10)
-        )
         fig.update_yaxes(range=[0,
                                 110])  # Set y-axis range to 110 for better visibility of legend and avoiding overlap with interactivity block of plotly on top-right
         display_mode = 'lines+markers'
     else:
-        fig.update_xaxes(
-            tickvals=custom_tickvals + benchmark_tickvals,  # Use filtered_custom_tickvals
-            ticktext=[f"{date.strftime('%b')} {date.strftime('%Y')}" for date in custom_tickvals] +
-                     [f"<br><span style='font-size:12px;'><b>{benchmark_ticks[date]}</b></span>" for date in
-                      benchmark_tickvals],  # Added <br> for vertical alignment
-            tickangle=0,
-            tickfont=dict(size=10)
-        )
         fig.update_yaxes(range=[0, max_clemscore + 10])
         display_mode = 'lines+markers+text'
 
@@ -392,43 +472,89 @@ def get_plot(df: pd.DataFrame, start_date: str = '2023-06-01', end_date: str = '
     return fig
 
 
-def get_final_trend_plot(benchmark: str = "Text", mobile_view: bool = False, custom_width: int = None) -> go.Figure:
-    """Fetch and generate the final trend plot for all models.
+def get_plot_from_arrays(columns: dict, **kwargs) -> "go.Figure":
+    """Generate the scatter plot from a dict of column arrays instead of a DataFrame.
+    Used as a compact job for the render pool, see src/render_utils.py
+
+    Args:
+        columns (dict): Mapping from column name to its values, see get_trend_data for the columns.
+        **kwargs: See get_plot.
+
+    Returns:
+        go.Figure: The generated plot.
+    """
+    return get_plot(pd.DataFrame(columns), **kwargs)
+
+
+@single_flight
+def get_final_trend_plot(benchmark: str = "Text", mobile_view: bool = False, custom_width: int = None,
+                         start_date: str = START_DATE, n_versions: int = TREND_VERSIONS,
+                         open_dip: float = OPEN_DIP, comm_dip: float = COMM_DIP) -> "go.Figure":
+    """Generate the final trend plot for all models.
 
     Args:
         benchmark (str, optional): The benchmark type to use. Defaults to "Text".
         mobile_view (bool, optional): Flag to indicate mobile view. Defaults to False.
+        custom_width (int, optional): Width of the plot in pixels.
+        start_date, n_versions, open_dip, comm_dip: Window and trend line thresholds, see get_trend_plot_inputs.
 
     Returns:
-        go.Figure: The generated trend plot for selected benchmark.
+        go.Figure: The generated trend plot for selected benchmark, see render_figure.
     """
-    # Fetch Model Registry
-    response = requests.get(REGISTRY_URL)
-    model_registry_data = response.json()
-    # Custom tick labels
-    json_url = REPO + BENCHMARK_FILE
-    response = requests.get(json_url)
+    return select_trend_plot(get_snapshot(), benchmark, mobile_view, custom_width, start_date, n_versions,
+                             open_dip, comm_dip)
 
-    # Check if the JSON file request was successful
-    if response.status_code != 200:
-        print(f"Failed to read JSON file {json_url}: Status Code: {response.status_code}")
 
-    json_data = response.json()
-    versions = json_data['versions']
+def select_trend_plot(snapshot: dict, benchmark: str = "Text", mobile_view: bool = False, custom_width: int = None,
+                      start_date: str = START_DATE, n_versions: int = TREND_VERSIONS,
+                      open_dip: float = OPEN_DIP, comm_dip: float = COMM_DIP) -> "go.Figure":
+    """Generate the trend plot of a given snapshot, see get_final_trend_plot for the arguments."""
+    columns, plot_kwargs = get_trend_plot_inputs(get_trend_base(benchmark, snapshot), mobile_view, custom_width,
+                                                 start_date, n_versions, open_dip, comm_dip)
+    return render_figure(get_plot_from_arrays, columns, **plot_kwargs)
 
-    if mobile_view:
-        height = 450
-    else:
-        height = 1000
 
-    plot_kwargs = {'height': height, 'width': custom_width, 'open_dip': 0, 'comm_dip': 0,
-                   'mobile_view': mobile_view}
+@single_flight_async
+async def get_final_trend_plot_async(benchmark: str = "Text", mobile_view: bool = False, custom_width: int = None,
+                                     start_date: str = START_DATE, n_versions: int = TREND_VERSIONS,
+                                     open_dip: float = OPEN_DIP, comm_dip: float = COMM_DIP) -> "go.Figure":
+    """Generate the final trend plot for all models, without blocking the event loop.
 
+    Args: See get_final_trend_plot
+
+    Returns:
+        go.Figure: The generated trend plot for selected benchmark, see render_figure_async.
+    """
+    snapshot = await get_snapshot_async()
+    trend_base = await asyncio.to_thread(get_trend_base, benchmark, snapshot)
+    columns, plot_kwargs = get_trend_plot_inputs(trend_base, mobile_view, custom_width,
+                                                 start_date, n_versions, open_dip, comm_dip)
+    return await render_figure_async(get_plot_from_arrays, columns, **plot_kwargs)
+
+
+def build_trend_base(github_data: dict, registry: pd.DataFrame, versions: list, benchmark: str = "Text") -> dict:
+    """Join the leaderboards of a benchmark with the model registry, and collect the benchmark version ticks.
+
+    Args:
+        github_data (dict): Output of get_github_data.
+        registry (pd.DataFrame): Model registry, see build_registry_df.
+        versions (list): Version entries of the benchmark JSON file.
+        benchmark (str, optional): The benchmark type to use. Defaults to "Text".
+
+    Returns:
+        dict: Dictionary containing:
+            - "columns": Dict of column arrays of the trend data, see get_trend_data.
+            - "dates": Release dates of the models, sorted with missing dates (NaT) first.
+            - "order": Rows of the trend data in the order of "dates".
+            - "n_versions": Number of benchmark versions in the trend data.
+            - "benchmark_ticks": Dict mapping the release date of each benchmark version to its name.
+            - "benchmark_update": Dict mapping the last update date of the benchmark versions to their names.
+            - "ticks": Tick sets of the x axis for windows from START_DATE on, see build_trend_ticks.
+    """
     benchmark_ticks = {}
     benchmark_update = {}
     if benchmark == "Text":
-        text_data = get_github_data()['text']
-        text_result_df = get_trend_data(text_data, model_registry_data)
+        result_df = get_trend_data(github_data['text'], registry)
         ## Get benchmark tickvalues as dates for X-axis
         for ver in versions:
             if 'multimodal' not in ver['version']:  # Skip MM specific benchmark dates
@@ -437,13 +563,8 @@ def get_final_trend_plot(benchmark: str = "Text", mobile_view: bool = False, cus
                     benchmark_update[pd.to_datetime(ver['last_updated'])] = [ver['version']]
                 else:
                     benchmark_update[pd.to_datetime(ver['last_updated'])].append(ver['version'])
-
-        fig = get_plot(text_result_df, start_date=START_DATE, end_date=datetime.now().strftime('%Y-%m-%d'),
-                       benchmark_ticks=benchmark_ticks, benchmark_update=benchmark_update, **plot_kwargs)
     else:
-        mm_data = get_github_data()['multimodal']
-        result_df = get_trend_data(mm_data, model_registry_data)
-        df = result_df
+        result_df = get_trend_data(github_data['multimodal'], registry)
         for ver in versions:
             if 'multimodal' in ver['version']:
                 temp_ver = ver['version']
@@ -452,7 +573,95 @@ def get_final_trend_plot(benchmark: str = "Text", mobile_view: bool = False, cus
                     pd.to_datetime(ver['release_date'])] = temp_ver  ## MM benchmark dates considered after v1.6 (incl.)
                 benchmark_update[pd.to_datetime(ver['last_updated'])] = temp_ver
 
-        fig = get_plot(df, start_date=START_DATE, end_date=datetime.now().strftime('%Y-%m-%d'),
-                       benchmark_ticks=benchmark_ticks, benchmark_update=benchmark_update, **plot_kwargs)
+    # Sorted once, so that a window of release dates is a slice of the order, see get_trend_plot_inputs
+    dates = result_df['release_date'].reset_index(drop=True).sort_values(kind='stable', na_position='first')
+    return {
+        'columns': {col: result_df[col].to_numpy() for col in result_df.columns},
+        'dates': dates.to_numpy(),
+        'order': dates.index.to_numpy(),
+        'n_versions': result_df['version'].nunique(),
+        'benchmark_ticks': benchmark_ticks,
+        'benchmark_update': benchmark_update,
+        'ticks': build_trend_ticks(benchmark_ticks, START_DATE,
+                                   pd.Timestamp.now() + pd.DateOffset(months=TICK_MONTHS_AHEAD))
+    }
 
-    return fig
+
+@snapshot_cache(maxsize=4)
+def _get_trend_base(snapshot: dict, benchmark: str) -> dict:
+    return build_trend_base(snapshot['github_data'], snapshot['registry'], get_benchmark_versions(), benchmark)
+
+
+def get_trend_base(benchmark: str = "Text", snapshot: dict = None) -> dict:
+    """Get the trend data of a benchmark, joined with the model registry once per snapshot.
+
+    Args:
+        benchmark (str, optional): The benchmark type to use. Defaults to "Text".
+        snapshot (dict, optional): Snapshot to read from. Defaults to the current snapshot.
+
+    Returns:
+        dict: See build_trend_base. Treat it as read-only, it is shared between all requests.
+    """
+    return _get_trend_base(snapshot if snapshot is not None else get_snapshot(), benchmark)
+
+
+def get_trend_plot_inputs(trend_base: dict, mobile_view: bool = False, custom_width: int = None,
+                          start_date: str = START_DATE, n_versions: int = TREND_VERSIONS,
+                          open_dip: float = OPEN_DIP, comm_dip: float = COMM_DIP) -> tuple:
+    """Prepare the inputs of get_plot_from_arrays for the trend plot.
+
+    Only the models released from start_date on are passed on, found by a binary search in the sorted dates.
+
+    Args:
+        trend_base (dict): Trend data of the benchmark, see get_trend_base.
+        mobile_view (bool, optional): Flag to indicate mobile view. Defaults to False.
+        custom_width (int, optional): Width of the plot in pixels.
+        start_date (str, optional): Models released before are not shown. Defaults to START_DATE.
+        n_versions (int, optional): Number of latest benchmark versions to show, at most the number of versions
+            in the trend data. Defaults to TREND_VERSIONS.
+        open_dip (float, optional): Max dip in clemscore of the open models trend line. Defaults to OPEN_DIP.
+        comm_dip (float, optional): Max dip in clemscore of the commercial models trend line. Defaults to COMM_DIP.
+
+    Returns:
+        tuple: Dict of column arrays of the trend data and the keyword arguments of get_plot.
+
+    Raises:
+        ValueError: If start_date is not a date, n_versions is not positive or a dip is negative.
+    """
+    try:
+        start = pd.to_datetime(start_date or START_DATE, format='%Y-%m-%d')
+    except ValueError:
+        raise ValueError(f"Invalid start date {start_date!r}, expected YYYY-MM-DD")
+    n_versions = int(TREND_VERSIONS if n_versions is None else n_versions)
+    open_dip = float(open_dip or 0)
+    comm_dip = float(comm_dip or 0)
+    if n_versions < 1:
+        raise ValueError(f"The number of versions must be at least 1, got {n_versions}")
+    n_versions = min(n_versions, max(1, trend_base['n_versions']))
+    if open_dip < 0 or comm_dip < 0:
+        raise ValueError(f"The dips in clemscore must not be negative, got {open_dip} and {comm_dip}")
+
+    if mobile_view:
+        height = 450
+    else:
+        height = 1000
+
+    plot_kwargs = {'height': height, 'width': custom_width, 'open_dip': open_dip, 'comm_dip': comm_dip,
+                   'n_versions': n_versions, 'mobile_view': mobile_view}
+
+    # Missing release dates (NaT) are sorted first, the window is everything from the first date >= start.
+    # The rows are taken in the order of the trend data, which sets the order of the legend
+    dates = trend_base['dates']
+    n_missing = np.count_nonzero(pd.isna(dates))
+    first = n_missing + np.searchsorted(dates[n_missing:], start.to_datetime64().astype(dates.dtype))
+    rows = np.sort(trend_base['order'][first:])
+    columns = {col: values[rows] for col, values in trend_base['columns'].items()}
+
+    # The tick set of the snapshot covers windows from START_DATE on, earlier windows get their own
+    end_date = datetime.now().strftime('%Y-%m-%d')
+    ticks = trend_base['ticks'] if start >= trend_base['ticks']['dates'][0] else None
+
+    plot_kwargs.update(start_date=start.strftime('%Y-%m-%d'), end_date=end_date,
+                       benchmark_ticks=trend_base['benchmark_ticks'], benchmark_update=trend_base['benchmark_update'],
+                       ticks=ticks)
+    return columns, plot_kwargs
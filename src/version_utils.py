@@ -2,17 +2,17 @@
 # A list of version names -> v1.6, v.6_multimodal, v1.6_quantized, v1.5, v0.9, etc......
 # A corresponding DataFrame?
 
-import requests
 from datetime import datetime
-import pandas as pd
 import json
-from io import StringIO
 
-from src.leaderboard_utils import process_df
+from src.leaderboard_utils import read_results, sort_version_names
 from src.assets.text_content import REPO, BENCHMARK_FILE
+from src.singleflight_utils import single_flight
+from src.source_utils import read_repo_file
 
 VARIANTS = ['ascii', 'backends', 'quantized'] # Include other variants if added in the main clembench-runs repo
 
+@single_flight
 def get_version_data():
     """
     Read and process data from CSV files of all available versions hosted on GitHub. - https://github.com/clembench/clembench-runs
@@ -21,58 +21,82 @@ def get_version_data():
         version_data:
             -
     """
-    base_repo = REPO
-    json_url = base_repo + BENCHMARK_FILE
-    response = requests.get(json_url)
+    json_text = read_repo_file(BENCHMARK_FILE)
 
-    # Check if the JSON file request was successful
-    if response.status_code != 200:
-        print(f"Failed to read JSON file {json_url}: Status Code: {response.status_code}")
+    # Check if the JSON file could be read
+    if json_text is None:
+        print(f"Failed to read JSON file - {BENCHMARK_FILE} in repo {REPO}")
         return None, None, None, None
 
-    json_data = response.json()
+    json_data = json.loads(json_text)
     versions = json_data['versions']
 
-    version_names = sorted(
-        [ver['version'] for ver in versions],
-        key=lambda v: list(map(int, v[1:].split('_')[0].split('.'))),  
-        reverse=True
-    )   
+    results = {}
+    for version in get_version_candidates(versions):
+        csv_text = read_repo_file(f"{version}/results.csv")
+        if csv_text is not None:
+            results[version] = csv_text
 
+    return build_version_data(versions, results)
+
+
+def get_version_candidates(versions: list) -> list:
+    """
+    List every version that may have a results file, latest first - the versions in benchmark followed by their variants.
+
+    Args:
+        versions (list): Version entries of the benchmark JSON file (BENCHMARK_FILE).
+    Returns:
+        list: Names of the versions and variants.
+    """
+    candidates = []
+    for version in sort_version_names(versions):
+        candidates.append(version)
+
+        # Look for variant results file
+        version = version.split('_')[0] # Remove _multimodal suffix, and check for other suffixes
+        for suffix in VARIANTS:
+            if version + "_" + suffix not in candidates:  # Already added with the text or multimodal version of the benchmark
+                candidates.append(version + "_" + suffix)
+
+    return candidates
+
+
+def build_version_data(versions: list, results: dict) -> dict:
+    """
+    Process the results of each version and variant.
+
+    Args:
+        versions (list): Version entries of the benchmark JSON file (BENCHMARK_FILE).
+        results (dict): Mapping from version name to the text of its results.csv, versions without results are skipped.
+    Returns:
+        version_data (dict): Dictionary containing:
+            - "versions": List of metadata (name, last_updated, release_date) for each version, latest first.
+            - "dataframes": List of processed DataFrames for each version.
+    """
     version_data  = {
         'versions': [],
         'dataframes': []
     }
+    benchmark_versions = [ver['version'] for ver in versions]
+
+    for version in get_version_candidates(versions):
+        if version not in results:
+            continue
 
-    for version in version_names:
-        base_url = f"{base_repo}{version}/results.csv"
-        response = requests.get(base_url)
-        if response.status_code == 200:
-            df = pd.read_csv(StringIO(response.text))
-            df = process_df(df)
-            df = df.sort_values(by=df.columns[1], ascending=False)  # Sort by clemscore column
-            version_data['dataframes'].append(df)
+        df = read_results(results[version])
+        version_data['dataframes'].append(df)
+        if version in benchmark_versions:
             metadata = {
                 'name': version,
                 'last_updated': [datetime.strptime(v['last_updated'], '%Y-%m-%d').strftime("%d %b %Y") for v in versions if v['version'] == version],
                 'release_date': [datetime.strptime(v['release_date'], '%Y-%m-%d').strftime("%d %b %Y") for v in versions if v['version'] == version]
-            } 
-            version_data['versions'].append(metadata)
-
-        # Look for variant results file
-        version = version.split('_')[0] # Remove _multimodal suffix, and check for other suffixes
-        for suffix in VARIANTS:
-            base_url = f"{base_repo}{version}_{suffix}/results.csv"
-            response = requests.get(base_url)
-            if response.status_code == 200:
-                df = pd.read_csv(StringIO(response.text))
-                df = process_df(df)
-                df = df.sort_values(by=df.columns[1], ascending=False)  # Sort by clemscore column
-                version_data['dataframes'].append(df)
-                metadata = {
-                    'name': version + "_" + suffix # Skip Release date and last updated # Not included in becnhmark_runs.json
-                } 
-                version_data['versions'].append(metadata)
+            }
+        else:
+            metadata = {
+                'name': version # Skip Release date and last updated # Not included in becnhmark_runs.json
+            }
+        version_data['versions'].append(metadata)
 
     return version_data
 
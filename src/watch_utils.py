@@ -0,0 +1,104 @@
+## Refresh of the snapshot when a local clembench-runs source changes
+import os
+import time
+import threading
+
+from src.assets.text_content import REPO, BENCHMARK_FILE
+from src.source_utils import source_kind, local_path, SOURCE_HTTP, SOURCE_TARBALL, RESULTS_FILE
+from src.snapshot_utils import refresh_snapshot, refresh_backoff
+
+# Seconds between two scans of the source - a scan only stats benchmark_runs.json and one results.csv per version
+WATCH_INTERVAL = float(os.environ.get("WATCH_INTERVAL", 2))
+
+_watcher = None
+_watcher_lock = threading.Lock()
+
+
+def scan_source(repo: str = REPO) -> dict:
+    """
+    Stat the files of a local source that the leaderboard reads.
+
+    Args:
+        repo: Local checkout or tarball of clembench-runs, see source_kind.
+    Returns:
+        dict: Mapping from path relative to the repository (the tarball itself for tarballs)
+              to (modification time in ns, size) of the file.
+    """
+    path = local_path(repo)
+    if source_kind(repo) == SOURCE_TARBALL:
+        paths = [os.path.basename(path)]
+        path = os.path.dirname(path)
+    else:
+        try:
+            with os.scandir(path) as entries:
+                versions = [entry.name for entry in entries if entry.is_dir() and not entry.name.startswith(".")]
+        except FileNotFoundError:
+            return {}
+        paths = [BENCHMARK_FILE] + [f"{version}/{RESULTS_FILE}" for version in versions]
+
+    state = {}
+    for relative_path in paths:
+        try:
+            stat = os.stat(os.path.join(path, relative_path))
+        except FileNotFoundError:
+            continue
+        state[relative_path] = (stat.st_mtime_ns, stat.st_size)
+    return state
+
+
+def changed_files(old: dict, new: dict) -> list:
+    """
+    Files added, removed or modified between two scans, see scan_source.
+    """
+    return sorted(name for name in old.keys() | new.keys() if old.get(name) != new.get(name))
+
+
+def watch_source(repo: str = REPO, interval: float = WATCH_INTERVAL, stop: threading.Event = None):
+    """
+    Poll a local source and publish a new snapshot when it changes.
+
+    A change is only picked up once two scans in a row agree, so that files still being written are not read.
+    Only the results that changed are processed again, see read_results and index_snapshot.
+    If the refresh fails, the change is picked up again after the backoff of the refresh, see refresh_backoff.
+
+    Args:
+        repo: Local checkout or tarball of clembench-runs.
+        interval: Seconds between two scans.
+        stop: Event to stop watching, runs forever if not set.
+    """
+    stop = stop or threading.Event()
+    state = scan_source(repo)
+    while not stop.wait(interval):
+        scan = scan_source(repo)
+        if scan == state or stop.wait(interval) or scan_source(repo) != scan:
+            continue
+
+        changed = changed_files(state, scan)
+        start = time.perf_counter()
+        if refresh_snapshot() is None:
+            stop.wait(refresh_backoff())
+            continue
+        state = scan
+        print(f"Published a new snapshot in {time.perf_counter() - start:.2f} s, changed: {', '.join(changed)}")
+
+
+def start_watcher(repo: str = REPO, interval: float = WATCH_INTERVAL) -> threading.Thread:
+    """
+    Start watching a local source in a background thread, once per process.
+
+    Args:
+        repo: Location of clembench-runs, nothing is watched for HTTP sources.
+        interval: Seconds between two scans.
+    Returns:
+        threading.Thread: The watcher thread, None for HTTP sources.
+    """
+    global _watcher
+    if source_kind(repo) == SOURCE_HTTP:
+        return None
+
+    with _watcher_lock:
+        if _watcher is None:
+            _watcher = threading.Thread(target=watch_source, args=(repo, interval), name="source-watcher",
+                                        daemon=True)
+            _watcher.start()
+    return _watcher
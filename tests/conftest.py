@@ -0,0 +1,90 @@
+## Shared fixtures of the tests - a small clembench-runs tree and model registry in the upstream format (tests/data)
+import os
+import json
+
+import pytest
+import requests
+
+from src.assets.text_content import REPO, REGISTRY_URL
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
+RUNS_DIR = os.path.join(DATA_DIR, "clembench-runs")
+REGISTRY_FILE = os.path.join(DATA_DIR, "model_registry.json")
+
+
+class UpstreamResponse:
+    """
+    Response of requests.get for a file of tests/data.
+    """
+
+    def __init__(self, path: str):
+        self.status_code = 200 if path and os.path.isfile(path) else 404
+        self.text = ""
+        if self.status_code == 200:
+            with open(path, encoding='utf-8', newline='') as f:
+                self.text = f.read()
+
+    def json(self):
+        return json.loads(self.text)
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    """
+    Serve tests/data in place of clembench-runs (REPO) and the model registry (REGISTRY_URL).
+
+    Returns:
+        dict: Number of requests per URL.
+    """
+    counts = {}
+
+    def get(url, *args, **kwargs):
+        counts[url] = counts.get(url, 0) + 1
+        if url == REGISTRY_URL:
+            return UpstreamResponse(REGISTRY_FILE)
+        if url.startswith(REPO):
+            return UpstreamResponse(os.path.join(RUNS_DIR, url[len(REPO):]))
+        return UpstreamResponse(None)
+
+    monkeypatch.setattr(requests, 'get', get)
+    return counts
+
+
+@pytest.fixture
+def runs_dir() -> str:
+    """
+    Path of the clembench-runs tree in tests/data.
+    """
+    return RUNS_DIR
+
+
+@pytest.fixture
+def read_runs_file():
+    """
+    Read a file of the clembench-runs tree in tests/data, e.g. 'v2.0/results.csv'.
+    """
+    def read(relative_path: str) -> str:
+        with open(os.path.join(RUNS_DIR, relative_path), encoding='utf-8', newline='') as f:
+            return f.read()
+    return read
+
+
+@pytest.fixture
+def registry_data() -> list:
+    """
+    Entries of the model registry in tests/data.
+    """
+    with open(REGISTRY_FILE, encoding='utf-8') as f:
+        return json.load(f)
+
+
+@pytest.fixture
+def snapshot(upstream, monkeypatch):
+    """
+    Snapshot built from tests/data, served as the current snapshot.
+    """
+    from src import snapshot_utils
+
+    snapshot = snapshot_utils.build_snapshot()
+    monkeypatch.setattr(snapshot_utils, '_snapshot', snapshot)
+    return snapshot
@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+
+from src.bootstrap_utils import bootstrap_clemscores, rank_groups, get_confidence_intervals, add_confidence_columns
+from src.bootstrap_utils import CI_COLUMN, GROUP_COLUMN
+from src.snapshot_utils import select_display_df, TEXT_KEY, VERSIONS_KEY
+
+
+def test_bootstrap_of_equal_games_is_the_clemscore():
+    played = np.array([[80.0, 80.0, 80.0], [50.0, 50.0, 50.0]])
+    quality = np.array([[60.0, 60.0, 60.0], [40.0, np.nan, 40.0]])
+
+    scores = bootstrap_clemscores(played, quality, n_bootstrap=50)
+
+    assert scores.shape == (2, 50)
+    np.testing.assert_allclose(scores[0], 48.0)
+    # Resamples without a scored game have no quality score
+    assert set(np.round(scores[1], 6)) <= {20.0, 0.0}
+
+
+def test_bootstrap_is_reproducible():
+    rng = np.random.default_rng(0)
+    played, quality = rng.uniform(0, 100, (5, 8)), rng.uniform(0, 100, (5, 8))
+
+    np.testing.assert_array_equal(bootstrap_clemscores(played, quality, 100, seed=1),
+                                  bootstrap_clemscores(played, quality, 100, seed=1))
+
+
+def test_separated_models_get_their_own_group_and_ties_share_one():
+    scores = np.array([30.0, 90.0, 60.0, 90.0])
+    bootstrap_scores = scores[:, None] + np.random.default_rng(0).normal(0, 1, (4, 200))
+    bootstrap_scores[3] = bootstrap_scores[1]  # Same model twice
+
+    groups = rank_groups(scores, bootstrap_scores)
+
+    assert groups.tolist() == [3, 1, 2, 1]
+
+
+def test_confidence_intervals_contain_the_clemscore(snapshot):
+    df = snapshot['frames'][(VERSIONS_KEY, 'v2.0')]
+
+    intervals = get_confidence_intervals(df)
+
+    assert (intervals['CI Low'] <= df['Clemscore'].round(2)).all()
+    assert (intervals['CI High'] >= df['Clemscore'].round(2)).all()
+    # Rank groups follow the clemscore, the best model is in the first group
+    groups = intervals[GROUP_COLUMN].to_numpy()[np.argsort(-df['Clemscore'].to_numpy(), kind='stable')]
+    assert groups[0] == 1
+    assert (np.diff(groups) >= 0).all()
+
+
+def test_no_games_no_confidence_columns():
+    df = pd.DataFrame({'Model': ['model-a'], 'Clemscore': [50.0], '% Played': [100.0], 'Quality Score': [50.0]})
+
+    intervals = get_confidence_intervals(df)
+
+    assert intervals.isna().all().all()
+    assert add_confidence_columns(df, intervals) is df
+
+
+def test_confidence_columns_inserted_after_the_scores(snapshot):
+    display_df = select_display_df(snapshot, TEXT_KEY, 'v1.6')
+
+    assert list(display_df.columns) == ['Model', 'Clemscore', '% Played', 'Quality Score', CI_COLUMN, GROUP_COLUMN]
+    assert display_df[CI_COLUMN].str.fullmatch(r"\d+\.\d\d - \d+\.\d\d").all()
@@ -0,0 +1,46 @@
+import pandas as pd
+
+from src.diff_utils import diff_versions, compare_versions, STATUS_NEW, STATUS_DROPPED, STATUS_KEPT
+from src.snapshot_utils import select_display_df, VERSIONS_KEY
+
+
+def ranks(snapshot: dict, version: str) -> pd.Series:
+    df = select_display_df(snapshot, VERSIONS_KEY, version)
+    return df.set_index('Model')['Clemscore'].rank(method='min', ascending=False).astype('Int64')
+
+
+def test_rank_changes_with_new_and_dropped_models(snapshot):
+    old_ranks, new_ranks = ranks(snapshot, 'v1.6'), ranks(snapshot, 'v2.0')
+
+    diff_df = diff_versions('v1.6', 'v2.0').set_index('Model')
+
+    assert set(diff_df.index) == set(old_ranks.index) | set(new_ranks.index)
+    assert diff_df.loc[['vicuna-13b-v1.5', 'Llama-2-70b-chat-hf', 'claude-2.1'], 'Status'].eq(STATUS_DROPPED).all()
+    assert diff_df.loc['vicuna-13b-v1.5', 'New Rank'] is pd.NA
+    assert diff_df.loc[['Qwen2.5-72B-Instruct', 'o1-preview-2024-09-12'], 'Status'].eq(STATUS_NEW).all()
+    assert diff_df.loc['o1-preview-2024-09-12', 'Rank Change'] is pd.NA
+
+    kept = diff_df[diff_df['Status'] == STATUS_KEPT]
+    assert (kept['Old Rank'] == old_ranks[kept.index]).all()
+    assert (kept['New Rank'] == new_ranks[kept.index]).all()
+    assert (kept['Rank Change'] == old_ranks[kept.index] - new_ranks[kept.index]).all()
+    assert (kept['Δ Clemscore'] == (kept['New Clemscore'] - kept['Old Clemscore']).round(2)).all()
+
+
+def test_rows_sorted_by_new_rank_with_dropped_models_last(snapshot):
+    diff_df, summary = compare_versions('v1.6', 'v2.0')
+
+    new_models = diff_df[diff_df['Status'] != STATUS_DROPPED]
+    assert new_models['New Rank'].is_monotonic_increasing
+    assert (diff_df['Status'].iloc[len(new_models):] == STATUS_DROPPED).all()
+    assert summary.startswith(f"**{(diff_df['Status'] == STATUS_NEW).sum()}** new, **3** dropped")
+
+
+def test_pairs_of_players_aligned_in_any_order(snapshot):
+    diff_df = diff_versions('v0.9', 'v1.0')
+
+    pairs = diff_df[diff_df['Model'].str.contains('--')]
+    assert len(pairs) == 1
+    assert pairs['Status'].item() == STATUS_KEPT
+    # process_df joins the players in set order, which differs between processes
+    assert set(pairs['Model'].item().split('--')) == {'gpt-3.5-turbo-0613', 'gpt-4-0613'}
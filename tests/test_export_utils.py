@@ -0,0 +1,97 @@
+import io
+import os
+import sys
+from datetime import timedelta
+
+import pandas as pd
+import pytest
+
+from src import export_utils, snapshot_utils
+from src.export_utils import split_version_name, write_export, get_export_path, METADATA_COLUMNS
+
+
+@pytest.fixture
+def no_pyarrow(monkeypatch):
+    monkeypatch.setitem(sys.modules, 'pyarrow', None)
+    monkeypatch.setitem(sys.modules, 'pyarrow.parquet', None)
+
+
+def read_export(path: str) -> pd.DataFrame:
+    if path.endswith(".parquet"):
+        return pd.read_parquet(path)
+    # Versions without a variant have an empty Variant, read as missing from the CSV
+    return pd.read_csv(path).fillna({'Variant': ''})
+
+
+def test_version_names_split():
+    assert split_version_name('v2.0') == ('v2.0', 'text', '')
+    assert split_version_name('v1.6_multimodal') == ('v1.6', 'multimodal', '')
+    assert split_version_name('v1.6_quantized') == ('v1.6', 'text', 'quantized')
+
+
+def test_export_of_all_versions(snapshot, read_runs_file, no_pyarrow, tmp_path):
+    versions = [metadata['name'] for metadata in snapshot['version_data']['versions']]
+
+    path = write_export(snapshot['version_data'], snapshot['registry'], str(tmp_path / "export"))
+
+    df = read_export(path)
+    assert path.endswith(".csv.gz")
+    assert list(df.columns[:len(METADATA_COLUMNS) + 1]) == ['Model'] + METADATA_COLUMNS
+    assert len(df) == sum(len(snapshot['frames'][('versions', version)]) for version in versions)
+    # Games are the union over all versions, empty for the versions without them
+    assert {'Codenames Quality Score', 'Matchit Quality Score'} <= set(df.columns)
+    assert df.loc[df['Version'] == 'v0.9', 'Codenames Quality Score'].isna().all()
+
+    rows = df.set_index(['Version', 'Benchmark', 'Variant', 'Model'])
+    assert rows.index.is_unique
+    rows = rows.sort_index()
+    assert rows.loc[('v1.6', 'text', 'quantized')]['Open Weight'].all()
+    assert len(rows.loc[('v1.6', 'multimodal', '')]) == len(snapshot['frames'][('versions', 'v1.6_multimodal')])
+    assert rows.loc[('v2.0', 'text', '', 'claude-3-5-sonnet-20240620'), 'Model Release Date'] == '2024-06-20'
+    # Models missing from the registry have no metadata
+    assert rows.loc[('v2.0', 'text', '', 'internlm2-chat-20b'), ['Open Weight', 'Parameters (B)']].isna().all()
+
+    # The scores of the results.csv files
+    raw = pd.read_csv(io.StringIO(read_runs_file("v1.5/results.csv")), index_col=0)
+    scores = rows.loc[('v1.5', 'text', '')].sort_values('Clemscore', ascending=False, kind='stable')
+    assert scores['Clemscore'].tolist() == raw['-, clemscore'].sort_values(ascending=False, kind='stable').tolist()
+
+
+def test_export_written_as_parquet(snapshot, tmp_path):
+    pytest.importorskip('pyarrow')
+
+    path = write_export(snapshot['version_data'], snapshot['registry'], str(tmp_path / "export"))
+
+    df = read_export(path)
+    assert path.endswith(".parquet")
+    assert df['Open Weight'].dtype == 'boolean'
+    assert df['Model Release Date'].dtype.kind == 'M'
+
+
+def test_failed_export_leaves_no_file(snapshot, no_pyarrow, tmp_path, monkeypatch):
+    def export_frames(version_data: dict, registry: pd.DataFrame):
+        yield from list(frames(version_data, registry))[:2]
+        raise OSError("No space left on device")
+
+    frames = export_utils.export_frames
+    monkeypatch.setattr(export_utils, 'export_frames', export_frames)
+
+    with pytest.raises(OSError):
+        write_export(snapshot['version_data'], snapshot['registry'], str(tmp_path / "export"))
+
+    assert os.listdir(tmp_path) == []
+
+
+def test_previous_export_kept_for_one_snapshot(snapshot, no_pyarrow, tmp_path, monkeypatch):
+    monkeypatch.setattr(export_utils, 'EXPORT_DIR', str(tmp_path))
+    monkeypatch.setattr(export_utils, '_export', {'created': None, 'path': None})
+
+    paths = []
+    for hours in range(3):
+        created = snapshot['created'] + timedelta(hours=hours)
+        monkeypatch.setattr(snapshot_utils, '_snapshot', {**snapshot, 'created': created})
+        paths.append(get_export_path())
+        assert get_export_path() == paths[-1]
+
+    assert len(set(paths)) == 3
+    assert sorted(os.listdir(tmp_path)) == sorted(os.path.basename(path) for path in paths[1:])
@@ -0,0 +1,32 @@
+import pandas as pd
+
+from src.game_utils import get_game_choices, get_game_table
+from src.leaderboard_utils import widen_frame
+from src.snapshot_utils import VERSIONS_KEY
+
+
+def test_games_of_a_version(snapshot):
+    assert get_game_choices('v1.6', snapshot) == ['Taboo', 'Wordle', 'Wordle_withclue', 'Wordle_withcritic',
+                                                  'Imagegame', 'Referencegame', 'Privateshared']
+    assert get_game_choices(None, snapshot)[-3:] == ['Codenames', 'Guesswhat', 'Textmapworld']
+
+
+def test_game_table_sorted_with_ranks(snapshot):
+    df = widen_frame(snapshot['frames'][(VERSIONS_KEY, 'v2.0')])
+
+    table = get_game_table('v2.0', 'Wordle', '% Played', snapshot)
+
+    expected = df.sort_values('Wordle % Played', ascending=False, kind='stable')
+    assert table['Model'].tolist() == expected['Model'].tolist()
+    ranks = expected['Wordle % Played'].rank(method='min', ascending=False).astype('Int64')
+    assert table['Rank'].tolist() == ranks.tolist()
+    assert list(table.columns) == ['Rank', 'Model', 'Wordle Quality Score', 'Wordle % Played', 'Clemscore']
+
+
+def test_unknown_game_falls_back_to_the_first_game(snapshot):
+    table = get_game_table('v1.6_multimodal', 'Codenames', 'Quality Score', snapshot)
+
+    assert list(table.columns)[2] == 'Matchit Quality Score'
+    assert table['Rank'].iloc[:table['Rank'].count()].is_monotonic_increasing
+    assert table['Rank'].isna().tolist() == table['Matchit Quality Score'].isna().tolist()
+    assert pd.isna(table['Rank']).sum() < len(table)
@@ -0,0 +1,39 @@
+import pandas as pd
+
+from src.history_utils import get_history_index, get_model_history, get_history_plot
+from src.snapshot_utils import VERSIONS_KEY
+
+
+def test_history_of_a_model_over_all_versions(snapshot):
+    history = get_history_index()
+    model = 'gpt-4-0613'
+
+    df = get_model_history(model, history=history)
+
+    # Oldest first, variants follow their base version
+    assert history['versions'] == ['v0.9', 'v1.0', 'v1.5', 'v1.6', 'v1.6_quantized', 'v1.6_multimodal', 'v2.0']
+    assert df['version'].astype(str).tolist() == ['v0.9', 'v1.0', 'v1.5', 'v1.6', 'v2.0']
+    for version, value in zip(df['version'].astype(str), df['value']):
+        frame = snapshot['frames'][(VERSIONS_KEY, version)]
+        clemscore = frame.loc[frame['Model'].astype(str) == model, 'Clemscore'].item()
+        assert value == clemscore
+
+
+def test_history_of_every_score(snapshot):
+    history = get_history_index()
+
+    n_scores = sum(int(snapshot['frames'][key].iloc[:, 1:].count().sum())
+                   for key in snapshot['frames'] if key[0] == VERSIONS_KEY)
+    assert len(history['data']) == n_scores
+    assert 'Codenames Quality Score' in history['metrics']
+    # Games that a model did not play have no entry
+    assert get_model_history('vicuna-13b-v1.5', 'Codenames Quality Score', history).empty
+    assert get_model_history('not-a-model', history=history).empty
+
+
+def test_history_plot_with_one_line_per_model(snapshot):
+    fig = get_history_plot(['gpt-4-0613', 'claude-2.1'], 'Taboo % Played')
+
+    assert [trace.name for trace in fig.data] == ['gpt-4-0613', 'claude-2.1']
+    assert list(fig.data[1].x) == ['v1.0', 'v1.5', 'v1.6']
+    assert pd.Series(fig.data[0].y).round(2).tolist() == list(fig.data[0].y)
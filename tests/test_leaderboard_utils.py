@@ -0,0 +1,87 @@
+import io
+
+import numpy as np
+import pandas as pd
+
+from src.leaderboard_utils import build_game_rankings, get_game_columns, read_results
+from src.leaderboard_utils import encode_models, model_codes, canonical_codes, widen_frame, SCORE_DTYPE
+from src.snapshot_utils import VERSIONS_KEY
+
+
+def test_game_columns_of_the_results(read_runs_file):
+    csv_text = read_runs_file("v2.0/results.csv")
+    header = pd.read_csv(io.StringIO(csv_text), nrows=0).columns
+    games = list(dict.fromkeys(col.split(',')[0] for col in header[1:] if col.split(',')[0] not in ['-', 'all']))
+
+    columns = get_game_columns(read_results(csv_text))
+
+    assert list(columns) == [game.capitalize() for game in games]
+    assert columns['Wordle_withclue'] == ('Wordle_withclue % Played', 'Wordle_withclue Quality Score')
+
+
+def test_game_rankings_match_pandas_ranks(snapshot):
+    for (key, version), rankings in snapshot['rankings'].items():
+        df = snapshot['frames'][(key, version)]
+        assert len(rankings) == 2 * len(get_game_columns(df))
+
+        for (game, metric), (order, ranks) in rankings.items():
+            values = df[f"{game} {metric}"].astype(float).reset_index(drop=True)
+            expected = values.rank(method='min', ascending=False)
+
+            # Ties share the best rank, models without a score have no rank
+            np.testing.assert_array_equal(ranks, expected.to_numpy(np.float32))
+            # Sorted by the metric, models without a score come last
+            sorted_values = values.iloc[order]
+            assert sorted(order.tolist()) == list(range(len(df)))
+            assert sorted_values.iloc[:values.count()].is_monotonic_decreasing
+            assert sorted_values.iloc[values.count():].isna().all()
+
+
+def test_rankings_of_a_version_with_unplayed_games(snapshot):
+    df = snapshot['frames'][(VERSIONS_KEY, 'v2.0')]
+    models = df['Model'].astype(str).to_numpy()
+
+    order, ranks = build_game_rankings(df)[('Wordle', 'Quality Score')]
+
+    unranked = models[np.isnan(ranks)]
+    assert len(unranked) > 0
+    assert set(models[order][-len(unranked):]) == set(unranked)
+
+
+def test_models_have_the_same_code_in_every_version(snapshot):
+    old = snapshot['frames'][(VERSIONS_KEY, 'v1.6')]['Model']
+    new = snapshot['frames'][(VERSIONS_KEY, 'v2.0')]['Model']
+
+    old_codes = dict(zip(old.astype(str), model_codes(old)))
+    new_codes = dict(zip(new.astype(str), model_codes(new)))
+    assert {model: old_codes[model] for model in set(old_codes) & set(new_codes)} == \
+        {model: new_codes[model] for model in set(old_codes) & set(new_codes)}
+    assert (model_codes(new) == model_codes(new.astype(str))).all()
+    assert model_codes(pd.Series(['not-a-model'])).tolist() == [-1]
+
+
+def test_canonical_codes_match_swapped_players(snapshot):
+    codes = model_codes(pd.Series(encode_models(['gpt-4-0613--gpt-3.5-turbo-0613', 'gpt-3.5-turbo-0613--gpt-4-0613',
+                                                 'gpt-4-0613'])))
+
+    canonical = canonical_codes(np.append(codes, -1))
+
+    assert canonical[0] == canonical[1] != canonical[2]
+    assert canonical[-1] == -1
+
+
+def test_widened_frame_equals_the_scores_read(read_runs_file):
+    csv_text = read_runs_file("v2.0/results.csv")
+    raw = pd.read_csv(io.StringIO(csv_text), index_col=0)
+    df = read_results(csv_text)
+    scores = df.columns[1:]
+    assert (df[scores].dtypes == SCORE_DTYPE).all()
+
+    wide = widen_frame(df)
+
+    assert wide['Model'].dtype == object
+    assert wide['Model'].tolist() == df['Model'].astype(str).tolist()
+    assert (wide[scores].dtypes == np.float64).all()
+    # Back to the 2-decimal values of the results.csv, not their float32 approximation
+    raw = raw.sort_values('-, clemscore', ascending=False, kind='stable')
+    np.testing.assert_array_equal(wide[scores].to_numpy(), raw.to_numpy())
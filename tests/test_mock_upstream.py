@@ -0,0 +1,68 @@
+import os
+import sys
+import json
+import time
+
+import pytest
+import requests
+
+from src.leaderboard_utils import read_results
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts"))
+from mock_upstream import generate_data, start_server, upstream_env, get_counts, VARIANTS  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def data_dir(tmp_path_factory) -> str:
+    return generate_data(str(tmp_path_factory.mktemp("upstream")), n_models=40, seed=1)
+
+
+@pytest.fixture
+def server(data_dir):
+    server = start_server(data_dir, latency=0.05)
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_generated_tree_in_the_upstream_format(data_dir):
+    with open(os.path.join(data_dir, "runs", "benchmark_runs.json")) as f:
+        versions = [entry['version'] for entry in json.load(f)['versions']]
+    with open(os.path.join(data_dir, "model_registry.json")) as f:
+        registry = {entry['model_name'] for entry in json.load(f)}
+
+    assert len(registry) == 40
+    for version in versions + VARIANTS:
+        with open(os.path.join(data_dir, "runs", version, "results.csv")) as f:
+            df = read_results(f.read())
+        assert 20 <= len(df) <= 40
+        assert set(df['Model'].astype(str)) <= registry
+        assert df['Clemscore'].is_monotonic_decreasing
+
+
+def test_server_counts_the_requests_per_path(server, data_dir):
+    env = upstream_env(server)
+    with open(os.path.join(data_dir, "runs", "v2.0", "results.csv"), newline='') as f:
+        results = f.read()
+
+    response = requests.get(env['CLEM_REPO'] + "v2.0/results.csv", timeout=10)
+    requests.get(env['CLEM_REPO'] + "v2.0/results.csv", timeout=10)
+    requests.get(env['CLEM_REGISTRY_URL'], timeout=10)
+
+    assert response.status_code == 200
+    assert response.text == results
+    assert get_counts(server) == {'/runs/v2.0/results.csv': 2, '/model_registry.json': 1}
+    assert requests.get(env['CLEM_REPO'].replace("/runs/", "/__counts"), timeout=10).json() == get_counts(server)
+
+
+def test_server_reset_and_latency(server):
+    env = upstream_env(server)
+    requests.get(env['CLEM_REGISTRY_URL'], timeout=10)
+
+    requests.post(env['CLEM_REPO'].replace("/runs/", "/__reset"), timeout=10)
+    assert get_counts(server) == {}
+
+    start = time.perf_counter()
+    assert requests.get(env['CLEM_REPO'] + "v9.9/results.csv", timeout=10).status_code == 404
+    assert time.perf_counter() - start >= 0.05
+    assert get_counts(server) == {'/runs/v9.9/results.csv': 1}
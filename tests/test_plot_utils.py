@@ -0,0 +1,78 @@
+import numpy as np
+
+from src import plot_utils
+from src.assets.text_content import TEXT_NAME
+from src.plot_utils import pareto_frontier, get_frontier, get_open_models, select_snapshot_plot, FRONTIER_OPTIONS
+from src.snapshot_utils import select_display_df, TEXT_KEY
+
+
+def plot_points(fig) -> list:
+    return sorted((x, y) for trace in fig.data if trace.mode.startswith('markers') for x, y in zip(trace.x, trace.y))
+
+
+def test_large_leaderboard_plotted_with_one_trace_per_model_class(snapshot, monkeypatch):
+    df = select_display_df(snapshot, TEXT_KEY)
+    full = select_snapshot_plot(snapshot, TEXT_NAME, [], [], ["Show All Models"], ["Show Names"], [], [])
+    monkeypatch.setattr(plot_utils, 'COMPACT_PLOT_MODELS', len(df) - 1)
+
+    fig = select_snapshot_plot(snapshot, TEXT_NAME, [], [], ["Show All Models"], ["Show Names"], [], [])
+
+    assert len(full.data) == len(df)
+    assert [trace.name for trace in fig.data] == ["Commercial Models", "Open-weight Models"]
+    assert plot_points(fig) == plot_points(full)
+    # Same colour, symbol and label per model as with one trace per model
+    styles = {trace.name: (trace.marker.color, trace.marker.symbol, trace.text[0]) for trace in full.data}
+    for trace in fig.data:
+        for model, colour, symbol, label in zip(trace.customdata, trace.marker.color, trace.marker.symbol, trace.text):
+            assert styles[model] == (colour, symbol, label)
+    open_models = get_open_models(TEXT_NAME, snapshot)
+    assert set(fig.data[1].customdata) == set(open_models) & set(df['Model'])
+
+
+def test_known_frontier_by_ascending_x():
+    x = np.array([10.0, 20.0, 30.0, 40.0, 25.0, 5.0])
+    y = np.array([90.0, 70.0, 80.0, 10.0, 60.0, 95.0])
+
+    # (30, 80) beats (20, 70) and (25, 60) in both
+    assert pareto_frontier(x, y).tolist() == [5, 0, 2, 3]
+
+
+def test_frontier_ties_and_missing_values():
+    x = np.array([50.0, 50.0, 50.0, np.nan, 80.0, 80.0])
+    y = np.array([60.0, 60.0, 40.0, 99.0, 30.0, 30.0])
+
+    # Of identical points only the first is kept, points with a missing value are skipped
+    assert pareto_frontier(x, y).tolist() == [0, 4]
+
+
+def test_frontier_of_every_version_matches_pairwise_check(snapshot):
+    for key in snapshot['frames']:
+        df = snapshot['frames'][key]
+        x, y = df['% Played'].to_numpy(dtype=float), df['Quality Score'].to_numpy(dtype=float)
+
+        dominated = {i for i in range(len(x)) for j in range(len(x))
+                     if x[j] >= x[i] and y[j] >= y[i] and (x[j] > x[i] or y[j] > y[i])}
+        frontier = pareto_frontier(x, y)
+
+        assert set(frontier.tolist()) == set(range(len(x))) - dominated
+        assert (np.diff(x[frontier]) > 0).all()
+
+
+def test_frontier_overlay_and_frontier_only(snapshot):
+    df = select_display_df(snapshot, TEXT_KEY).set_index('Model')
+    frontier = get_frontier(TEXT_NAME, snapshot)
+    assert 1 < len(frontier) < len(df)
+
+    fig = select_snapshot_plot(snapshot, TEXT_NAME, [], [], ["Show All Models"], [], [], [], show_frontier=[])
+    assert 'Pareto frontier' not in [trace.name for trace in fig.data]
+
+    fig = select_snapshot_plot(snapshot, TEXT_NAME, [], [], ["Show All Models"], [], [], [],
+                               show_frontier=[FRONTIER_OPTIONS[0]])
+    line = [trace for trace in fig.data if trace.name == 'Pareto frontier'][0]
+    assert list(line.x) == df.loc[frontier, '% Played'].tolist()
+    assert list(line.y) == df.loc[frontier, 'Quality Score'].tolist()
+    assert len(fig.data) == len(df) + 1
+
+    fig = select_snapshot_plot(snapshot, TEXT_NAME, [], [], ["Show All Models"], [], [], [],
+                               show_frontier=[FRONTIER_OPTIONS[1]])
+    assert sorted(trace.name for trace in fig.data) == sorted(frontier)
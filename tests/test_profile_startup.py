@@ -0,0 +1,45 @@
+import os
+import sys
+import subprocess
+import importlib.util
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture(scope="module")
+def profile_startup():
+    path = os.path.join(ROOT, "scripts", "profile_startup.py")
+    spec = importlib.util.spec_from_file_location("profile_startup", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_app_modules_in_import_order(profile_startup):
+    modules = profile_startup.get_app_modules()
+
+    assert modules[:4] == ['src.snapshot_utils', 'gradio', 'apscheduler.schedulers.background',
+                           'src.assets.text_content']
+    assert modules.index('src.plot_utils') < modules.index('src.trend_utils') < modules.index('src.score_utils')
+    # Standard library modules and repeated imports are left out
+    assert not {'os', 'threading', 'datetime'} & set(modules)
+    assert len(modules) == len(set(modules))
+
+
+def test_src_modules_imported_without_plotly(profile_startup):
+    modules = [module for module in profile_startup.APP_MODULES if module.startswith('src.')]
+    code = "; ".join(f"import {module}" for module in modules) + "; import sys; print('plotly' in sys.modules)"
+
+    result = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+
+    # plotly is imported by the first figure that is built
+    assert result.stdout.strip() == "False"
+
+
+def test_import_times_of_the_modules(profile_startup):
+    timings = dict(profile_startup.profile_imports(['src.leaderboard_utils']))
+
+    assert {'src.leaderboard_utils', 'pandas'} <= set(timings)
+    assert timings['src.leaderboard_utils'] >= timings['pandas'] > 0
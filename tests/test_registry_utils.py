@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+
+from src.registry_utils import build_registry_df, parse_parameters, ESTIMATED_PARAMETERS, REGISTRY_COLUMNS
+
+
+def test_parameter_sizes_in_billions():
+    params = pd.Series(["70B", "1.8T", " 8b ", "7", "", "unknown"])
+
+    parameters = parse_parameters(params)
+
+    np.testing.assert_array_equal(parameters.iloc[:3], [70.0, 1800.0, 8.0])
+    assert parameters.iloc[3:].isna().all()
+
+
+def test_registry_typed_columns(capsys):
+    registry = build_registry_df([
+        {'model_name': 'model-a', 'open_weight': True, 'parameters': '70B', 'release_date': '2024-04-18'},
+        {'model_name': 'model-b', 'open_weight': False, 'parameters': '', 'release_date': '2024-05-13'},
+        {'model_name': 'model-c', 'parameters': '7 billion', 'release_date': 'soon'},
+        {'model_name': 'model-a', 'open_weight': False, 'parameters': '8B', 'release_date': '2023-01-01'},
+        {'open_weight': True},
+    ])
+
+    assert list(registry.columns) == REGISTRY_COLUMNS
+    assert registry['model_name'].tolist() == ['model-a', 'model-b', 'model-c']  # First entry wins
+    assert registry['open_weight'].dtype == bool
+    assert registry['open_weight'].tolist() == [True, False, False]
+    assert registry['est_flag'].dtype == bool
+    assert registry['est_flag'].tolist() == [False, True, False]
+    assert registry['parameters'].iloc[:2].tolist() == [70.0, ESTIMATED_PARAMETERS]
+    assert np.isnan(registry['parameters'].iloc[2])
+    assert pd.api.types.is_datetime64_any_dtype(registry['release_date'])
+    assert registry['release_date'].iloc[0] == pd.Timestamp('2024-04-18')
+    assert pd.isna(registry['release_date'].iloc[2])
+
+    # Invalid values are reported
+    output = capsys.readouterr().out
+    assert "Not a valid parameter size for model-c" in output
+    assert "Not a valid release date for model-c" in output
+
+
+def test_registry_of_the_upstream_format(registry_data):
+    registry = build_registry_df(registry_data).set_index('model_name')
+
+    assert len(registry) == len(registry_data)
+    assert registry.loc['Meta-Llama-3.1-405B-Instruct-Turbo', 'parameters'] == 405.0
+    assert registry.loc['Mixtral-8x7B-Instruct-v0.1', 'open_weight']
+    # Commercial models without a known size are shown with the estimated size
+    assert registry.loc['gpt-4-0613', 'est_flag']
+    assert registry.loc['gpt-4-0613', 'parameters'] == ESTIMATED_PARAMETERS
+    assert registry['release_date'].dtype.kind == 'M'
+    assert registry['release_date'].notna().all()
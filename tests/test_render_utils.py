@@ -0,0 +1,44 @@
+import asyncio
+import json
+
+import plotly.graph_objects as go
+import pytest
+from gradio.components.plot import PlotData
+
+from src import render_utils
+from src.render_utils import render_figure, render_figure_async
+
+
+def build_figure(x: list, y: list, title: str = None) -> go.Figure:
+    return go.Figure(go.Scatter(x=x, y=y), layout={'title': title})
+
+
+@pytest.fixture
+def render_pool(monkeypatch):
+    monkeypatch.setattr(render_utils, "RENDER_WORKERS", 1)
+    monkeypatch.setattr(render_utils, "_pool", None)
+    yield
+    if render_utils._pool is not None:
+        render_utils._pool.shutdown()
+
+
+def test_figure_built_in_the_calling_thread_without_pool():
+    fig = render_figure(build_figure, [1, 2], [3, 4], title="Plot")
+
+    assert isinstance(fig, go.Figure)
+    assert fig.layout.title.text == "Plot"
+
+
+def test_figure_built_in_the_pool_equals_the_local_figure(render_pool):
+    expected = build_figure([1, 2], [3, 4], title="Plot")
+
+    plot = render_figure(build_figure, [1, 2], [3, 4], title="Plot")
+
+    assert isinstance(plot, PlotData)
+    assert json.loads(plot.plot) == json.loads(expected.to_json())
+
+
+def test_async_figure_built_in_the_pool(render_pool):
+    plot = asyncio.run(render_figure_async(build_figure, [1], [2]))
+
+    assert json.loads(plot.plot)['data'][0]['y'] == [2]
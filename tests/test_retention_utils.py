@@ -0,0 +1,107 @@
+import os
+
+import pandas as pd
+import pytest
+
+from src import leaderboard_utils, retention_utils
+from src.leaderboard_utils import RESULTS_HASH, read_results
+from src.retention_utils import FrameStore, spill_frame, read_frame, load_frame, evict_frames, same_results
+from src.retention_utils import apply_retention, version_usage, index_usage
+from src.snapshot_utils import VERSIONS_KEY
+
+
+@pytest.fixture(autouse=True)
+def spill_dir(monkeypatch, tmp_path) -> str:
+    monkeypatch.setattr(retention_utils, 'SPILL_DIR', str(tmp_path / "spill"))
+    return str(tmp_path / "spill")
+
+
+@pytest.fixture
+def leaderboard(read_runs_file) -> pd.DataFrame:
+    return read_results(read_runs_file("v2.0/results.csv"))
+
+
+def test_spilled_frame_equals_the_original(leaderboard, tmp_path):
+    assert leaderboard.isna().any().any()
+
+    path = spill_frame(leaderboard, str(tmp_path / "frame"))
+    df = read_frame(path)
+
+    pd.testing.assert_frame_equal(df, leaderboard, check_categorical=False)
+    assert df['Model'].astype(str).tolist() == leaderboard['Model'].astype(str).tolist()
+    assert isinstance(df['Model'].dtype, pd.CategoricalDtype)
+
+
+def test_frames_read_from_disk_are_cached(leaderboard, tmp_path):
+    path = spill_frame(leaderboard, str(tmp_path / "frame"))
+
+    df = load_frame(path)
+    assert load_frame(path) is df
+
+    evict_frames(str(tmp_path))
+    assert load_frame(path) is not df
+
+
+def test_frame_store_spill(leaderboard, tmp_path):
+    store = FrameStore({'key': leaderboard})
+
+    store.spill('key', str(tmp_path / "frame"))
+
+    assert not store.is_resident('key')
+    assert store.fingerprint('key') == leaderboard.attrs[RESULTS_HASH]
+    assert store.values_count('key') == leaderboard.iloc[:, 1:].count().sum()
+    pd.testing.assert_frame_equal(store['key'], leaderboard, check_categorical=False)
+    assert same_results(store, 'key', leaderboard)
+
+
+def test_retention_spills_old_versions_only(snapshot, tmp_path):
+    versions = [metadata['name'] for metadata in snapshot['version_data']['versions']]
+    frames = {version: snapshot['frames'][(VERSIONS_KEY, version)] for version in versions}
+
+    apply_retention(snapshot, budget_mb=0, n_hot=1, directory=str(tmp_path))
+
+    # The latest version and the latest multimodal version are kept in memory
+    resident = [version for version in versions if snapshot['frames'].is_resident((VERSIONS_KEY, version))]
+    assert resident == ['v2.0', 'v1.6_multimodal']
+    # Spilled versions are read from disk
+    for version, df in zip(versions, snapshot['version_data']['dataframes']):
+        pd.testing.assert_frame_equal(df, frames[version], check_categorical=False)
+    # The parsed results of the spilled versions are dropped from the cache, those of the others are kept
+    assert snapshot['frames'].fingerprint((VERSIONS_KEY, 'v2.0')) in leaderboard_utils._results
+    assert snapshot['frames'].fingerprint((VERSIONS_KEY, 'v0.9')) not in leaderboard_utils._results
+
+
+def test_retention_writes_to_a_directory_of_the_process(snapshot, spill_dir):
+    apply_retention(snapshot, budget_mb=0, n_hot=1)
+
+    path = snapshot['frames'].spilled_path((VERSIONS_KEY, 'v1.0'))
+    assert os.path.dirname(os.path.dirname(path)) == retention_utils.get_spill_dir()
+    assert os.path.dirname(retention_utils.get_spill_dir()) == spill_dir
+    assert os.stat(retention_utils.get_spill_dir()).st_mode & 0o077 == 0
+
+
+def test_frame_cache_keeps_its_byte_total(leaderboard, tmp_path, monkeypatch):
+    paths = [spill_frame(leaderboard, str(tmp_path / f"frame_{i}")) for i in range(3)]
+    nbytes = retention_utils.frame_nbytes(read_frame(paths[0]))
+    monkeypatch.setattr(retention_utils, 'SPILL_CACHE_MB', 2.5 * nbytes / 1024 ** 2)
+
+    frames = [load_frame(path) for path in paths]
+
+    # The least recently read frame is dropped once the cache is full
+    assert list(retention_utils._loaded) == paths[1:]
+    assert retention_utils._loaded_size['nbytes'] == sum(nbytes for _, nbytes in retention_utils._loaded.values())
+    assert load_frame(paths[2]) is frames[2]
+    evict_frames(str(tmp_path))
+    assert retention_utils._loaded_size['nbytes'] == sum(nbytes for _, nbytes in retention_utils._loaded.values())
+
+
+def test_budget_counts_every_version_structure(snapshot):
+    versions = [metadata['name'] for metadata in snapshot['version_data']['versions']]
+
+    usage = version_usage(snapshot)
+    indexes = index_usage(snapshot)
+
+    assert set(usage) == set(indexes) == set(versions)
+    assert all(nbytes > 0 for nbytes in indexes.values())
+    # Larger leaderboards take more memory
+    assert usage['v2.0'] > usage['v0.9']
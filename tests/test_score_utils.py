@@ -0,0 +1,106 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.leaderboard_utils import get_game_columns, widen_frame
+from src.score_utils import parse_weights, get_weight_vector, weighted_scores, weighted_rankings, get_weighted_table
+from src.snapshot_utils import VERSIONS_KEY
+
+
+def expected_scores(df: pd.DataFrame, weights: dict) -> pd.DataFrame:
+    """Weighted scores of a processed DataFrame, computed per model from its columns."""
+    df = widen_frame(df).set_index('Model')
+    columns = {game.lower(): cols for game, cols in get_game_columns(df.reset_index()).items()}
+    w = pd.Series({game: weights.get(game, 1.0) for game in columns})
+    played = pd.DataFrame({game: df[cols[0]].fillna(0) for game, cols in columns.items()})
+    quality = pd.DataFrame({game: df[cols[1]] for game, cols in columns.items()})
+    scores = pd.DataFrame({
+        'played': (played * w).sum(axis=1) / w.sum(),
+        'quality': (quality * w).sum(axis=1) / quality.notna().mul(w).sum(axis=1),
+    }).fillna(0)
+    return scores.assign(clemscore=scores['played'] * scores['quality'] / 100)
+
+
+def by_model(matrix: dict, scores: dict, version: str) -> pd.DataFrame:
+    start, stop = matrix['offsets'][version]
+    return pd.DataFrame({name: values[start:stop] for name, values in scores.items()},
+                        index=pd.Index(matrix['models'][start:stop], name='Model'))
+
+
+def test_parse_weights():
+    assert parse_weights("Taboo=2, wordle = 0.5; imagegame=0") == {'taboo': 2.0, 'wordle': 0.5, 'imagegame': 0.0}
+    assert parse_weights({'Taboo': '3'}) == {'taboo': 3.0}
+    assert parse_weights("") == {}
+    with pytest.raises(ValueError):
+        parse_weights("taboo=-1")
+    with pytest.raises(ValueError):
+        parse_weights("taboo=many")
+
+
+def test_unknown_games_are_reported(snapshot):
+    with pytest.raises(ValueError, match="Unknown games: tabu"):
+        get_weight_vector("tabu=2", snapshot['game_matrix']['games'])
+
+
+def test_unweighted_scores_are_the_clemscore_of_the_results(snapshot):
+    matrix = snapshot['game_matrix']
+
+    scores = weighted_scores({}, matrix)
+
+    for version in matrix['offsets']:
+        df = widen_frame(snapshot['frames'][(VERSIONS_KEY, version)]).set_index('Model')
+        unweighted = by_model(matrix, scores, version)
+        # The results.csv holds the scores rounded to 2 decimals
+        np.testing.assert_allclose(unweighted['played'], df['% Played'], atol=0.005)
+        np.testing.assert_allclose(unweighted['quality'], df['Quality Score'], atol=0.005)
+        np.testing.assert_allclose(unweighted['clemscore'], df['Clemscore'], atol=0.01)
+
+
+def test_weights_are_normalised(snapshot):
+    matrix = snapshot['game_matrix']
+    weights = {game.lower(): 1 for game in matrix['games']} | {'taboo': 2, 'codenames': 3}
+
+    scores = weighted_scores(weights, matrix)
+    scaled = weighted_scores({game: 10 * weight for game, weight in weights.items()}, matrix)
+
+    for name in ['played', 'quality', 'clemscore']:
+        np.testing.assert_allclose(scores[name], scaled[name])
+    # Games without a weight count with 1
+    for name in ['played', 'quality', 'clemscore']:
+        np.testing.assert_allclose(scores[name], weighted_scores("taboo=2, codenames=3", matrix)[name])
+    expected = expected_scores(snapshot['frames'][(VERSIONS_KEY, 'v2.0')], weights)
+    pd.testing.assert_frame_equal(by_model(matrix, scores, 'v2.0'), expected, check_names=False)
+
+
+def test_zero_weight_leaves_a_game_out(snapshot):
+    matrix = snapshot['game_matrix']
+    unweighted = weighted_scores({}, matrix)
+
+    scores = weighted_scores("codenames=0", matrix)
+
+    expected = expected_scores(snapshot['frames'][(VERSIONS_KEY, 'v2.0')], {'codenames': 0})
+    pd.testing.assert_frame_equal(by_model(matrix, scores, 'v2.0'), expected, check_names=False)
+    # Versions without the game are not affected
+    pd.testing.assert_frame_equal(by_model(matrix, scores, 'v1.6'), by_model(matrix, unweighted, 'v1.6'))
+
+
+def test_rankings_per_version(snapshot):
+    matrix = snapshot['game_matrix']
+    scores = weighted_scores("taboo=3, wordle=0", matrix)['clemscore']
+
+    rankings = weighted_rankings("taboo=3, wordle=0", matrix)
+
+    for version, (start, stop) in matrix['offsets'].items():
+        assert sorted(rankings[version].tolist()) == list(range(start, stop))
+        assert (np.diff(scores[rankings[version]]) <= 0).all()
+
+
+def test_weighted_table_of_a_version(snapshot):
+    table = get_weighted_table('v2.0', "codenames=0")
+
+    df = widen_frame(snapshot['frames'][(VERSIONS_KEY, 'v2.0')]).set_index('Model')
+    expected = expected_scores(snapshot['frames'][(VERSIONS_KEY, 'v2.0')], {'codenames': 0})
+    assert table['Rank'].tolist() == list(range(1, len(df) + 1))
+    assert table['Weighted Clemscore'].is_monotonic_decreasing
+    assert table['Weighted Clemscore'].tolist() == expected.loc[table['Model'], 'clemscore'].round(2).tolist()
+    assert table['Clemscore'].tolist() == df.loc[table['Model'], 'Clemscore'].tolist()
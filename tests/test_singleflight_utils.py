@@ -0,0 +1,106 @@
+import asyncio
+import threading
+import time
+
+import pytest
+import requests
+
+from src import snapshot_utils
+from src.singleflight_utils import make_key, single_flight, single_flight_async
+
+
+def run_threads(fn, n: int) -> list:
+    results = [None] * n
+
+    def run(i):
+        try:
+            results[i] = fn()
+        except Exception as error:
+            results[i] = error
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(n)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_concurrent_snapshot_builds_share_one_load(upstream, monkeypatch):
+    get = requests.get
+
+    def slow_get(url, *args, **kwargs):
+        time.sleep(0.05)
+        return get(url, *args, **kwargs)
+
+    monkeypatch.setattr(requests, 'get', slow_get)
+    snapshot_utils.build_snapshot()
+    one_build = dict(upstream)
+    upstream.clear()
+
+    snapshots = run_threads(snapshot_utils.build_snapshot, 4)
+
+    assert all(snapshot is snapshots[0] for snapshot in snapshots)
+    assert upstream == one_build
+    # Results are not cached, a later build loads again
+    snapshot_utils.build_snapshot()
+    assert upstream == {url: 2 * count for url, count in one_build.items()}
+
+
+def test_error_shared_by_waiting_callers():
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    @single_flight
+    def load(version: str, columns: list):
+        calls.append(version)
+        started.set()
+        release.wait(10)
+        raise ValueError(f"No results for {version}")
+
+    errors = []
+    leader = threading.Thread(target=lambda: pytest.raises(ValueError, load, 'v2.0', ['Clemscore']))
+    leader.start()
+    started.wait(10)
+    waiter = threading.Thread(target=lambda: errors.append(pytest.raises(ValueError, load, 'v2.0', ['Clemscore'])))
+    waiter.start()
+    time.sleep(0.05)
+    release.set()
+    leader.join()
+    waiter.join()
+
+    assert calls == ['v2.0']
+    assert "No results for v2.0" in str(errors[0].value)
+
+
+def test_frontend_arguments_make_one_key():
+    key = make_key(("Text", ["Show All Models"], {'taboo': [2.0]}), {'mobile_view': False})
+
+    assert key == make_key(("Text", ("Show All Models",), {'taboo': (2.0,)}), {'mobile_view': False})
+    assert key != make_key(("Text", ["Show All Models"], {'taboo': [3.0]}), {'mobile_view': False})
+    hash(key)
+
+
+def test_concurrent_async_calls_await_one_task():
+    calls = []
+
+    @single_flight_async
+    async def load(version: str):
+        calls.append(version)
+        await asyncio.sleep(0.05)
+        return {'version': version}
+
+    async def main():
+        cancelled = asyncio.ensure_future(load('v2.0'))
+        await asyncio.sleep(0)
+        results = asyncio.gather(*[load('v2.0') for _ in range(4)], load('v1.6'))
+        cancelled.cancel()
+        return await results
+
+    results = asyncio.run(main())
+
+    # Cancelling one caller does not cancel the load the others wait for
+    assert sorted(calls) == ['v1.6', 'v2.0']
+    assert all(result is results[0] for result in results[:4])
+    assert results[4] == {'version': 'v1.6'}
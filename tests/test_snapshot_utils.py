@@ -0,0 +1,124 @@
+import threading
+from datetime import timedelta
+
+import pytest
+
+from src import snapshot_utils
+from src.assets.text_content import TEXT_NAME, MULTIMODAL_NAME
+from src.snapshot_utils import get_snapshot, get_display_df, select_display_df, query_snapshot, leaderboard_key
+from src.snapshot_utils import TEXT_KEY, MULTIMODAL_KEY, VERSIONS_KEY
+
+
+def test_snapshot_holds_every_version(snapshot):
+    assert get_snapshot() is snapshot
+    assert [v['name'] for v in snapshot['github_data'][TEXT_KEY]['version_data']] == \
+        ['v2.0', 'v1.6', 'v1.5', 'v1.0', 'v0.9']
+    assert [v['name'] for v in snapshot['github_data'][MULTIMODAL_KEY]['version_data']] == ['v1.6_multimodal']
+    assert (VERSIONS_KEY, 'v1.6_quantized') in snapshot['frames']
+    assert (TEXT_KEY, 'v1.6_quantized') not in snapshot['frames']
+
+
+def test_display_frame_of_the_latest_version(snapshot):
+    df = get_display_df(TEXT_NAME)
+
+    assert df is select_display_df(snapshot, TEXT_KEY, 'v2.0')
+    assert list(df.columns[:4]) == ['Model', 'Clemscore', '% Played', 'Quality Score']
+    assert df['Model'].tolist()[0] == 'claude-3-5-sonnet-20240620'
+    assert df['Clemscore'].is_monotonic_decreasing
+    # The versions leaderboard is shown with the scores of every game
+    assert 'Codenames Quality Score' in get_display_df(VERSIONS_KEY, 'v2.0').columns
+
+
+def test_search_runs_on_the_snapshot(snapshot):
+    df = query_snapshot(TEXT_NAME, "llama; qwen")
+
+    assert df['Model'].tolist() == [model for model in get_display_df(TEXT_KEY)['Model']
+                                    if 'llama' in model.lower() or 'qwen' in model.lower()]
+    assert sorted(query_snapshot(MULTIMODAL_NAME, "gpt-4o", version='v1.6_multimodal')['Model']) == \
+        ['gpt-4o-2024-05-13', 'gpt-4o-2024-08-06']
+
+
+def test_unknown_leaderboard():
+    with pytest.raises(KeyError):
+        leaderboard_key("Leaderboard")
+
+
+def test_results_cached_per_snapshot(snapshot, upstream):
+    calls = []
+
+    @snapshot_utils.snapshot_cache(maxsize=2)
+    def count_models(snapshot: dict, version: str) -> int:
+        calls.append(version)
+        return len(snapshot['frames'][(VERSIONS_KEY, version)])
+
+    assert count_models(snapshot, 'v2.0') == count_models(snapshot, 'v2.0') == 19
+    count_models(snapshot, 'v1.6')
+    count_models(snapshot, 'v1.5')
+    count_models(snapshot, 'v2.0')  # Dropped as the least recently used result
+    assert calls == ['v2.0', 'v1.6', 'v1.5', 'v2.0']
+
+    # A new snapshot starts with an empty cache
+    count_models(snapshot_utils.build_snapshot(), 'v2.0')
+    assert calls[-1] == 'v2.0' and len(calls) == 5
+
+
+@pytest.fixture
+def refresh(monkeypatch):
+    """
+    State of the background refresh, reset for every test.
+    """
+    state = {'running': False, 'errors': 0, 'last_error': None, 'retry_at': None}
+    monkeypatch.setattr(snapshot_utils, '_refresh', state)
+    monkeypatch.setattr(snapshot_utils, '_listeners', [])
+    return state
+
+
+def wait_for_refresh():
+    for thread in threading.enumerate():
+        if thread.name == "snapshot-refresh":
+            thread.join()
+
+
+def test_old_snapshot_served_while_refreshing(snapshot, refresh, upstream):
+    snapshot['created'] -= timedelta(seconds=snapshot_utils.SNAPSHOT_SOFT_TTL + 1)
+
+    served = get_snapshot()
+    wait_for_refresh()
+
+    # The request gets the old snapshot, the next one gets the refreshed snapshot
+    assert served is snapshot
+    assert get_snapshot() is not snapshot
+    assert get_snapshot()['created'] > snapshot['created']
+    assert not refresh['running']
+
+
+def test_failed_refresh_keeps_the_snapshot_and_backs_off(snapshot, refresh, upstream, monkeypatch):
+    snapshot['created'] -= timedelta(seconds=snapshot_utils.SNAPSHOT_SOFT_TTL + 1)
+    monkeypatch.setattr(snapshot_utils, 'build_snapshot', lambda: 1 / 0)
+
+    assert get_snapshot() is snapshot
+    wait_for_refresh()
+    assert refresh['errors'] == 1
+    assert 0 < snapshot_utils.refresh_backoff() <= snapshot_utils.SNAPSHOT_RETRY_DELAY
+    # No new attempt before the backoff has passed
+    assert not snapshot_utils.start_background_refresh()
+
+    for _ in range(snapshot_utils.SNAPSHOT_ERROR_BUDGET - 1):
+        refresh['retry_at'] = None
+        get_snapshot()
+        wait_for_refresh()
+    assert snapshot_utils.refresh_backoff() > 2 * snapshot_utils.SNAPSHOT_RETRY_DELAY
+    assert "updating failed" in snapshot_utils.get_staleness_message()
+
+
+def test_published_snapshot_resets_the_errors(snapshot, refresh, upstream):
+    refresh['errors'] = snapshot_utils.SNAPSHOT_ERROR_BUDGET
+    published = []
+    snapshot_utils.add_snapshot_listener(published.append)
+
+    assert snapshot_utils.get_staleness_message()
+    new_snapshot = snapshot_utils.refresh_snapshot()
+
+    assert published == [new_snapshot]
+    assert refresh['errors'] == 0 and snapshot_utils.refresh_backoff() == 0
+    assert snapshot_utils.get_staleness_message() == ""
@@ -0,0 +1,86 @@
+import os
+import tarfile
+
+import pytest
+
+from src.source_utils import source_kind, member_path, read_file, read_repo_file
+from src.source_utils import SOURCE_HTTP, SOURCE_DIRECTORY, SOURCE_TARBALL, TARBALL_SUFFIXES
+
+
+def runs_files(runs_dir: str) -> list:
+    return sorted(os.path.relpath(os.path.join(root, name), runs_dir).replace(os.sep, "/")
+                  for root, _, names in os.walk(runs_dir) for name in names)
+
+
+def make_tarball(runs_dir: str, path: str, root: str = "clembench-runs-main") -> str:
+    with tarfile.open(path, 'w:gz') as tar:
+        tar.add(runs_dir, arcname=root)
+        # Transcripts of the runs are in the archive too, but not read
+        transcript = os.path.join(os.path.dirname(path), "transcript.html")
+        with open(transcript, 'w') as f:
+            f.write("<html></html>")
+        tar.add(transcript, arcname=f"{root}/v2.0/taboo/transcript.html")
+    return path
+
+
+def test_source_kinds():
+    assert source_kind("https://raw.githubusercontent.com/clembench/clembench-runs/main/") == SOURCE_HTTP
+    assert source_kind("/data/clembench-runs/") == SOURCE_DIRECTORY
+    assert source_kind("file:///data/clembench-runs-main.tar.gz") == SOURCE_TARBALL
+    assert all(source_kind(f"~/clembench-runs{suffix}") == SOURCE_TARBALL for suffix in TARBALL_SUFFIXES)
+
+
+def test_member_paths_normalized():
+    assert member_path("./v1.6/results.csv") == "v1.6/results.csv"
+    assert member_path("clembench-runs-main//v2.0/./results.csv") == "clembench-runs-main/v2.0/results.csv"
+    assert member_path("v2.0/../v1.6/results.csv") == "v1.6/results.csv"
+    # Members outside of the archive root are rejected
+    assert member_path("/etc/passwd") is None
+    assert member_path("../results.csv") is None
+    assert member_path("v2.0/../../results.csv") is None
+
+
+def test_directory_and_tarball_read_the_same_files(runs_dir, read_runs_file, tmp_path):
+    tarball = make_tarball(runs_dir, str(tmp_path / "clembench-runs-main.tar.gz"))
+
+    for relative_path in runs_files(runs_dir):
+        expected = read_runs_file(relative_path)
+        assert read_repo_file(relative_path, runs_dir + "/") == expected
+        assert read_repo_file(relative_path, tarball) == expected
+        assert read_repo_file(relative_path, "file://" + tarball) == expected
+    assert read_repo_file("v2.0/taboo/transcript.html", tarball) is None
+    assert read_repo_file("v3.0/results.csv", runs_dir + "/") is None
+    assert read_repo_file("v2.0/results.csv", str(tmp_path / "missing.tar.gz")) is None
+
+
+def test_tarball_read_again_when_modified(runs_dir, tmp_path):
+    tarball = make_tarball(runs_dir, str(tmp_path / "clembench-runs.tgz"))
+    assert read_repo_file("v0.9/results.csv", tarball) is not None
+
+    with tarfile.open(tarball, 'w:gz') as tar:
+        tar.add(os.path.join(runs_dir, "benchmark_runs.json"), arcname="benchmark_runs.json")
+    os.utime(tarball, (1e9, 1e9))
+
+    assert read_repo_file("v0.9/results.csv", tarball) is None
+    assert read_repo_file("benchmark_runs.json", tarball) is not None
+
+
+def test_read_local_files(tmp_path):
+    (tmp_path / "empty.csv").write_text("")
+    (tmp_path / "results.csv").write_text("Model,Clemscore\ngpt-4-0613,67.98\n", encoding='utf-8')
+
+    assert read_file(str(tmp_path / "empty.csv")) == ""
+    assert read_file(str(tmp_path / "results.csv")) == "Model,Clemscore\ngpt-4-0613,67.98\n"
+    assert read_file(str(tmp_path / "missing.csv")) is None
+    assert read_file(str(tmp_path)) is None
+
+
+def test_tarball_member_outside_the_root_skipped(runs_dir, tmp_path, capsys):
+    tarball = str(tmp_path / "clembench-runs.tar")
+    with tarfile.open(tarball, 'w') as tar:
+        tar.add(os.path.join(runs_dir, "benchmark_runs.json"), arcname="benchmark_runs.json")
+        tar.add(os.path.join(runs_dir, "v2.0", "results.csv"), arcname="../v2.0/results.csv")
+
+    assert read_repo_file("benchmark_runs.json", tarball) is not None
+    assert read_repo_file("v2.0/results.csv", tarball) is None
+    assert "outside of the archive root" in capsys.readouterr().out
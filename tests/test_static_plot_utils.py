@@ -0,0 +1,98 @@
+import gzip
+import os
+import sys
+import threading
+from datetime import timedelta
+
+import plotly.io as pio
+import pytest
+
+from src import static_plot_utils
+from src.assets.text_content import TEXT_NAME
+from src.plot_utils import select_snapshot_plot
+from src.static_plot_utils import build_static_plots, reduce_figure, write_images, get_static_plots, plotly_plot_name
+
+
+def points(traces) -> list:
+    return sorted((x, y) for trace in traces if trace.get('mode', '').startswith('markers')
+                  for x, y in zip(trace['x'], trace['y']))
+
+
+def test_mobile_plot_merged_into_fewer_traces(snapshot):
+    fig = select_snapshot_plot(snapshot, TEXT_NAME, [], [], ["Select All Models"], ["Show Names"], [], ["Mobile View"])
+    full = [trace.to_plotly_json() for trace in fig.data]
+
+    reduced = reduce_figure(fig)
+
+    assert len(full) == len(snapshot['github_data']['text']['dataframes'][0])
+    assert len(reduced['data']) < len(full)
+    # Every model is still drawn at its (rounded) position with its label, colour and symbol
+    assert points(reduced['data']) == sorted((round(x, 2), round(y, 2)) for x, y in points(full))
+    merged = max(reduced['data'], key=lambda trace: len(trace['x']))
+    assert len(merged['marker']['color']) == len(merged['text']) == len(merged['x'])
+    assert 'template' not in reduced['layout']
+    assert all(trace['hoverinfo'] == 'skip' for trace in reduced['data'])
+
+
+def test_static_plots_written_as_plotly_json(snapshot, tmp_path, monkeypatch):
+    monkeypatch.setitem(sys.modules, 'kaleido', None)
+
+    plots = build_static_plots(snapshot, str(tmp_path))
+
+    assert set(plots) == {'plot_text_mobile', 'plot_text_mobile_names', 'plot_multimodal_mobile',
+                          'plot_multimodal_mobile_names', 'trend_text_mobile', 'trend_multimodal_mobile'}
+    for name, plot in plots.items():
+        with gzip.open(tmp_path / f"{name}.json.gz", 'rt', encoding='utf-8') as f:
+            assert f.read() == plot
+        pio.from_json(plot)
+    # Images are skipped without kaleido
+    assert not list(tmp_path.glob("*.png"))
+
+
+def test_images_skipped_without_kaleido(snapshot, tmp_path, monkeypatch, capsys):
+    monkeypatch.setitem(sys.modules, 'kaleido', None)
+    fig = select_snapshot_plot(snapshot, TEXT_NAME, [], [], ["Select All Models"], [], [], ["Mobile View"])
+
+    write_images(fig, str(tmp_path / "plot"))
+
+    assert os.listdir(tmp_path) == []
+    assert "kaleido is not installed" in capsys.readouterr().out
+
+
+def test_images_written_with_kaleido(snapshot, tmp_path):
+    pytest.importorskip('kaleido')
+    fig = select_snapshot_plot(snapshot, TEXT_NAME, [], [], ["Select All Models"], [], [], ["Mobile View"])
+
+    write_images(fig, str(tmp_path / "plot"))
+
+    assert (tmp_path / "plot.svg").read_text().startswith("<svg")
+    assert (tmp_path / "plot.png").read_bytes()[:4] == b"\x89PNG"
+
+
+def test_previous_plots_served_while_rendering(snapshot, monkeypatch):
+    monkeypatch.setattr(static_plot_utils, '_static_plots', {'created': None, 'plots': {}, 'building': None})
+    rendered = threading.Event()
+
+    def render(snapshot: dict, output_dir: str = None) -> dict:
+        rendered.wait(10)
+        return {plotly_plot_name(TEXT_NAME, False): str(snapshot['created'])}
+
+    monkeypatch.setattr(static_plot_utils, 'build_static_plots', render)
+    previous = {**snapshot, 'created': snapshot['created'] - timedelta(hours=1)}
+    rendered.set()
+    static_plot_utils.start_static_plots(previous)
+    wait_for_render()
+    rendered.clear()
+
+    # The plots of the previous snapshot are served without waiting for the render of the new snapshot
+    assert get_static_plots(snapshot) == {'plot_text_mobile': str(previous['created'])}
+    assert not static_plot_utils.start_static_plots(snapshot)  # Already rendering
+    rendered.set()
+    wait_for_render()
+    assert get_static_plots(snapshot) == {'plot_text_mobile': str(snapshot['created'])}
+
+
+def wait_for_render():
+    for thread in threading.enumerate():
+        if thread.name == "static-plots":
+            thread.join()
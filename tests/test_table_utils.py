@@ -0,0 +1,44 @@
+import pandas as pd
+
+from src.snapshot_utils import get_display_df, VERSIONS_KEY
+from src.table_utils import get_table_page, next_table_page, previous_table_page
+
+
+def test_pages_cover_the_leaderboard_once(snapshot):
+    df = get_display_df(VERSIONS_KEY, 'v2.0')
+
+    pages = [get_table_page(VERSIONS_KEY, 'v2.0', page=page, page_size=5)[0] for page in range(1, 5)]
+
+    assert [len(page) for page in pages] == [5, 5, 5, 4]
+    pd.testing.assert_frame_equal(pd.concat(pages), df.sort_values('Clemscore', ascending=False, kind='stable'))
+
+
+def test_page_number_clipped_to_the_pages(snapshot):
+    _, page, page_info = get_table_page(VERSIONS_KEY, 'v2.0', page=9, page_size=10)
+
+    assert page == 2
+    assert page_info == "Page 2 of 2 (19 models)"
+    assert next_table_page(VERSIONS_KEY, 'v2.0', "", 2, 10)[1] == 2
+    assert previous_table_page(VERSIONS_KEY, 'v2.0', "", 1, 10)[1] == 1
+
+
+def test_sorted_page_with_missing_scores_last(snapshot):
+    df = get_display_df(VERSIONS_KEY, 'v2.0')
+    column = 'Wordle Quality Score'
+    assert df[column].isna().any()
+
+    page_df, _, _ = get_table_page(VERSIONS_KEY, 'v2.0', page_size=100, sort_by=column, sort_order="Ascending")
+
+    scores = page_df[column]
+    assert scores.iloc[:scores.count()].is_monotonic_increasing
+    assert scores.iloc[scores.count():].isna().all()
+
+
+def test_search_and_columns_of_a_page(snapshot):
+    page_df, _, page_info = get_table_page(VERSIONS_KEY, 'v1.6_quantized', query="llama", page_size=2,
+                                           columns=['Taboo % Played', 'Clemscore'])
+
+    models = [model for model in get_display_df(VERSIONS_KEY, 'v1.6_quantized')['Model'] if 'llama' in model.lower()]
+    assert list(page_df.columns) == ['Model', 'Clemscore', 'Taboo % Played']
+    assert page_info == f"Page 1 of {-(-len(models) // 2)} ({len(models)} models)"
+    assert page_df['Model'].tolist() == models[:2]
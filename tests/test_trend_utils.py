@@ -0,0 +1,133 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.trend_utils import thin_trend_points, get_point_budget, build_trend_ticks, select_trend_ticks
+from src.trend_utils import get_trend_base, get_trend_plot_inputs, MOBILE_TICK_GAP_MONTHS, START_DATE, TICK_MONTHS
+
+DATE_COLUMN = 'Release Date (Model and & Benchmark Version)'
+
+
+def trend_points(n: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'model': [f"model-{i}" for i in range(n)],
+        'clemscore': rng.uniform(0, 80, n).round(2),
+        DATE_COLUMN: pd.Timestamp('2024-01-01') + pd.to_timedelta(rng.integers(0, 700, n), unit='D'),
+        'open_weight': rng.random(n) < 0.5,
+        'version': rng.choice(['v1.6', 'v2.0'], n),
+    })
+
+
+def represented(df: pd.DataFrame) -> int:
+    more = df['model'].str.extract(r"\(\+(\d+) more\)$")[0].fillna(0).astype(int)
+    return int((more + 1).sum())
+
+
+def test_points_within_budget_are_kept():
+    df = trend_points(20)
+
+    thinned = thin_trend_points(df, keep_models=[], width=1200)
+
+    pd.testing.assert_frame_equal(thinned, df)
+
+
+def test_points_thinned_to_budget_and_trend_models_kept():
+    df = trend_points(2000)
+    keep_models = ['model-3', 'model-1500']
+
+    thinned = thin_trend_points(df, keep_models=keep_models, width=400)
+
+    assert len(thinned) <= get_point_budget(400)
+    assert set(keep_models) <= set(thinned['model'])
+    # Every dropped point is counted by the point that stands for it
+    assert represented(thinned) == len(df)
+    # The best model of a cell is kept, so the best model overall is never dropped
+    assert thinned['clemscore'].max() == df['clemscore'].max()
+
+
+def test_ticks_of_the_benchmark_versions(snapshot):
+    trend_base = get_trend_base("Text", snapshot)
+
+    tickvals, ticktext = select_trend_ticks(trend_base['ticks'], START_DATE, '2024-12-31')
+
+    # The text versions of benchmark_runs.json, without the multimodal one
+    assert list(trend_base['benchmark_ticks'].values()) == ['v0.9', 'v1.0', 'v1.5', 'v1.6', 'v2.0']
+    n_dates = len(tickvals) - len(trend_base['benchmark_ticks'])
+    assert tickvals[:n_dates] == list(pd.date_range(START_DATE, '2024-12-31', freq=f'{TICK_MONTHS}MS'))
+    assert tickvals[n_dates:] == list(trend_base['benchmark_ticks'])
+    assert all(name in text for name, text in zip(trend_base['benchmark_ticks'].values(), ticktext[n_dates:]))
+
+
+def test_multimodal_ticks_named_after_the_text_version(snapshot):
+    trend_base = get_trend_base("Multimodal", snapshot)
+
+    assert trend_base['benchmark_ticks'] == {pd.Timestamp('2024-06-10'): 'v1.6'}
+
+
+def test_mobile_ticks_keep_a_gap_to_benchmark_versions(snapshot):
+    trend_base = get_trend_base("Text", snapshot)
+    gap = pd.DateOffset(months=MOBILE_TICK_GAP_MONTHS)
+
+    tickvals, _ = select_trend_ticks(trend_base['ticks'], START_DATE, '2024-12-31', mobile_view=True)
+
+    dates = [date for date in tickvals if date not in trend_base['benchmark_ticks']]
+    releases = list(trend_base['benchmark_ticks'])
+    assert dates
+    assert not [date for date in dates if any(release - gap <= date <= release + gap for release in releases)]
+
+
+def test_ticks_of_a_window_match_ticks_built_for_it(snapshot):
+    trend_base = get_trend_base("Text", snapshot)
+
+    windows = [(START_DATE, '2024-12-31'), ('2023-09-15', '2024-03-01'), ('2024-06-10', '2025-02-01')]
+    for start_date, end_date in windows:
+        for mobile_view in [False, True]:
+            ticks = build_trend_ticks(trend_base['benchmark_ticks'], start_date, end_date)
+
+            assert select_trend_ticks(trend_base['ticks'], start_date, end_date, mobile_view) == \
+                select_trend_ticks(ticks, start_date, end_date, mobile_view)
+
+
+def test_mobile_skip_matches_pairwise_check(snapshot):
+    benchmark_ticks = get_trend_base("Text", snapshot)['benchmark_ticks']
+    releases = list(benchmark_ticks)
+    gap = pd.DateOffset(months=MOBILE_TICK_GAP_MONTHS)
+
+    ticks = build_trend_ticks(benchmark_ticks, '2022-06-01', '2026-01-01')
+
+    expected = [any(release - gap <= date <= release + gap for release in releases) for date in ticks['dates']]
+    assert ticks['mobile_skip'].tolist() == expected
+
+
+def test_trend_window_from_the_start_date(snapshot):
+    trend_base = get_trend_base("Text", snapshot)
+    release_dates = trend_base['columns']['release_date']
+
+    columns, plot_kwargs = get_trend_plot_inputs(trend_base, start_date='2024-06-01')
+
+    assert len(columns['model']) == (release_dates >= np.datetime64('2024-06-01')).sum()
+    assert (columns['release_date'] >= np.datetime64('2024-06-01')).all()
+    assert plot_kwargs['ticks'] is trend_base['ticks']
+    # Windows before the tick set of the snapshot get their own ticks
+    assert get_trend_plot_inputs(trend_base, start_date='2023-01-01')[1]['ticks'] is None
+
+
+def test_trend_versions_clamped_to_the_loaded_versions(snapshot):
+    trend_base = get_trend_base("Text", snapshot)
+
+    # Every model is taken from the latest version it is in, here v2.0 and the retired models of v1.6
+    assert trend_base['n_versions'] == 2
+    assert get_trend_plot_inputs(trend_base, n_versions=50)[1]['n_versions'] == 2
+    assert get_trend_plot_inputs(trend_base, n_versions=1)[1]['n_versions'] == 1
+
+
+def test_invalid_trend_inputs_rejected(snapshot):
+    trend_base = get_trend_base("Text", snapshot)
+
+    with pytest.raises(ValueError, match="start date"):
+        get_trend_plot_inputs(trend_base, start_date='June 2024')
+    with pytest.raises(ValueError, match="at least 1"):
+        get_trend_plot_inputs(trend_base, n_versions=0)
+    with pytest.raises(ValueError, match="must not be negative"):
+        get_trend_plot_inputs(trend_base, open_dip=-1)
@@ -0,0 +1,97 @@
+import os
+import shutil
+import threading
+import time
+
+import pytest
+
+from src import watch_utils
+from src.watch_utils import scan_source, changed_files, watch_source, start_watcher
+
+INTERVAL = 0.05
+
+
+@pytest.fixture
+def repo(runs_dir, tmp_path) -> str:
+    return shutil.copytree(runs_dir, str(tmp_path / "clembench-runs")) + "/"
+
+
+@pytest.fixture
+def refreshes(monkeypatch) -> dict:
+    """
+    Times of the calls of refresh_snapshot by the watcher, the first 'failures' calls fail.
+    """
+    refreshes = {'calls': [], 'failures': 0}
+
+    def refresh():
+        refreshes['calls'].append(time.perf_counter())
+        return None if len(refreshes['calls']) <= refreshes['failures'] else {'created': refreshes['calls'][-1]}
+
+    monkeypatch.setattr(watch_utils, 'refresh_snapshot', refresh)
+    monkeypatch.setattr(watch_utils, 'refresh_backoff', lambda: 2 * INTERVAL)
+    return refreshes
+
+
+@pytest.fixture
+def watcher(repo):
+    stop = threading.Event()
+    thread = threading.Thread(target=watch_source, args=(repo, INTERVAL, stop))
+    thread.start()
+    time.sleep(INTERVAL / 2)
+    yield thread
+    stop.set()
+    thread.join()
+
+
+def append_result(repo: str, version: str = "v2.0"):
+    with open(os.path.join(repo, version, "results.csv"), 'a') as f:
+        f.write("o1-mini-2024-09-12-t0.0--o1-mini-2024-09-12-t0.0,45.10\n")
+
+
+def wait_for(condition, timeout: float = 5):
+    end = time.perf_counter() + timeout
+    while not condition() and time.perf_counter() < end:
+        time.sleep(INTERVAL / 5)
+    return condition()
+
+
+def test_scan_of_a_checkout_and_a_tarball(repo, tmp_path):
+    state = scan_source(repo)
+
+    assert sorted(state) == ['benchmark_runs.json'] + [f"{version}/results.csv" for version in
+                             ['v0.9', 'v1.0', 'v1.5', 'v1.6', 'v1.6_multimodal', 'v1.6_quantized', 'v2.0']]
+    append_result(repo)
+    os.remove(os.path.join(repo, "v0.9", "results.csv"))
+    assert changed_files(state, scan_source(repo)) == ['v0.9/results.csv', 'v2.0/results.csv']
+
+    tarball = shutil.make_archive(str(tmp_path / "clembench-runs"), 'gztar', repo)
+    assert list(scan_source(tarball)) == ["clembench-runs.tar.gz"]
+    assert scan_source(str(tmp_path / "missing")) == {}
+
+
+def test_change_published_once_the_files_are_written(repo, refreshes, watcher):
+    writing = time.perf_counter() + 6 * INTERVAL
+    while time.perf_counter() < writing:
+        append_result(repo)
+        time.sleep(INTERVAL / 2)
+
+    # Not refreshed while the results are still being written, once after
+    assert refreshes['calls'] == []
+    assert wait_for(lambda: refreshes['calls'])
+    time.sleep(4 * INTERVAL)
+    assert len(refreshes['calls']) == 1
+
+
+def test_change_kept_pending_until_a_refresh_succeeds(repo, refreshes, watcher):
+    refreshes['failures'] = 2
+    append_result(repo)
+
+    # Retried after the backoff of the refresh until the snapshot is published, then left alone
+    assert wait_for(lambda: len(refreshes['calls']) == 3)
+    time.sleep(4 * INTERVAL)
+    assert len(refreshes['calls']) == 3
+    assert min(b - a for a, b in zip(refreshes['calls'], refreshes['calls'][1:])) >= 2 * INTERVAL
+
+
+def test_http_sources_are_not_watched():
+    assert start_watcher("https://raw.githubusercontent.com/clembench/clembench-runs/main/") is None